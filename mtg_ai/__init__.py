@@ -5,6 +5,7 @@ from .game_actions import (
     can_pay_mana_cost,
     cast_creature,
     count_untapped_lands,
+    can_attack,
     get_attackers,
     declare_attackers,
     resolve_combat_damage,
@@ -18,6 +19,7 @@ __all__ = [
     "can_pay_mana_cost",
     "cast_creature",
     "count_untapped_lands",
+    "can_attack",
     "get_attackers",
     "declare_attackers",
     "resolve_combat_damage",
@@ -1,4 +1,4 @@
-from typing import Protocol, List, Dict
+from typing import Protocol, List, Dict, Optional, Sequence, Tuple, runtime_checkable
 from .card import Card
 from .game_state import GameState
 
@@ -25,3 +25,105 @@ class CastAgent(Protocol):
 class FullAgent(AttackAgent, BlockAgent, CastAgent, Protocol):
     """Implements all decision types needed by the game controller."""
     ...
+
+
+@runtime_checkable
+class InstantAgent(Protocol):
+    """
+    Optional extra for agents that play instants (see stack.py). Agents
+    without choose_instant always pass priority.
+    """
+
+    def choose_instant(self, game: GameState, seat: int) -> Optional[Tuple[Card, List[Card]]]:
+        """
+        `seat` holds priority and can cast at least one instant: return
+        (card, targets) to cast one, or None to pass.
+        """
+        ...
+
+
+@runtime_checkable
+class DamageOrderAgent(Protocol):
+    """
+    Optional extra for attacking agents that choose damage assignment
+    order (see combat.py). Without order_blockers an attacker's blockers
+    keep the order they were declared in.
+    """
+
+    def order_blockers(self, game: GameState, attacker: Card, blockers: List[Card]) -> List[Card]:
+        """Return `blockers` (of `attacker`, two or more) in the order damage is assigned."""
+        ...
+
+
+@runtime_checkable
+class MulliganAgent(Protocol):
+    """
+    Optional extra for agents that make their own mulligan decisions (see
+    mulligan.london_mulligan); others use the default policy there.
+    """
+
+    def keep_hand(self, game: GameState, seat: int) -> bool:
+        """Keep `seat`'s current hand? game.players[seat].mulligans cards will go to the bottom."""
+        ...
+
+    def choose_bottom(self, game: GameState, seat: int, count: int) -> List[Card]:
+        """`count` distinct cards from `seat`'s hand to put on the bottom of its library."""
+        ...
+
+
+@runtime_checkable
+class BatchAgent(FullAgent, Protocol):
+    """
+    FullAgent that can also decide for many games at once. The lockstep
+    controller (batch_controller.py) groups pending decisions of one kind
+    across games and calls these with the whole group; results are in the
+    order of `games`.
+    """
+
+    def choose_casts_batch(self, games: Sequence[GameState]) -> List[List[Card]]:
+        ...
+
+    def choose_attackers_batch(self, games: Sequence[GameState]) -> List[List[Card]]:
+        ...
+
+    def choose_blockers_batch(self, games: Sequence[GameState]) -> List[Dict[Card, List[Card]]]:
+        ...
+
+
+# Async variants, for agents backed by slow services (see async_driver.py)
+
+
+class AsyncAttackAgent(Protocol):
+    async def choose_attackers(self, game: GameState) -> List[Card]:
+        ...
+
+
+class AsyncBlockAgent(Protocol):
+    async def choose_blockers(self, game: GameState) -> Dict[Card, list[Card]]:
+        ...
+
+
+class AsyncCastAgent(Protocol):
+    async def choose_casts(self, game: GameState) -> List[Card]:
+        ...
+
+
+class AsyncFullAgent(AsyncAttackAgent, AsyncBlockAgent, AsyncCastAgent, Protocol):
+    """Awaitable counterpart of FullAgent."""
+    ...
+
+
+@runtime_checkable
+class AsyncInstantAgent(Protocol):
+    """Awaitable counterpart of InstantAgent, an optional extra for AsyncFullAgent."""
+
+    async def choose_instant(self, game: GameState, seat: int) -> Optional[Tuple[Card, List[Card]]]:
+        ...
+
+
+@runtime_checkable
+class AsyncDamageOrderAgent(Protocol):
+    """Awaitable counterpart of DamageOrderAgent, an optional extra for AsyncFullAgent."""
+
+    async def order_blockers(self, game: GameState, attacker: Card, blockers: List[Card]) -> List[Card]:
+        ...
@@ -0,0 +1,9 @@
+from .simple import NaiveAgent
+from .mcts import MCTSAgent
+from .ismcts import ISMCTSAgent
+
+__all__ = [
+    "NaiveAgent",
+    "MCTSAgent",
+    "ISMCTSAgent",
+]
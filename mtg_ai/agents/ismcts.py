@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import math
+from functools import partial
+from typing import Any, List, Optional, Tuple
+
+from mtg_ai.game_state import GameState
+from mtg_ai.rollout import determinize as determinize
+from mtg_ai.agents.mcts import (
+    Action,
+    MCTSAgent,
+    Node,
+    StateSampler,
+    _TreeWalker,
+    fingerprint,
+    legal_actions,
+    realize,
+)
+
+
+class _InfoSetWalker(_TreeWalker):
+    """
+    Single-observer ISMCTS tree policy (Cowling et al., 2012): one tree over
+    information sets, shared by all determinizations. Actions that are not
+    legal in the current determinization are skipped, and UCB uses how often
+    an action was available instead of the parent's visit count.
+    """
+
+    def _decide(self, game: GameState, kind: str, seat: int) -> Any:
+        node = self.node
+        if node is None:
+            return None
+        if node.kind is None:
+            node.kind, node.seat, node.fingerprint = kind, seat, fingerprint(game)
+        elif node.kind != kind or node.seat != seat:
+            self.node = None
+            return None
+
+        legal = legal_actions(game, kind, seat, self.params.max_actions)
+        untried = [a for a in legal if a not in node.children]
+        for a in legal:
+            child = node.children.get(a)
+            if child is not None:
+                child.avail += 1
+
+        if untried:
+            action = untried[self.rng.randrange(len(untried))]
+            child = node.children[action] = Node(seat)
+            child.avail = 1
+            self.node = None
+        else:
+            action, child = self._select(node, legal)
+            self.node = child
+        self.path.append(child)
+        return realize(game, kind, seat, action)
+
+    def _select(self, node: Node, legal: List[Action]) -> Tuple[Action, Node]:
+        c = self.params.exploration
+        best: Optional[Tuple[Action, Node]] = None
+        best_score = -math.inf
+        for action in legal:
+            child = node.children[action]
+            score = child.value / child.visits + c * math.sqrt(math.log(max(child.avail, 1)) / child.visits)
+            if score > best_score:
+                best_score, best = score, (action, child)
+        assert best is not None
+        return best
+
+
+class ISMCTSAgent(MCTSAgent):
+    """
+    Information-set MCTS: like MCTSAgent, but every iteration searches a
+    fresh determinization of the hidden zones (opponent hand and library
+    order, own library order) consistent with what the searching player can
+    see. With workers > 1, pool processes search their own determinizations
+    and statistics are merged at the root.
+    """
+
+    walker_cls = _InfoSetWalker
+
+    def _sampler(self, seat: int) -> StateSampler:
+        return partial(determinize, observer=seat)
@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+import math
+import os
+import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Type
+
+from mtg_ai.agent import FullAgent
+from mtg_ai.budget import DecisionBudget
+from mtg_ai.card import Card
+from mtg_ai.game_state import GameState
+from mtg_ai.game_controller import step_game
+from mtg_ai.combat import can_block, get_attackers
+from mtg_ai.game_actions import can_afford
+from mtg_ai.rollout import play_land_if_possible
+from mtg_ai.agents.simple import NaiveAgent
+
+# Decision kinds and their (picklable, state-independent) action descriptors:
+#   "cast"   -> None (cast nothing) or a card name (first copy in hand is cast)
+#   "attack" -> tuple of battlefield indices of the attacking creatures
+#   "block"  -> tuple of (index in game.attackers, battlefield index of blocker)
+Action = Hashable
+
+Fingerprint = Tuple[Any, ...]
+
+# Produces the simulation state for one iteration (a clone, or a determinization)
+StateSampler = Callable[[GameState, random.Random], GameState]
+
+
+@dataclass
+class SearchParams:
+    exploration: float = 1.4
+    rollout_turns: int = 2      # simulate this many turns past the decision, then evaluate
+    max_actions: int = 12       # cap on candidate actions per decision node
+    rollout_policy: Optional[FullAgent] = None  # plays below the tree; default NaiveAgent
+
+
+# =========================
+# Candidate actions
+# =========================
+
+
+def _pt(card: Card) -> Tuple[int, int]:
+    return (card.power or 0, card.toughness or 0)
+
+
+def legal_actions(game: GameState, kind: str, seat: int, max_actions: int) -> List[Action]:
+    player = game.players[seat]
+
+    if kind == "cast":
+        actions: List[Action] = [None]
+        for card in player.hand:
+            if card.is_creature() and card.name not in actions and can_afford(player, card.mana_cost or ""):
+                actions.append(card.name)
+        return actions[:max_actions]
+
+    if kind == "attack":
+        ready = get_attackers(player)
+        idx = [player.battlefield.index(c) for c in ready]
+        if not idx:
+            return [()]
+        candidates: List[Tuple[int, ...]] = [(), tuple(idx)]
+        if len(idx) > 1:
+            candidates += [(i,) for i in idx]
+            candidates += [tuple(j for j in idx if j != i) for i in idx]
+        # creatures with equal P/T are interchangeable: keep one subset per P/T multiset
+        seen = set()
+        attack_actions: List[Action] = []
+        for subset in candidates:
+            key = tuple(sorted(_pt(player.battlefield[i]) for i in subset))
+            if key not in seen:
+                seen.add(key)
+                attack_actions.append(subset)
+        return attack_actions[:max_actions]
+
+    if kind == "block":
+        blockers = [i for i, c in enumerate(player.battlefield) if c.is_creature() and not c.tapped]
+        block_actions: List[Action] = [()]
+        greedy: List[Tuple[int, int]] = []
+        used = set()
+        seen_pairs = set()
+        for a_idx, attacker in enumerate(game.attackers):
+            ap, at = _pt(attacker)
+            for b_idx in blockers:
+                if not can_block(game, player.battlefield[b_idx], attacker):
+                    continue
+                bp, bt = _pt(player.battlefield[b_idx])
+                if bt <= ap and bp < at:
+                    continue  # blocker dies without killing the attacker
+                pair_key = (ap, at, bp, bt)
+                if pair_key not in seen_pairs:
+                    seen_pairs.add(pair_key)
+                    block_actions.append(((a_idx, b_idx),))
+                if b_idx not in used and len(greedy) == a_idx:
+                    used.add(b_idx)
+                    greedy.append((a_idx, b_idx))
+            if len(greedy) == a_idx:
+                greedy.append((a_idx, -1))
+        combo = tuple(p for p in greedy if p[1] >= 0)
+        if len(combo) > 1:
+            block_actions.append(combo)
+        return block_actions[:max_actions]
+
+    raise ValueError(f"Unknown decision kind {kind!r}")
+
+
+def realize(game: GameState, kind: str, seat: int, action: Action) -> Any:
+    """Turn an action descriptor into the value the FullAgent method returns."""
+    player = game.players[seat]
+    if kind == "cast":
+        if action is None:
+            return []
+        return [next(c for c in player.hand if c.name == action)]
+    if kind == "attack":
+        assert isinstance(action, tuple)
+        return [player.battlefield[i] for i in action]
+    assert isinstance(action, tuple)
+    blocks: Dict[Card, List[Card]] = {}
+    for a_idx, b_idx in action:
+        blocks.setdefault(game.attackers[a_idx], []).append(player.battlefield[b_idx])
+    return blocks
+
+
+def fingerprint(game: GameState) -> Fingerprint:
+    """Cheap summary of public+private state, used to validate tree reuse."""
+    return (
+        game.turn_number,
+        game.phase,
+        game.active_player_index,
+        tuple(
+            (
+                p.life_total,
+                len(p.hand),
+                len(p.library),
+                tuple((c.name, c.tapped, c.summoning_sick) for c in p.battlefield),
+            )
+            for p in game.players
+        ),
+    )
+
+
+def heuristic_value(game: GameState, seat: int) -> float:
+    """Win-probability proxy in [0, 1] for `seat` at a non-terminal cutoff."""
+    me, opp = game.players[seat], game.players[1 - seat]
+
+    def board(p: Any) -> int:
+        return sum((c.power or 0) + (c.toughness or 0) for c in p.battlefield if c.is_creature())
+
+    score = 0.15 * (me.life_total - opp.life_total) + 0.1 * (board(me) - board(opp)) + 0.05 * (len(me.hand) - len(opp.hand))
+    return 1.0 / (1.0 + math.exp(-score))
+
+
+# =========================
+# Tree
+# =========================
+
+
+class Node:
+    __slots__ = ("mover", "kind", "seat", "untried", "children", "visits", "value", "avail", "fingerprint")
+
+    def __init__(self, mover: int) -> None:
+        self.mover = mover                  # seat whose action led here
+        self.kind: Optional[str] = None     # decision taken at this node (set on first visit)
+        self.seat: int = -1
+        self.untried: List[Action] = []
+        self.children: Dict[Action, Node] = {}
+        self.visits = 0
+        self.value = 0.0                    # sum of rewards for `mover`
+        self.avail = 0                      # times this action was available (ISMCTS only)
+        self.fingerprint: Optional[Fingerprint] = None
+
+    def expand_info(self, game: GameState, kind: str, seat: int, params: SearchParams) -> None:
+        self.kind = kind
+        self.seat = seat
+        self.untried = legal_actions(game, kind, seat, params.max_actions)
+        self.fingerprint = fingerprint(game)
+
+    def select(self, c: float) -> Tuple[Action, "Node"]:
+        log_n = math.log(max(self.visits, 1))
+        best: Optional[Tuple[Action, Node]] = None
+        best_score = -math.inf
+        for action, child in self.children.items():
+            score = child.value / child.visits + c * math.sqrt(log_n / child.visits)
+            if score > best_score:
+                best_score, best = score, (action, child)
+        assert best is not None
+        return best
+
+
+class _TreeWalker(FullAgent):
+    """
+    Plays both seats of a simulated game: follows/extends the tree while it
+    is on it, then falls back to the rollout policy.
+    """
+
+    def __init__(self, root: Node, params: SearchParams, rng: random.Random) -> None:
+        self.node: Optional[Node] = root
+        self.path: List[Node] = [root]
+        self.params = params
+        self.rng = rng
+        self.rollout: FullAgent = params.rollout_policy or NaiveAgent()
+
+    def choose_casts(self, game: GameState) -> List[Card]:
+        res = self._decide(game, "cast", game.active_player_index)
+        return self.rollout.choose_casts(game) if res is None else res
+
+    def choose_attackers(self, game: GameState) -> List[Card]:
+        res = self._decide(game, "attack", game.active_player_index)
+        return self.rollout.choose_attackers(game) if res is None else res
+
+    def choose_blockers(self, game: GameState) -> Dict[Card, List[Card]]:
+        res = self._decide(game, "block", 1 - game.active_player_index)
+        return self.rollout.choose_blockers(game) if res is None else res
+
+    def _decide(self, game: GameState, kind: str, seat: int) -> Any:
+        node = self.node
+        if node is None:
+            return None
+        if node.kind is None:
+            node.expand_info(game, kind, seat, self.params)
+        elif node.kind != kind or node.seat != seat:
+            self.node = None  # diverged from the tree; treat as a leaf
+            return None
+
+        if node.untried:
+            action = node.untried.pop(self.rng.randrange(len(node.untried)))
+            child = node.children[action] = Node(seat)
+            self.node = None  # one expansion per iteration, then roll out
+        else:
+            action, child = node.select(self.params.exploration)
+            self.node = child
+        self.path.append(child)
+        return realize(game, kind, seat, action)
+
+
+def clone_state(game: GameState, rng: random.Random) -> GameState:
+    return game.clone()
+
+
+def run_iterations(
+    game: GameState,
+    root: Node,
+    params: SearchParams,
+    rng: random.Random,
+    *,
+    max_iterations: Optional[int],
+    deadline: Optional[float],
+    sample: StateSampler = clone_state,
+    walker_cls: Type[_TreeWalker] = _TreeWalker,
+) -> int:
+    """Run MCTS iterations from `game` (paused at root's decision) into `root`."""
+    done = 0
+    max_turn = game.turn_number + params.rollout_turns
+    while max_iterations is None or done < max_iterations:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        sim = sample(game, rng)
+        walker = walker_cls(root, params, rng)
+        # Resume the phase that is waiting on the root decision, then fast-forward.
+        step_game(sim, walker, walker)
+        while not sim.is_game_over() and sim.turn_number <= max_turn:
+            play_land_if_possible(sim)
+            step_game(sim, walker, walker)
+
+        if sim.winner is not None:
+            win_seat = sim.players.index(sim.winner)
+            values = (1.0 if win_seat == 0 else 0.0, 1.0 if win_seat == 1 else 0.0)
+        else:
+            h = heuristic_value(sim, 0)
+            values = (h, 1.0 - h)
+
+        root.visits += 1
+        for node in walker.path[1:]:
+            node.visits += 1
+            node.value += values[node.mover]
+        done += 1
+    return done
+
+
+def _search_worker(
+    game: GameState,
+    params: SearchParams,
+    seed: int,
+    max_iterations: Optional[int],
+    time_limit: Optional[float],
+    sample: StateSampler,
+    walker_cls: Type[_TreeWalker],
+) -> Dict[Action, Tuple[int, float]]:
+    """Process-pool entry point: independent search, returns root child stats."""
+    deadline = DecisionBudget(time_limit=time_limit).deadline()
+    root = Node(mover=-1)
+    run_iterations(
+        game, root, params, random.Random(seed),
+        max_iterations=max_iterations, deadline=deadline, sample=sample, walker_cls=walker_cls,
+    )
+    return {a: (child.visits, child.value) for a, child in root.children.items()}
+
+
+# =========================
+# Agent
+# =========================
+
+
+class MCTSAgent(FullAgent):
+    """
+    UCT Monte Carlo Tree Search over the real rules (step_game on cloned
+    GameStates). Both seats are modeled in the tree; below the tree a naive
+    rollout runs for `rollout_turns` turns and is scored by heuristic_value.
+
+    Budget per decision: `iterations` (total across workers) and/or
+    `time_limit` seconds, overridden by game.decision_budget when it sets
+    either limit; the search is anytime and returns its best action so far. With workers > 1 the search is root-parallel: this
+    process and workers-1 pool processes search independently and their root
+    statistics are summed. The local tree is kept and reused for the next
+    decision of the same player in the same turn (e.g. casts -> attacks),
+    provided the real game reached the state the tree predicted.
+
+    Note: the search sees the full game state, including hidden zones
+    (see ISMCTSAgent for a search that does not).
+    """
+
+    walker_cls: Type[_TreeWalker] = _TreeWalker
+
+    def __init__(
+        self,
+        iterations: Optional[int] = 400,
+        time_limit: Optional[float] = None,
+        *,
+        workers: int = 1,
+        params: Optional[SearchParams] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if iterations is None and time_limit is None:
+            raise ValueError("MCTSAgent needs an iteration and/or time budget.")
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.workers = max(1, workers)
+        self.params = params or SearchParams()
+        self.rng = random.Random(seed)
+        self._pool: Optional[Executor] = None
+        self._pool_size: int = 0
+        self._reuse: Optional[Tuple[int, Node]] = None  # (turn_number, subtree root)
+        self.last_iterations: int = 0
+        self.last_reused: bool = False
+
+    # -- FullAgent API --
+    def choose_casts(self, game: GameState) -> List[Card]:
+        return list(self._search(game, "cast", game.active_player_index))
+
+    def choose_attackers(self, game: GameState) -> List[Card]:
+        return list(self._search(game, "attack", game.active_player_index))
+
+    def choose_blockers(self, game: GameState) -> Dict[Card, List[Card]]:
+        return dict(self._search(game, "block", 1 - game.active_player_index))
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+
+    def _root_for(self, game: GameState, kind: str, seat: int) -> Node:
+        self.last_reused = False
+        if self._reuse is not None:
+            turn, node = self._reuse
+            self._reuse = None
+            if (
+                turn == game.turn_number
+                and node.kind == kind
+                and node.seat == seat
+                and node.fingerprint == fingerprint(game)
+            ):
+                self.last_reused = True
+                return node
+        root = Node(mover=-1)
+        root.expand_info(game, kind, seat, self.params)
+        return root
+
+    def _search(self, game: GameState, kind: str, seat: int) -> Any:
+        root = self._root_for(game, kind, seat)
+        candidates = list(root.untried) + list(root.children)
+        if len(candidates) == 1:
+            self.last_iterations = 0
+            self._reuse = None
+            return realize(game, kind, seat, candidates[0])
+
+        budget = game.decision_budget
+        if budget is None or (budget.time_limit is None and budget.node_limit is None):
+            budget = DecisionBudget(time_limit=self.time_limit, node_limit=self.iterations)
+        iterations, time_limit = budget.node_limit, budget.time_limit
+        deadline = budget.deadline()
+        local_iters = None if iterations is None else max(1, iterations // self.workers)
+
+        futures = []
+        if self.workers > 1:
+            pool = self._get_pool()
+            snapshot = game.clone()
+            futures = [
+                pool.submit(
+                    _search_worker, snapshot, self.params, self.rng.randrange(2**31),
+                    local_iters, time_limit, self._sampler(seat), self.walker_cls,
+                )
+                for _ in range(self._pool_size)
+            ]
+
+        done = run_iterations(
+            game, root, self.params, self.rng,
+            max_iterations=local_iters, deadline=deadline,
+            sample=self._sampler(seat), walker_cls=self.walker_cls,
+        )
+
+        stats: Dict[Action, List[float]] = {a: [c.visits, c.value] for a, c in root.children.items()}
+        for fut in futures:
+            for action, (visits, value) in fut.result().items():
+                acc = stats.setdefault(action, [0, 0.0])
+                acc[0] += visits
+                acc[1] += value
+                done += visits
+        self.last_iterations = done
+
+        if not stats:
+            best = candidates[0]
+        else:
+            best = max(stats, key=lambda a: (stats[a][0], stats[a][1]))
+        child = root.children.get(best)
+        self._reuse = (game.turn_number, child) if child is not None else None
+        return realize(game, kind, seat, best)
+
+    def _sampler(self, seat: int) -> StateSampler:
+        """State sampler for a search by `seat` (picklable for the pool)."""
+        return clone_state
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            # never queue searches behind each other: at most one per spare core
+            self._pool_size = max(1, min(self.workers - 1, (os.cpu_count() or 1) - 1))
+            self._pool = ProcessPoolExecutor(max_workers=self._pool_size)
+        return self._pool
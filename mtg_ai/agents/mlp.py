@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from mtg_ai.agent import FullAgent
+from mtg_ai.card import Card
+from mtg_ai.game_state import GameState
+from mtg_ai.block_solver import choose_blocks
+from mtg_ai.env import (
+    ACTION_SIZE,
+    BatchPolicy as BatchPolicy,
+    LearnerProxy,
+    OBS_SIZE as OBS_SIZE,
+    _apply_action_intent,
+    _encode_obs,
+    _legal_mask,
+)
+
+DECISION_PHASES = ("MAIN1", "MAIN2", "DECLARE_ATTACKERS")
+
+
+# =========================
+# Policy network
+# =========================
+
+
+class MLPPolicy:
+    """
+    NumPy-only feed-forward policy over the 48-dim summary observation:
+    ReLU hidden layers, one logit per env action. Weights are float32 and
+    stored as W0, b0, W1, b1, ... in an .npz file.
+    """
+
+    def __init__(self, weights: Sequence[NDArray[np.float32]], biases: Sequence[NDArray[np.float32]]) -> None:
+        if len(weights) != len(biases) or not weights:
+            raise ValueError("MLPPolicy needs one bias per weight matrix.")
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+
+    @classmethod
+    def init(
+        cls, hidden: Sequence[int] = (64, 64), seed: Optional[int] = None
+    ) -> "MLPPolicy":
+        """He-initialized policy with the given hidden layer sizes."""
+        rng = np.random.default_rng(seed)
+        sizes = [OBS_SIZE, *hidden, ACTION_SIZE]
+        weights = [
+            (rng.standard_normal((n_in, n_out)) * np.sqrt(2.0 / n_in)).astype(np.float32)
+            for n_in, n_out in zip(sizes[:-1], sizes[1:])
+        ]
+        biases = [np.zeros(n_out, dtype=np.float32) for n_out in sizes[1:]]
+        return cls(weights, biases)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "MLPPolicy":
+        with np.load(path) as data:
+            n = len(data.files) // 2
+            return cls([data[f"W{i}"] for i in range(n)], [data[f"b{i}"] for i in range(n)])
+
+    def save(self, path: Union[str, Path]) -> None:
+        arrays: Dict[str, NDArray[np.float32]] = {}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"W{i}"] = w
+            arrays[f"b{i}"] = b
+        np.savez(path, **arrays)  # type: ignore[arg-type]
+
+    def logits(self, obs: NDArray[np.float32]) -> NDArray[np.float32]:
+        h = obs
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            h = h @ w
+            h += b
+            if i < last:
+                np.maximum(h, 0.0, out=h)
+        return h
+
+    def act_batch(
+        self,
+        obs: NDArray[np.float32],
+        masks: NDArray[np.bool_],
+        *,
+        greedy: bool = True,
+        rng: Optional[np.random.Generator] = None,
+    ) -> NDArray[np.int64]:
+        """One action per row: masked argmax, or a sample from the masked softmax."""
+        logits = self.logits(obs)
+        logits[~masks] = -np.inf
+        actions: NDArray[np.int64]
+        if greedy:
+            actions = np.argmax(logits, axis=1)
+            return actions
+        rng = rng or np.random.default_rng()
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        u = rng.random((len(probs), 1))
+        # Round-off can leave the last cumsum below u: fall back to the row's last legal action
+        last_legal = np.where(masks, np.arange(ACTION_SIZE), -1).max(axis=1)
+        actions = np.minimum((probs.cumsum(axis=1) < u).sum(axis=1), last_legal)
+        return actions
+
+
+# =========================
+# Agent
+# =========================
+
+
+class PolicyAgent(FullAgent):
+    """
+    FullAgent backed by an MLPPolicy (or any BatchPolicy, e.g. an
+    inference_server.PolicyClient), decoding actions exactly as MTGEnv
+    does (via LearnerProxy), so a policy trained in the env plays the same
+    way here. Land actions are played on the spot, as in the env.
+
+    A lone choose_* call runs a 1-row forward pass. To batch across games,
+    call prepare(games) before stepping them: every game waiting on a cast
+    or attack decision is encoded into one (n, 48) matrix, evaluated in one
+    forward pass, and the actions are queued per game until its choose_*
+    call. The choose_*_batch methods do this for one group of games, which
+    makes PolicyAgent a BatchAgent for batch_controller.LockstepController.
+    The policy has no block actions; block=True uses the block solver.
+    """
+
+    def __init__(
+        self, policy: BatchPolicy, *, greedy: bool = True, block: bool = False, seed: Optional[int] = None
+    ) -> None:
+        self.policy = policy
+        self.greedy = greedy
+        self.block = block
+        self.np_rng = np.random.default_rng(seed if seed is not None else random.randrange(2**31))
+        self._proxy = LearnerProxy()
+        self._obs: NDArray[np.float32] = np.zeros((1, OBS_SIZE), dtype=np.float32)
+        self._masks: NDArray[np.bool_] = np.zeros((1, ACTION_SIZE), dtype=np.bool_)
+        # id(game) -> ((turn, phase), action) for decisions computed by prepare()
+        self._queued: Dict[int, Tuple[Tuple[int, str], int]] = {}
+        self.batched_decisions: int = 0
+        self.single_decisions: int = 0
+
+    # -- batching --
+    def prepare(self, games: Sequence[GameState]) -> int:
+        """
+        Queue decisions for every game waiting on one; returns how many.
+        Decisions queued by an earlier prepare() and never used are dropped.
+        """
+        self._queued.clear()
+        pending = [g for g in games if g.phase in DECISION_PHASES and not g.is_game_over()]
+        n = len(pending)
+        if n == 0:
+            return 0
+        self._reserve(n)
+        for i, game in enumerate(pending):
+            pov = game.get_active_player()
+            self._obs[i] = _encode_obs(game, pov)
+            self._masks[i] = _legal_mask(game, pov)
+        actions = self.policy.act_batch(self._obs[:n], self._masks[:n], greedy=self.greedy, rng=self.np_rng)
+        for game, action in zip(pending, actions):
+            self._queued[id(game)] = ((game.turn_number, game.phase), int(action))
+        self.batched_decisions += n
+        return n
+
+    def _reserve(self, n: int) -> None:
+        if len(self._obs) < n:
+            size = max(n, 2 * len(self._obs))
+            self._obs = np.zeros((size, OBS_SIZE), dtype=np.float32)
+            self._masks = np.zeros((size, ACTION_SIZE), dtype=np.bool_)
+
+    def _action(self, game: GameState) -> int:
+        queued = self._queued.pop(id(game), None)
+        if queued is not None and queued[0] == (game.turn_number, game.phase):
+            return queued[1]
+        pov = game.get_active_player()
+        self._obs[0] = _encode_obs(game, pov)
+        self._masks[0] = _legal_mask(game, pov)
+        self.single_decisions += 1
+        return int(self.policy.act_batch(self._obs[:1], self._masks[:1], greedy=self.greedy, rng=self.np_rng)[0])
+
+    # -- FullAgent API --
+    def choose_casts(self, game: GameState) -> List[Card]:
+        _apply_action_intent(game, game.get_active_player(), self._proxy, self._action(game))
+        return self._proxy.choose_casts(game)
+
+    def choose_attackers(self, game: GameState) -> List[Card]:
+        _apply_action_intent(game, game.get_active_player(), self._proxy, self._action(game))
+        return self._proxy.choose_attackers(game)
+
+    def choose_blockers(self, game: GameState) -> Dict[Card, List[Card]]:
+        if self.block:
+            return choose_blocks(game)
+        return {}
+
+    # -- BatchAgent API --
+    def choose_casts_batch(self, games: Sequence[GameState]) -> List[List[Card]]:
+        self.prepare(games)
+        return [self.choose_casts(g) for g in games]
+
+    def choose_attackers_batch(self, games: Sequence[GameState]) -> List[List[Card]]:
+        self.prepare(games)
+        return [self.choose_attackers(g) for g in games]
+
+    def choose_blockers_batch(self, games: Sequence[GameState]) -> List[Dict[Card, List[Card]]]:
+        return [self.choose_blockers(g) for g in games]
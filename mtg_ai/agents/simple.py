@@ -2,11 +2,22 @@ from typing import List, Dict
 from mtg_ai.agent import FullAgent
 from mtg_ai.game_state import GameState
 from mtg_ai.card import Card
-from mtg_ai.game_actions import can_pay_mana_cost, get_attackers, auto_tap_for_cost
+from mtg_ai.combat import get_attackers
+from mtg_ai.game_actions import can_pay_mana_cost, auto_tap_for_cost
+from mtg_ai.block_solver import choose_blocks
+from mtg_ai.attack_planner import choose_attack
 
 
 class NaiveAgent(FullAgent):
-    """Casts first affordable creature, attacks with all, never blocks."""
+    """
+    Casts first affordable creature, attacks with all, never blocks.
+    plan=True attacks with the attack planner's subset instead, and
+    block=True blocks with the block solver.
+    """
+
+    def __init__(self, block: bool = False, plan: bool = False) -> None:
+        self.block = block
+        self.plan = plan
 
     # Cast
     def choose_casts(self, game: GameState) -> List[Card]:
@@ -21,8 +32,12 @@ class NaiveAgent(FullAgent):
 
     # Attack
     def choose_attackers(self, game: GameState) -> List[Card]:
+        if self.plan:
+            return choose_attack(game)
         return get_attackers(game.get_active_player())
 
     # Block
     def choose_blockers(self, game: GameState) -> Dict[Card, List[Card]]:
+        if self.block:
+            return choose_blocks(game)
         return {}
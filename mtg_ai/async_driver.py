@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from .agent import AsyncDamageOrderAgent, AsyncFullAgent, AsyncInstantAgent, DamageOrderAgent, FullAgent, InstantAgent
+from .card import Card
+from .game_state import GameState
+from .game_controller import step_game
+from .rollout import play_land_if_possible
+from .batch_controller import DECISION_PHASES, _Decided
+
+T = TypeVar("T")
+
+
+class SyncAgentAdapter(AsyncFullAgent):
+    """
+    Wraps a synchronous FullAgent (e.g. NaiveAgent) for the async driver.
+    By default the decision runs inline and the game then yields to the
+    event loop once, so fast agents do not starve other games; with
+    offload=True it runs in a worker thread instead (for agents that block
+    on I/O or heavy search).
+    """
+
+    def __init__(self, agent: FullAgent, *, offload: bool = False) -> None:
+        self.agent = agent
+        self.offload = offload
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.offload:
+            return await asyncio.to_thread(fn, *args)
+        result = fn(*args)
+        await asyncio.sleep(0)
+        return result
+
+    async def choose_casts(self, game: GameState) -> List[Card]:
+        return await self._run(self.agent.choose_casts, game)
+
+    async def choose_attackers(self, game: GameState) -> List[Card]:
+        return await self._run(self.agent.choose_attackers, game)
+
+    async def choose_blockers(self, game: GameState) -> Dict[Card, List[Card]]:
+        return await self._run(self.agent.choose_blockers, game)
+
+    async def choose_instant(self, game: GameState, seat: int) -> Optional[Tuple[Card, List[Card]]]:
+        if not isinstance(self.agent, InstantAgent):
+            return None
+        return await self._run(self.agent.choose_instant, game, seat)
+
+    async def order_blockers(self, game: GameState, attacker: Card, blockers: List[Card]) -> List[Card]:
+        if not isinstance(self.agent, DamageOrderAgent):
+            return blockers
+        return await self._run(self.agent.order_blockers, game, attacker, blockers)
+
+
+class _LoopBridge:
+    """
+    Synchronous face of an async agent for the decisions step_game asks
+    for mid-step (instants, damage assignment order). step_game must then
+    run off the event loop thread: each call schedules the coroutine on
+    `loop` and waits for its result.
+    """
+
+    def __init__(self, agent: object, loop: asyncio.AbstractEventLoop) -> None:
+        self.agent = agent
+        self.loop = loop
+
+    def choose_instant(self, game: GameState, seat: int) -> Optional[Tuple[Card, List[Card]]]:
+        if not isinstance(self.agent, AsyncInstantAgent):
+            return None
+        return asyncio.run_coroutine_threadsafe(self.agent.choose_instant(game, seat), self.loop).result()
+
+    def order_blockers(self, game: GameState, attacker: Card, blockers: List[Card]) -> List[Card]:
+        if not isinstance(self.agent, AsyncDamageOrderAgent):
+            return blockers
+        coro = self.agent.order_blockers(game, attacker, blockers)
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+
+def _mid_step_agent(agent: AsyncFullAgent, loop: asyncio.AbstractEventLoop) -> Tuple[object, bool]:
+    """(what _Decided forwards mid-step decisions to, whether step_game needs a worker thread)."""
+    if isinstance(agent, SyncAgentAdapter):
+        return agent.agent, False  # synchronous already: ask it inline
+    if isinstance(agent, (AsyncInstantAgent, AsyncDamageOrderAgent)):
+        return _LoopBridge(agent, loop), True
+    return None, False
+
+
+async def play_game_async(
+    game: GameState,
+    agents: Sequence[AsyncFullAgent],
+    *,
+    max_steps: Optional[int] = None,
+    play_lands: bool = True,
+) -> Optional[int]:
+    """
+    Coroutine version of rollout.play_out: awaits agents[seat] for each
+    decision, then runs step_game with the result. Returns the winning
+    seat (None if `max_steps` phases ran out first).
+
+    Instants and damage assignment order are asked for inside step_game's
+    priority round and declare blockers step, which are synchronous. For
+    agents with async choose_instant / order_blockers, the game's steps
+    therefore run in a worker thread of their own while those coroutines
+    run on the event loop; a SyncAgentAdapter's agent is asked inline.
+    """
+    loop = asyncio.get_running_loop()
+    faces = [_mid_step_agent(agent, loop) for agent in agents]
+    decided = [_Decided(face) for face, _ in faces]
+    worker = ThreadPoolExecutor(max_workers=1) if any(threaded for _, threaded in faces) else None
+    steps = 0
+    try:
+        while not game.is_game_over():
+            if max_steps is not None and steps >= max_steps:
+                break
+            if play_lands:
+                play_land_if_possible(game)
+            decision = DECISION_PHASES.get(game.phase)
+            result: Any = None
+            if decision is not None:
+                kind, rel = decision
+                seat = game.active_player_index if rel == 0 else 1 - game.active_player_index
+                agent = agents[seat]
+                if kind == "cast":
+                    result = await agent.choose_casts(game)
+                elif kind == "attack":
+                    result = await agent.choose_attackers(game)
+                else:
+                    result = await agent.choose_blockers(game)
+            for seat_agent in decided:
+                seat_agent.decision = result
+            active, defending = decided[game.active_player_index], decided[1 - game.active_player_index]
+            if worker is None:
+                step_game(game, active, defending)
+            else:
+                await loop.run_in_executor(worker, step_game, game, active, defending)
+            steps += 1
+    finally:
+        if worker is not None:
+            worker.shutdown(wait=False)
+    if game.winner is None:
+        return None
+    return 0 if game.winner is game.players[0] else 1
+
+
+async def run_games(
+    games: Sequence[GameState],
+    agents: Sequence[AsyncFullAgent],
+    *,
+    max_concurrency: Optional[int] = None,
+    max_steps: Optional[int] = None,
+) -> List[Optional[int]]:
+    """
+    Play all `games` as coroutines on the running event loop (agents[i]
+    plays seat i in every game); returns the winning seat of each. With
+    `max_concurrency`, at most that many games are in flight at once.
+    """
+    sem = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def one(game: GameState) -> Optional[int]:
+        if sem is None:
+            return await play_game_async(game, agents, max_steps=max_steps)
+        async with sem:
+            return await play_game_async(game, agents, max_steps=max_steps)
+
+    return list(await asyncio.gather(*(one(g) for g in games)))
+
+
+def run_games_blocking(
+    games: Sequence[GameState],
+    agents: Sequence[AsyncFullAgent],
+    *,
+    max_concurrency: Optional[int] = None,
+    max_steps: Optional[int] = None,
+) -> List[Optional[int]]:
+    """run_games on a fresh event loop, for synchronous callers."""
+    return asyncio.run(run_games(games, agents, max_concurrency=max_concurrency, max_steps=max_steps))
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import product
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .card import Card
+from .game_state import GameState
+from .combat import get_attackers
+from .block_solver import LETHAL_PENALTY, solve_blocks
+from .combat_sim import PT, card_pt, pt_can_block, pt_keywords
+from .keywords import DEATHTOUCH
+
+# Attack counts per attacker P/T type (same order as the type tuple)
+Counts = Tuple[int, ...]
+
+
+@dataclass
+class AttackPlan:
+    attackers: Tuple[int, ...]  # indices into the caller's attacker list
+    score: float                # attacker's evaluation: -(defender's best block score)
+    damage: int                 # damage that gets through the best blocks
+    lethal: bool
+
+
+def plan_attacks(
+    attackers: Sequence[PT],
+    blockers: Sequence[PT],
+    life: int,
+    *,
+    top_k: int = 1,
+    life_weight: float = 0.5,
+    max_evals: int = 128,
+    block_budget: int = 300,
+    deadline: Optional[float] = None,
+) -> List[AttackPlan]:
+    """
+    Best `top_k` attacker subsets, best first, each scored against the
+    defender's best block response from block_solver.
+
+    Attackers with equal P/T are interchangeable, so subsets are count
+    vectors over P/T types and every combat outcome is memoized on P/T
+    multisets (here and in block_solver). Two dominance rules shrink the
+    search before it starts:
+      • attackers with 0 power never attack (they can only die);
+      • attackers that no single or double block can kill always attack
+        (blocking them can only cost the defender blockers or life); this
+        includes flyers that no blocker with flying or reach can block.
+    If the remaining space has at most `max_evals` subsets it is
+    enumerated; otherwise a hill climb over +/-1 count moves, started from
+    "none" and "all", evaluates at most `max_evals` subsets.
+
+    `deadline` (a time.perf_counter() value) stops both the enumeration
+    and the climb, and is handed on to each block solve; the subsets
+    scored by then are ranked, and such results are not cached.
+    """
+    by_type: Dict[PT, List[int]] = {}
+    for idx, pt in enumerate(attackers):
+        by_type.setdefault(pt, []).append(idx)
+    types = tuple(sorted(by_type, reverse=True))
+    counts = tuple(len(by_type[t]) for t in types)
+    blocker_key = tuple(sorted(blockers))
+
+    if deadline is None:
+        scored = _search(types, counts, blocker_key, life, top_k, life_weight, max_evals, block_budget)
+    else:
+        scored = _search_attacks(
+            types, counts, blocker_key, life, top_k, life_weight, max_evals, block_budget, deadline
+        )
+
+    plans: List[AttackPlan] = []
+    for score, damage, vec in scored:
+        chosen: List[int] = []
+        for t, n in zip(types, vec):
+            chosen.extend(by_type[t][:n])
+        plans.append(AttackPlan(
+            attackers=tuple(sorted(chosen)),
+            score=score,
+            damage=damage,
+            lethal=score >= LETHAL_PENALTY / 2,
+        ))
+    return plans
+
+
+@lru_cache(maxsize=4096)
+def _search(
+    types: Tuple[PT, ...],
+    counts: Counts,
+    blockers: Tuple[PT, ...],
+    life: int,
+    top_k: int,
+    life_weight: float,
+    max_evals: int,
+    block_budget: int,
+) -> Tuple[Tuple[float, int, Counts], ...]:
+    """_search_attacks without a deadline, memoized by value."""
+    return _search_attacks(types, counts, blockers, life, top_k, life_weight, max_evals, block_budget, None)
+
+
+def _search_attacks(
+    types: Tuple[PT, ...],
+    counts: Counts,
+    blockers: Tuple[PT, ...],
+    life: int,
+    top_k: int,
+    life_weight: float,
+    max_evals: int,
+    block_budget: int,
+    deadline: Optional[float],
+) -> Tuple[Tuple[float, int, Counts], ...]:
+    def unkillable(attacker: PT) -> bool:
+        able = [b for b in blockers if pt_can_block(b, attacker)]
+        if any(pt_keywords(b) & DEATHTOUCH for b in able):
+            return False  # any block can kill
+        return attacker[1] > sum(sorted((b[0] for b in able), reverse=True)[:2])
+
+    low = tuple(n if t[0] > 0 and unkillable(t) else 0 for t, n in zip(types, counts))
+    high = tuple(0 if t[0] <= 0 else n for t, n in zip(types, counts))
+    results: Dict[Counts, Tuple[float, int]] = {}
+
+    def evaluate(vec: Counts) -> float:
+        hit = results.get(vec)
+        if hit is not None:
+            return hit[0]
+        if results and deadline is not None and time.perf_counter() >= deadline:
+            return float("-inf")  # out of time: never preferred, never ranked
+        attacking = [t for t, n in zip(types, vec) for _ in range(n)]
+        plan = solve_blocks(
+            attacking, blockers, life, life_weight=life_weight, node_budget=block_budget, deadline=deadline
+        )
+        results[vec] = (-plan.score, plan.damage)
+        return -plan.score
+
+    space = 1
+    for lo, hi in zip(low, high):
+        space *= hi - lo + 1
+    if space <= max_evals:
+        for vec in product(*(range(lo, hi + 1) for lo, hi in zip(low, high))):
+            evaluate(tuple(vec))
+    else:
+        for start in (low, high):
+            current, current_score = start, evaluate(start)
+            while len(results) < max_evals:
+                best: Optional[Counts] = None
+                best_score = current_score
+                for i in range(len(types)):
+                    for step in (1, -1):
+                        n = current[i] + step
+                        if low[i] <= n <= high[i]:
+                            vec = current[:i] + (n,) + current[i + 1:]
+                            score = evaluate(vec)
+                            if score > best_score:
+                                best, best_score = vec, score
+                if best is None:
+                    break
+                current, current_score = best, best_score
+
+    # Ties go to the smaller attack (more creatures stay home)
+    ranked = sorted(results.items(), key=lambda kv: (-kv[1][0], sum(kv[0])))
+    return tuple((score, damage, vec) for vec, (score, damage) in ranked[:top_k])
+
+
+def choose_attack_plans(
+    game: GameState, *, top_k: int = 1, life_weight: float = 0.5, max_evals: int = 128
+) -> List[List[Card]]:
+    """
+    Planner attack subsets (best first) for the active player of `game`; a
+    node_limit in game.decision_budget caps `max_evals`, and its
+    time_limit sets the planner's deadline.
+    """
+    deadline = None
+    if game.decision_budget is not None:
+        max_evals = game.decision_budget.nodes(max_evals)
+        deadline = game.decision_budget.deadline()
+    attacker = game.get_active_player()
+    defender = game.get_opponent()
+    ready = get_attackers(attacker)
+    if not ready:
+        return [[]]
+    blockers = [c for c in defender.battlefield if c.is_creature() and not c.tapped]
+    plans = plan_attacks(
+        [card_pt(c) for c in ready],
+        [card_pt(c) for c in blockers],
+        defender.life_total,
+        top_k=top_k,
+        life_weight=life_weight,
+        max_evals=max_evals,
+        deadline=deadline,
+    )
+    return [[ready[i] for i in plan.attackers] for plan in plans]
+
+
+def choose_attack(game: GameState) -> List[Card]:
+    return choose_attack_plans(game)[0]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .agent import BatchAgent, DamageOrderAgent, FullAgent, InstantAgent
+from .card import Card
+from .game_state import GameState
+from .game_controller import step_game
+from .rollout import play_land_if_possible
+
+# phase -> (decision kind, deciding seat relative to the active player: 0 active, 1 defending)
+DECISION_PHASES: Dict[str, Tuple[str, int]] = {
+    "MAIN1": ("cast", 0),
+    "MAIN2": ("cast", 0),
+    "DECLARE_ATTACKERS": ("attack", 0),
+    "DECLARE_BLOCKERS": ("block", 1),
+}
+
+
+class _Decided(FullAgent):
+    """
+    Stands in for one seat's agent in step_game: hands over the decision
+    that was made ahead of time (casts, attackers or blockers) and passes
+    the ones asked for during the step (instants, damage assignment order)
+    on to `agent`, the seat's own agent.
+    """
+
+    def __init__(self, agent: object) -> None:
+        self.agent = agent
+        self.decision: Any = None
+
+    def choose_casts(self, game: GameState) -> List[Card]:
+        return list(self.decision or [])
+
+    def choose_attackers(self, game: GameState) -> List[Card]:
+        return list(self.decision or [])
+
+    def choose_blockers(self, game: GameState) -> Dict[Card, List[Card]]:
+        return dict(self.decision or {})
+
+    def choose_instant(self, game: GameState, seat: int) -> Optional[Tuple[Card, List[Card]]]:
+        if isinstance(self.agent, InstantAgent):
+            return self.agent.choose_instant(game, seat)
+        return None
+
+    def order_blockers(self, game: GameState, attacker: Card, blockers: List[Card]) -> List[Card]:
+        if isinstance(self.agent, DamageOrderAgent):
+            return self.agent.order_blockers(game, attacker, blockers)
+        return blockers
+
+
+def decide_batch(agent: FullAgent, kind: str, games: Sequence[GameState]) -> List[Any]:
+    """One decision of `kind` per game: batched if the agent supports it."""
+    if isinstance(agent, BatchAgent):
+        if kind == "cast":
+            return list(agent.choose_casts_batch(games))
+        if kind == "attack":
+            return list(agent.choose_attackers_batch(games))
+        return list(agent.choose_blockers_batch(games))
+    if kind == "cast":
+        return [agent.choose_casts(g) for g in games]
+    if kind == "attack":
+        return [agent.choose_attackers(g) for g in games]
+    return [agent.choose_blockers(g) for g in games]
+
+
+class LockstepController:
+    """
+    Advances M games one phase per tick, in lockstep. Before stepping, the
+    pending decisions of every live game are grouped by (agent, kind), and
+    each group goes to its agent in one call: choose_*_batch for a
+    BatchAgent, or one choose_* call per game otherwise. step_game then
+    runs with the precomputed decisions, so game rules are unchanged;
+    decisions asked for in the middle of a step (instants in a priority
+    round, damage assignment order) still go to the seat's agent directly.
+
+    `agents` are per seat and shared by all games (agents[0] plays seat 0
+    everywhere); pass `agents_per_game` instead to give each game its own
+    pair. Lands are played with play_land_if_possible, as in play_out.
+    """
+
+    def __init__(
+        self,
+        games: Sequence[GameState],
+        agents: Optional[Sequence[FullAgent]] = None,
+        *,
+        agents_per_game: Optional[Sequence[Sequence[FullAgent]]] = None,
+        play_lands: bool = True,
+    ) -> None:
+        if (agents is None) == (agents_per_game is None):
+            raise ValueError("Pass exactly one of agents / agents_per_game.")
+        self.games = list(games)
+        if agents_per_game is None:
+            assert agents is not None
+            agents_per_game = [agents] * len(self.games)
+        if len(agents_per_game) != len(self.games):
+            raise ValueError("agents_per_game needs one agent pair per game.")
+        self.agents = [tuple(pair) for pair in agents_per_game]
+        self.play_lands = play_lands
+        self.steps = [0] * len(self.games)
+        self.batch_sizes: List[int] = []  # size of every grouped decision call, for diagnostics
+        self._decided = [tuple(_Decided(agent) for agent in pair) for pair in self.agents]
+
+    def live(self) -> List[int]:
+        return [i for i, g in enumerate(self.games) if not g.is_game_over()]
+
+    def tick(self, indices: Optional[Sequence[int]] = None) -> int:
+        """Advance every live game (or just `indices`) by one phase; returns how many moved."""
+        live = self.live() if indices is None else list(indices)
+        groups: Dict[Tuple[int, str], Tuple[FullAgent, List[int]]] = {}
+        for i in live:
+            game = self.games[i]
+            if self.play_lands:
+                play_land_if_possible(game)
+            decision = DECISION_PHASES.get(game.phase)
+            if decision is None:
+                continue
+            kind, rel = decision
+            seat = game.active_player_index if rel == 0 else 1 - game.active_player_index
+            agent = self.agents[i][seat]
+            groups.setdefault((id(agent), kind), (agent, []))[1].append(i)
+
+        decisions: Dict[int, Any] = {}
+        for (_, kind), (agent, idx) in groups.items():
+            self.batch_sizes.append(len(idx))
+            for i, d in zip(idx, decide_batch(agent, kind, [self.games[i] for i in idx])):
+                decisions[i] = d
+
+        for i in live:
+            game = self.games[i]
+            decided = self._decided[i]
+            for seat_agent in decided:
+                seat_agent.decision = decisions.get(i)
+            active = game.active_player_index
+            step_game(game, decided[active], decided[1 - active])
+            self.steps[i] += 1
+        return len(live)
+
+    def run(self, max_steps: Optional[int] = None) -> List[Optional[int]]:
+        """
+        Tick until every game is over (or has run `max_steps` phases);
+        returns the winning seat of each game (None if unfinished).
+        """
+        while True:
+            live = [i for i in self.live() if max_steps is None or self.steps[i] < max_steps]
+            if not live:
+                break
+            self.tick(live)
+        return [
+            None if g.winner is None else (0 if g.winner is g.players[0] else 1)
+            for g in self.games
+        ]
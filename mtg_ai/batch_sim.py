@@ -0,0 +1,399 @@
+"""
+NumPy batch simulator for the vanilla-creature ruleset.
+
+B two-player games are held as struct-of-arrays and advanced together, a
+phase at a time, by vectorized handlers that mirror game_controller's
+_phase_handlers. Both seats are played by NaiveAgent (cast the first
+affordable creature in hand each main phase, attack with everything,
+never block) with lands played as in rollout.play_out, so results match
+step_game game for game on the same shuffles (see cross_check).
+
+Each card is a slot: its position in the shuffled library. Library
+order is slot order, so draws advance a per-seat pointer, hand order is
+slot order among the cards in hand, and so is the battlefield order of
+lands (the first land in hand is always played). Per-slot arrays hold
+the zone, tapped and summoning-sick flags; zone_counts gives the
+per-template view.
+
+The ruleset is basic lands and creatures without abilities (the rules
+compiler finds none), so nothing dies, nothing is on the stack and no
+choices depend on more than the arrays above; validate_ruleset rejects
+other decks.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .agents.simple import NaiveAgent
+from .card import Card
+from .card_db import get_card_template_by_name
+from .game_state import GameState, Player, phases
+from .mulligan import COLORS, OPENING_HAND, DeckProfile
+from .rollout import play_out
+from .rules_compiler import get_abilities
+
+STARTING_LIFE = 20
+
+# Slot zones
+ABSENT, LIBRARY, HAND, BATTLEFIELD = -1, 0, 1, 2
+
+# Mana colors: COLORS, then colorless
+_COLORLESS = len(COLORS)
+
+# BatchGames arrays with a game axis: (2, B, ...) and (B, ...)
+_SEAT_MAJOR = ("template", "is_land", "is_creature", "color", "power", "zone", "tapped", "sick", "next_draw")
+_GAME_MAJOR = ("attacking", "life", "winner", "end_turn", "lands_played", "ids")
+
+
+def validate_ruleset(names: Sequence[str]) -> None:
+    """Raise ValueError unless every card is a basic land or a creature without abilities."""
+    bad: List[str] = []
+    for name in sorted(set(names)):
+        template = get_card_template_by_name(name)
+        types = template.get("types", [])
+        if "Land" in types:
+            basic = any(s in ("Plains", "Island", "Swamp", "Mountain", "Forest") for s in template.get("subtypes", []))
+            if not basic:
+                bad.append(name)
+        elif "Creature" not in types or not template.get("manaCost") or get_abilities(name).abilities:
+            bad.append(name)
+        elif not str(template.get("power", "")).isdigit():
+            bad.append(name)
+    if bad:
+        raise ValueError(f"Not in the vanilla-creature ruleset: {', '.join(bad)}")
+
+
+@dataclass
+class BatchResult:
+    """
+    winner[b]: winning seat of game b, -1 if it was still going after
+    max_turns. turns[b]: turn the game ended on (max_turns + 1 if not).
+    """
+    winner: NDArray[np.int8]
+    turns: NDArray[np.int64]
+    life: NDArray[np.int32]     # (B, 2)
+    max_turns: int
+
+    def summary(self) -> Dict[str, float]:
+        done = self.winner >= 0
+        return {
+            "games": float(len(self.winner)),
+            "p0_win_rate": float((self.winner == 0).mean()),
+            "p1_win_rate": float((self.winner == 1).mean()),
+            "unfinished": float((~done).mean()),
+            "mean_turns": float(self.turns[done].mean()) if done.any() else float("nan"),
+        }
+
+
+class BatchGames:
+    """
+    B games between decks[0] (seat 0, starts) and decks[1]. `orders` is
+    (B, 2, D): orders[b, seat] the shuffled library of that seat as
+    indices into decks[seat] (D the larger deck; the rest is ignored).
+    Opening hands are drawn on construction, as in start_game. Row r
+    holds game ids[r]; rows only move when compact() drops finished games.
+    """
+
+    def __init__(
+        self, decks: Sequence[Sequence[str]], orders: NDArray[np.int64], *, skip_first_draw: bool = True
+    ) -> None:
+        if len(decks) != 2:
+            raise ValueError("Two decks are needed.")
+        validate_ruleset([name for deck in decks for name in deck])
+        if min(len(deck) for deck in decks) < OPENING_HAND:
+            raise ValueError(f"Decks need at least {OPENING_HAND} cards.")
+        counts: Dict[str, int] = {}
+        for name in (n for deck in decks for n in deck):
+            counts[name] = counts.get(name, 0) + 1
+        profile = DeckProfile.from_counts(counts)
+        index = {name: t for t, name in enumerate(profile.names)}
+
+        self.games, _, slots = orders.shape
+        self.deck_size = np.array([len(deck) for deck in decks], dtype=np.int64)
+        present = np.arange(slots)[None, :] < self.deck_size[:, None]                    # (2, D)
+        deck_templates = np.zeros((2, slots), dtype=np.int64)
+        for seat, deck in enumerate(decks):
+            deck_templates[seat, :len(deck)] = [index[name] for name in deck]
+        # Per-slot arrays are seat-major, (2, B, D), so the active seat's view is contiguous
+        orders = np.where(present[:, None, :], orders.transpose(1, 0, 2), 0)
+        self.template = deck_templates[np.arange(2)[:, None, None], orders]
+
+        land_color = np.where(profile.produces.any(axis=1), profile.produces.argmax(axis=1), _COLORLESS)
+        self.pips = profile.pips                                                         # (T, 5)
+        self.mana_value = profile.mana_value                                             # (T,)
+        self.is_land = profile.is_land[self.template]
+        self.is_creature = ~self.is_land
+        self.color = land_color[self.template].astype(np.int64)
+        self.power = profile.power[self.template].astype(np.int32)
+
+        self.zone = np.where(present[:, None, :], LIBRARY, ABSENT).astype(np.int8)
+        self.zone = np.repeat(self.zone, self.games, axis=1)
+        self.zone[:, :, :OPENING_HAND] = HAND
+        self.tapped = np.zeros(self.zone.shape, dtype=np.bool_)
+        self.sick = np.zeros(self.zone.shape, dtype=np.bool_)
+        self.attacking = np.zeros((self.games, slots), dtype=np.bool_)
+        self.next_draw = np.full((2, self.games), OPENING_HAND, dtype=np.int64)
+
+        self.life = np.full((self.games, 2), STARTING_LIFE, dtype=np.int32)
+        self.winner = np.full(self.games, -1, dtype=np.int8)
+        self.end_turn = np.zeros(self.games, dtype=np.int64)
+        self.lands_played = np.zeros(self.games, dtype=np.bool_)
+        # Row -> game index; run() drops finished games, keeping their results below
+        self.ids = np.arange(self.games)
+        self._winner, self._turns, self._life = self.winner.copy(), self.end_turn.copy(), self.life.copy()
+        self.turn_number = 1
+        self.active = 0
+        self.phase = "UNTAP"
+        self.skip_first_draw = skip_first_draw
+        self.templates = profile.names
+
+    @staticmethod
+    def from_seeds(
+        decks: Sequence[Sequence[str]], seeds: Sequence[Sequence[int]], **kwargs: bool
+    ) -> "BatchGames":
+        """
+        Games shuffled like start_game(shuffle_active_seed=seeds[b][0],
+        shuffle_opponent_seed=seeds[b][1]), for engine comparisons.
+        """
+        slots = max(len(deck) for deck in decks)
+        orders = np.zeros((len(seeds), 2, slots), dtype=np.int64)
+        for b, pair in enumerate(seeds):
+            for seat, seed in enumerate(pair):
+                order = list(range(len(decks[seat])))
+                random.Random(seed).shuffle(order)
+                orders[b, seat, :len(order)] = order
+        return BatchGames(decks, orders, **kwargs)
+
+    # =========================
+    # Queries
+    # =========================
+
+    def live(self) -> NDArray[np.bool_]:
+        return self.winner < 0
+
+    def zone_counts(self, zone: int) -> NDArray[np.int64]:
+        """(B, 2, T) cards of each template in `zone`."""
+        templates = len(self.templates)
+        flat = self.template + templates * np.arange(2 * self.games).reshape(2, self.games, 1)
+        hits = np.bincount(flat[self.zone == zone], minlength=2 * self.games * templates)
+        return hits.reshape(2, self.games, templates).transpose(1, 0, 2)
+
+    def result(self, max_turns: int) -> BatchResult:
+        """Results of all games, in the order they were created."""
+        winner, turns, life = self._winner.copy(), self._turns.copy(), self._life.copy()
+        winner[self.ids] = self.winner
+        turns[self.ids] = np.where(self.winner >= 0, self.end_turn, self.turn_number)
+        life[self.ids] = self.life
+        return BatchResult(winner, turns, life, max_turns)
+
+    # =========================
+    # Phase handlers
+    # =========================
+
+    def _untap(self) -> None:
+        live = self.live()
+        self.tapped[self.active, live] = False
+        self.sick[self.active, live] = False
+
+    def _draw(self) -> None:
+        if self.turn_number == 1 and self.skip_first_draw:
+            return
+        a = self.active
+        live = self.live()
+        empty = live & (self.next_draw[a] >= self.deck_size[a])
+        self._lose(empty, a)
+        rows = np.flatnonzero(live & ~empty)
+        self.zone[a, rows, self.next_draw[a, rows]] = HAND
+        self.next_draw[a, rows] += 1
+
+    def _main(self) -> None:
+        self._play_land()
+        self._cast()
+
+    def _play_land(self) -> None:
+        """play_land_if_possible: the first land in hand."""
+        a = self.active
+        candidates = (self.zone[a] == HAND) & self.is_land[a]
+        rows = np.flatnonzero(self.live() & ~self.lands_played & candidates.any(axis=1))
+        self.zone[a, rows, candidates[rows].argmax(axis=1)] = BATTLEFIELD
+        self.lands_played[rows] = True
+
+    def _cast(self) -> None:
+        """
+        NaiveAgent.choose_casts + main_phase. The agent walks the hand,
+        auto-tapping lands in battlefield order for each creature until it
+        is payable; the mana stays in the pool, so the creature cast is the
+        first one payable by all untapped lands. Lands tapped: every one if
+        an unpayable creature came first (or nothing was cast), otherwise
+        the shortest prefix that pays.
+        """
+        a = self.active
+        zone, template, tapped = self.zone[a], self.template[a], self.tapped[a]
+        untapped = (zone == BATTLEFIELD) & self.is_land[a] & ~tapped                         # (B, D)
+        land_rows, land_slots = np.nonzero(untapped)
+        colors = _COLORLESS + 1
+        mana = np.bincount(land_rows * colors + self.color[a, land_rows, land_slots], minlength=self.games * colors)
+        mana = mana.reshape(self.games, colors)                                             # (B, 6) untapped sources
+
+        # Creatures in hand, in hand order within each game
+        rows, slots = np.nonzero((zone == HAND) & self.is_creature[a] & self.live()[:, None])
+        if not rows.size:
+            return
+        kinds = template[rows, slots]
+        payable = np.all(mana[rows, :_COLORLESS] >= self.pips[kinds], axis=1)
+        payable &= mana[rows].sum(axis=1) >= self.mana_value[kinds]
+        first = _first_per_row(rows, np.ones(rows.size, dtype=np.bool_))
+        picked = _first_per_row(rows, payable)
+
+        tap_all = rows[first[~payable[first]]]
+        tapped[tap_all] |= untapped[tap_all]
+
+        prefix_rows = rows[first[payable[first]]]
+        if prefix_rows.size:
+            cast_template = kinds[first[payable[first]]]
+            lands = untapped[prefix_rows]
+            need = self.mana_value[cast_template]
+            last = (np.cumsum(lands, axis=1) >= need[:, None]).argmax(axis=1)
+            for c in np.flatnonzero(self.pips.any(axis=0)):
+                pips = self.pips[cast_template, c]
+                of_color = np.cumsum(lands & (self.color[a, prefix_rows] == c), axis=1)
+                last = np.maximum(last, np.where(pips > 0, (of_color >= pips[:, None]).argmax(axis=1), 0))
+            prefix = np.arange(lands.shape[1])[None, :] <= last[:, None]
+            tapped[prefix_rows] |= lands & prefix & (need > 0)[:, None]
+
+        self.zone[a, rows[picked], slots[picked]] = BATTLEFIELD
+        self.sick[a, rows[picked], slots[picked]] = True
+
+    def _declare_attackers(self) -> None:
+        """Attack with every creature that can (get_attackers)."""
+        a = self.active
+        self.attacking = (
+            self.live()[:, None] & (self.zone[a] == BATTLEFIELD) & self.is_creature[a]
+            & ~self.tapped[a] & ~self.sick[a]
+        )
+        self.tapped[a] |= self.attacking
+
+    def _combat_damage(self) -> None:
+        """Nothing blocks: the defending player takes the attackers' total power."""
+        a = self.active
+        self.life[:, 1 - a] -= (self.power[a] * self.attacking).sum(axis=1, dtype=np.int32)
+        self._lose(self.live() & (self.life[:, 1 - a] <= 0), 1 - a)
+        self.attacking[:] = False
+
+    def _lose(self, rows: NDArray[np.bool_], seat: int) -> None:
+        self.winner[rows] = 1 - seat
+        self.end_turn[rows] = self.turn_number
+
+    # =========================
+    # Stepping
+    # =========================
+
+    def _handlers(self) -> Dict[str, Callable[[], None]]:
+        return {
+            "UNTAP": self._untap,
+            "DRAW": self._draw,
+            "MAIN1": self._main,
+            "DECLARE_ATTACKERS": self._declare_attackers,
+            "COMBAT_DAMAGE": self._combat_damage,
+            "MAIN2": self._main,
+        }
+
+    def step(self) -> None:
+        """Advance every live game by one phase (game_controller.step_game)."""
+        handler = self._handlers().get(self.phase)
+        if handler is not None:
+            handler()
+        idx = phases.index(self.phase)
+        if idx < len(phases) - 1:
+            self.phase = phases[idx + 1]
+        else:
+            self.phase = "UNTAP"
+            self.turn_number += 1
+            self.active = 1 - self.active
+            self.lands_played[:] = False
+
+    def compact(self) -> None:
+        """Drop finished games from the arrays; result() still reports them."""
+        done = ~self.live()
+        ids = self.ids[done]
+        self._winner[ids], self._turns[ids], self._life[ids] = self.winner[done], self.end_turn[done], self.life[done]
+        keep = ~done
+        for name in _SEAT_MAJOR:
+            setattr(self, name, getattr(self, name)[:, keep])
+        for name in _GAME_MAJOR:
+            setattr(self, name, getattr(self, name)[keep])
+        self.games = int(keep.sum())
+
+    def run(self, max_turns: int = 50) -> BatchResult:
+        """
+        Step until every game is over or turn `max_turns` has ended
+        (play_out(max_turn=...)), compacting whenever half the rows are
+        finished games.
+        """
+        while self.live().any() and self.turn_number <= max_turns:
+            if self.phase == "UNTAP" and 2 * int(self.live().sum()) <= self.games:
+                self.compact()
+            self.step()
+        return self.result(max_turns)
+
+
+def _first_per_row(rows: NDArray[np.int64], mask: NDArray[np.bool_]) -> NDArray[np.int64]:
+    """Indices of the first True of `mask` in each run of equal `rows` (sorted)."""
+    hits = np.flatnonzero(mask)
+    return hits[np.r_[True, rows[hits][1:] != rows[hits][:-1]]] if hits.size else hits
+
+
+def simulate(
+    decks: Sequence[Sequence[str]],
+    games: int = 100_000,
+    *,
+    max_turns: int = 50,
+    seed: Optional[int] = None,
+    batch: int = 50_000,
+) -> BatchResult:
+    """Play `games` random shuffles of decks[0] against decks[1], `batch` games at a time."""
+    rng = np.random.default_rng(seed)
+    slots = max(len(deck) for deck in decks)
+    results = []
+    for start in range(0, games, batch):
+        n = min(batch, games - start)
+        keys = rng.random((n, 2, slots))
+        for seat, deck in enumerate(decks):
+            keys[:, seat, len(deck):] = np.inf
+        results.append(BatchGames(decks, np.argsort(keys, axis=2)).run(max_turns))
+    return BatchResult(
+        np.concatenate([r.winner for r in results]),
+        np.concatenate([r.turns for r in results]),
+        np.concatenate([r.life for r in results]),
+        max_turns,
+    )
+
+
+def cross_check(
+    decks: Sequence[Sequence[str]], seeds: Sequence[Sequence[int]], *, max_turns: int = 50
+) -> List[int]:
+    """
+    Play each seed pair with step_game and NaiveAgent (rollout.play_out)
+    and in one batch; return the indices of games whose winner, final
+    turn or life totals differ.
+    """
+    batch = BatchGames.from_seeds(decks, seeds).run(max_turns)
+    mismatches = []
+    for b, (seed_a, seed_b) in enumerate(seeds):
+        players = [
+            Player(f"P{seat}", [Card(get_card_template_by_name(name)) for name in deck])
+            for seat, deck in enumerate(decks)
+        ]
+        game = GameState(players[0], players[1])
+        game.start_game(shuffle_active_seed=seed_a, shuffle_opponent_seed=seed_b)
+        play_out(game, [NaiveAgent(), NaiveAgent()], max_turn=max_turns)
+        winner = -1 if game.winner is None else players.index(game.winner)
+        engine = (winner, game.turn_number, [p.life_total for p in players])
+        if engine != (int(batch.winner[b]), int(batch.turns[b]), batch.life[b].tolist()):
+            mismatches.append(b)
+    return mismatches
@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import permutations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .card import Card
+from .game_state import GameState
+from .combat_sim import PT, card_pt, pt_can_block, pt_keywords, resolve_block
+from .keywords import DEATHTOUCH
+
+LETHAL_PENALTY = 1e6
+
+# One choice per attacker: blocker *type* indices, in damage order
+Choice = Tuple[int, ...]
+
+
+@dataclass
+class BlockPlan:
+    blocks: Dict[int, Tuple[int, ...]]  # attacker index -> blocker indices (damage order)
+    score: float                        # defender's evaluation, higher is better
+    damage: int                         # damage the defending player takes (unblocked or trample)
+    exact: bool                         # False if the node budget ran out (greedy tail)
+
+
+def creature_value(pt: PT) -> float:
+    return float(pt[0] + pt[1])
+
+
+@lru_cache(maxsize=1 << 16)
+def _outcome(attacker: PT, blockers: Tuple[PT, ...]) -> Tuple[bool, Tuple[bool, ...], int]:
+    """combat_sim.resolve_block, memoized by value across solves."""
+    return resolve_block(attacker, blockers)
+
+
+def solve_blocks(
+    attackers: Sequence[PT],
+    blockers: Sequence[PT],
+    life: int,
+    *,
+    life_weight: float = 0.5,
+    node_budget: int = 1000,
+    deadline: Optional[float] = None,
+) -> BlockPlan:
+    """
+    Best block assignment for the defender.
+
+    Score = value of attackers killed - value of own blockers lost
+            - life_weight * damage taken, with a large penalty if the
+    damage is lethal. Creatures are reduced to combat_sim.PT values (P/T
+    plus the combat keywords, including flying and reach, so only legal
+    blocks are considered) and equal ones are interchangeable, so the
+    search runs over PT multisets and is memoized on (attacker multiset,
+    blocker multiset, life); see _search_blocks for the pruning. Results
+    are mapped back onto the caller's indices.
+
+    `deadline` (a time.perf_counter() value, see DecisionBudget.deadline)
+    ends the search like an exhausted node budget, with the best plan so
+    far; results that depend on it are not cached.
+    """
+    order = sorted(range(len(attackers)), key=lambda i: attackers[i], reverse=True)
+    sorted_attackers = tuple(attackers[i] for i in order)
+
+    by_type: Dict[PT, List[int]] = {}
+    for idx, pt in enumerate(blockers):
+        by_type.setdefault(pt, []).append(idx)
+    types = tuple(sorted(by_type))
+    counts = tuple(len(by_type[t]) for t in types)
+
+    # Life only matters up to the total incoming power; capping it lets
+    # boards that differ only in a "safe" life total share a cache entry.
+    total_power = sum(a[0] for a in sorted_attackers)
+    capped_life = min(life, total_power + 1)
+
+    if deadline is None:
+        score, exact, choices = _solve(sorted_attackers, types, counts, capped_life, life_weight, node_budget)
+    else:
+        score, exact, choices = _search_blocks(
+            sorted_attackers, types, counts, capped_life, life_weight, node_budget, deadline
+        )
+    damage = sum(
+        _outcome(a, tuple(types[j] for j in choice))[2] if choice else a[0]
+        for a, choice in zip(sorted_attackers, choices)
+    )
+
+    pools = {t: list(reversed(idxs)) for t, idxs in by_type.items()}
+    blocks: Dict[int, Tuple[int, ...]] = {}
+    for a_pos, choice in enumerate(choices):
+        if choice:
+            blocks[order[a_pos]] = tuple(pools[types[j]].pop() for j in choice)
+    return BlockPlan(blocks=blocks, score=score, damage=damage, exact=exact)
+
+
+@lru_cache(maxsize=4096)
+def _solve(
+    attackers: Tuple[PT, ...],
+    types: Tuple[PT, ...],
+    counts: Tuple[int, ...],
+    life: int,
+    life_weight: float,
+    node_budget: int,
+) -> Tuple[float, bool, Tuple[Choice, ...]]:
+    """_search_blocks without a deadline, memoized by value."""
+    return _search_blocks(attackers, types, counts, life, life_weight, node_budget, None)
+
+
+def _search_blocks(
+    attackers: Tuple[PT, ...],
+    types: Tuple[PT, ...],
+    counts: Tuple[int, ...],
+    life: int,
+    life_weight: float,
+    node_budget: int,
+    deadline: Optional[float],
+) -> Tuple[float, bool, Tuple[Choice, ...]]:
+    """
+    Depth-first search over attackers (strongest first) with memoization on
+    (attacker position, remaining blocker counts, damage so far). Each
+    attacker is only offered the blocker types that can legally block it.
+
+    Pruning per attacker: single blocks are grouped by outcome class
+    (attacker dies?, blocker dies?) and only the cheapest blocker of each
+    class is tried; double blocks are only tried when no single blocker can
+    kill the attacker, and only among the three strongest blocker types.
+
+    Branch and bound on top: the greedy assignment is the starting
+    incumbent, options are tried best gain first, and a branch is cut when
+    its gain plus an upper bound on the rest (see _blocker_prices) cannot
+    beat the best score found so far. States that were cut are remembered
+    with the floor they failed at. Once `node_budget` states have been
+    expanded, or `deadline` has passed, the remaining attackers are
+    assigned greedily (exact=False); past the deadline, branches not yet
+    started are skipped so the best plan so far comes back promptly.
+
+    Cost: on random 15-vs-15 boards an exact solve (no node budget) takes
+    tens of milliseconds typically, but a few hundred ms to ~1 s on the
+    hardest ones, since the bound is looser than the pruned option space.
+    The default budget of 1000 states keeps a solve under ~50 ms at the
+    price of exactness on roughly half of such boards; "within
+    milliseconds" on 15-vs-15 holds only with a smaller budget.
+    """
+    n = len(attackers)
+    values = [creature_value(t) for t in types]
+    memo: Dict[Tuple[int, Tuple[int, ...], int], Tuple[float, int, Tuple[Choice, ...]]] = {}
+    # Block outcomes depend only on (attacker, blocker types), not on the
+    # rest of the board, so they are shared across the whole search.
+    singles = [[_outcome(a, (t,)) for t in types] for a in attackers]
+    allowed = [[pt_can_block(t, a) for t in types] for a in attackers]
+    gains: Dict[Tuple[int, Choice], Tuple[float, int, Choice]] = {}
+    expanded = 0
+    exact = True
+
+    def gain(i: int, choice: Choice) -> Tuple[float, int, Choice]:
+        attacker = attackers[i]
+        if not choice:
+            return -life_weight * attacker[0], attacker[0], choice
+        cached = gains.get((i, choice))
+        if cached is not None:
+            return cached
+        best: Optional[Tuple[float, int, Choice]] = None
+        for ordered in (permutations(choice) if len(choice) > 1 else (choice,)):
+            dies, deaths, trampled = _outcome(attacker, tuple(types[j] for j in ordered))
+            g = (creature_value(attacker) if dies else 0.0) - sum(values[j] for j, d in zip(ordered, deaths) if d)
+            g -= life_weight * trampled
+            if best is None or g > best[0]:
+                best = (g, trampled, tuple(ordered))
+        assert best is not None
+        gains[(i, choice)] = best
+        return best
+
+    def options(i: int, remaining: Tuple[int, ...]) -> List[Choice]:
+        cheapest: Dict[Tuple[bool, bool], int] = {}
+        for j, c in enumerate(remaining):
+            if c == 0 or not allowed[i][j]:
+                continue
+            dies, (b_dies,), _ = singles[i][j]
+            cls = (dies, b_dies)
+            if cls not in cheapest or values[j] < values[cheapest[cls]]:
+                cheapest[cls] = j
+        opts: List[Choice] = [()]
+        opts += [(j,) for j in cheapest.values()]
+        if not any(dies for dies, _ in cheapest):
+            able = (j for j, c in enumerate(remaining) if c and allowed[i][j])
+            top = sorted(able, key=lambda j: -types[j][0])[:3]
+            for x in range(len(top)):
+                for y in range(x, len(top)):
+                    j, k = top[x], top[y]
+                    if j == k and remaining[j] < 2:
+                        continue
+                    opts.append((j, k))
+        return opts
+
+    def take(remaining: Tuple[int, ...], choice: Choice) -> Tuple[int, ...]:
+        if not choice:
+            return remaining
+        new = list(remaining)
+        for j in choice:
+            new[j] -= 1
+        return tuple(new)
+
+    def greedy(i: int, remaining: Tuple[int, ...], dmg: int) -> Tuple[float, int, Tuple[Choice, ...]]:
+        total = 0.0
+        picks: List[Choice] = []
+        for k in range(i, n):
+            g, d, ordered = max((gain(k, ch) for ch in options(k, remaining)), key=lambda r: r[0])
+            total += g
+            dmg = min(dmg + d, life)
+            remaining = take(remaining, ordered)
+            picks.append(ordered)
+        return total - (LETHAL_PENALTY if dmg >= life else 0.0), dmg, tuple(picks)
+
+    # Upper bound on what attackers i.. can still add with `remaining`
+    # blockers: the Lagrangian relaxation of "each blocker blocks once".
+    # Every attacker takes its best option at blocker prices `prices`,
+    # paying for the blockers it uses, plus the value of the remaining
+    # blockers at those prices. Any prices >= 0 give a valid bound: the
+    # root's best prices, or 0 (free_suffix), whichever is lower.
+    incumbent = greedy(0, counts, 0)
+    prices, suffix, free_suffix = _blocker_prices(
+        attackers, types, counts, allowed, life_weight,
+        [[gain(i, (j,))[0] for j in range(len(types))] for i in range(n)],
+        incumbent[0] + (LETHAL_PENALTY if incumbent[1] >= life else 0.0),
+    )
+
+    Result = Tuple[float, int, Tuple[Choice, ...]]
+    failed: Dict[Tuple[int, Tuple[int, ...], int], float] = {}
+
+    def best_from(i: int, remaining: Tuple[int, ...], dmg: int, stock: float, floor: float) -> Optional[Result]:
+        """
+        Best result from attacker i on if it scores above `floor`, else
+        None. `stock` is the priced value of `remaining`.
+        """
+        nonlocal expanded, exact
+        penalty = LETHAL_PENALTY if dmg >= life else 0.0
+        if i == n:
+            return (-penalty, dmg, ()) if -penalty > floor else None
+        key = (i, remaining, dmg)
+        hit = memo.get(key)
+        if hit is not None:
+            return hit if hit[0] > floor else None
+        if floor >= failed.get(key, float("inf")):
+            return None
+        if expanded >= node_budget or (deadline is not None and time.perf_counter() >= deadline):
+            exact = False
+            tail = greedy(i, remaining, dmg)
+            return tail if tail[0] > floor else None
+        expanded += 1
+
+        best: Optional[Result] = None
+        for g, d, ordered in sorted((gain(i, ch) for ch in options(i, remaining)), key=lambda r: -r[0]):
+            target = floor if best is None else best[0]
+            new_dmg = min(dmg + d, life)
+            new_stock = stock - sum(prices[j] for j in ordered)
+            bound = min(free_suffix[i + 1], suffix[i + 1] + new_stock)
+            if g + bound - (LETHAL_PENALTY if new_dmg >= life else 0.0) <= target:
+                continue
+            sub = best_from(i + 1, take(remaining, ordered), new_dmg, new_stock, target - g)
+            if sub is not None:
+                best = (g + sub[0], sub[1], (ordered,) + sub[2])
+            if best is not None and deadline is not None and time.perf_counter() >= deadline:
+                break
+        if best is None:
+            failed[key] = floor  # true best <= floor
+        else:
+            memo[key] = best  # above floor, so exact
+        return best
+
+    found = best_from(0, counts, 0, sum(p * c for p, c in zip(prices, counts)), incumbent[0])
+    score, _, choices = found if found is not None else incumbent
+    return score, exact, choices
+
+
+def _blocker_prices(
+    attackers: Tuple[PT, ...],
+    types: Tuple[PT, ...],
+    counts: Tuple[int, ...],
+    allowed: List[List[bool]],
+    life_weight: float,
+    single_gains: List[List[float]],
+    lower: float,
+    iterations: int = 60,
+) -> Tuple[List[float], List[float], List[float]]:
+    """
+    Blocker prices for _solve's bound, by subgradient descent on the
+    Lagrangian dual from `lower` (the score of a feasible plan). Options
+    are every legal single and double block of each attacker, a superset
+    of what _solve tries; doubles are over-estimated without simulating
+    them (the attacker's value if the pair might kill it, else 0). Returns
+    (price per blocker type, suffix sums of each attacker's best priced
+    option, the same suffix sums at price 0).
+    """
+    n, t = len(attackers), len(types)
+    first, second = np.triu_indices(t)  # double blocks, by blocker type
+    repeatable = (first != second) | (np.array(counts)[first] >= 2)
+    first, second = first[repeatable], second[repeatable]
+    usage = np.zeros((1 + t + len(first), t))
+    usage[1 + np.arange(t), np.arange(t)] = 1.0
+    np.add.at(usage, (1 + t + np.arange(len(first)), first), 1.0)
+    np.add.at(usage, (1 + t + np.arange(len(first)), second), 1.0)
+
+    legal = np.array(allowed, dtype=bool).reshape(n, t)
+    power = np.array([b[0] for b in types], dtype=np.float64)
+    deathtouch = np.array([bool(pt_keywords(b) & DEATHTOUCH) and b[0] > 0 for b in types], dtype=bool)
+    toughness = np.array([a[1] for a in attackers], dtype=np.float64)[:, None]
+    value = np.array([creature_value(a) for a in attackers])[:, None]
+    kill = deathtouch[first] | deathtouch[second] | (power[first] + power[second] >= toughness)
+    pair_gains = np.where(kill, value, 0.0)
+    gains = np.concatenate([
+        np.array([-life_weight * a[0] for a in attackers])[:, None],
+        np.where(legal, np.array(single_gains, dtype=np.float64).reshape(n, t), -np.inf),
+        np.where(legal[:, first] & legal[:, second], pair_gains, -np.inf),
+    ], axis=1)
+    supply = np.array(counts, dtype=np.float64)
+
+    prices = np.zeros(t)
+    best_prices, best_total = prices, np.inf
+    step = 1.0
+    for _ in range(iterations):
+        priced = gains - usage @ prices
+        pick = priced.argmax(axis=1)
+        total = float(priced[np.arange(n), pick].sum() + prices @ supply)
+        if total < best_total:
+            best_prices, best_total = prices, total
+        slack = supply - usage[pick].sum(axis=0)
+        if total - lower < 1e-9 or not slack.any():
+            break
+        prices = np.maximum(0.0, prices - step * (total - lower) / float(slack @ slack) * slack)
+        step *= 0.95
+
+    priced_best = (gains - usage @ best_prices).max(axis=1)
+    free_best = gains.max(axis=1)
+    suffix, free_suffix = [0.0] * (n + 1), [0.0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        suffix[i] = suffix[i + 1] + float(priced_best[i])
+        free_suffix[i] = free_suffix[i + 1] + float(free_best[i])
+    return [float(p) for p in best_prices], suffix, free_suffix
+
+
+def choose_blocks(
+    game: GameState, *, life_weight: float = 0.5, node_budget: int = 1000
+) -> Dict[Card, List[Card]]:
+    """
+    Solver-backed blocks for the defending player of `game`; a node_limit
+    in game.decision_budget caps `node_budget`, and its time_limit sets
+    the solver's deadline.
+    """
+    deadline = None
+    if game.decision_budget is not None:
+        node_budget = game.decision_budget.nodes(node_budget)
+        deadline = game.decision_budget.deadline()
+    defender = game.get_opponent()
+    attackers = list(game.attackers)
+    blockers = [c for c in defender.battlefield if c.is_creature() and not c.tapped]
+    if not attackers or not blockers:
+        return {}
+    plan = solve_blocks(
+        [card_pt(c) for c in attackers],
+        [card_pt(c) for c in blockers],
+        defender.life_total,
+        life_weight=life_weight,
+        node_budget=node_budget,
+        deadline=deadline,
+    )
+    return {attackers[a]: [blockers[b] for b in bs] for a, bs in plan.blocks.items()}
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class DecisionBudget:
+    """
+    Per-decision limits for anytime agents, read from `game.decision_budget`
+    at each choose_* call. Search agents stop when either limit is hit and
+    return their best answer so far. What a "node" is depends on the agent:
+    MCTS iterations, block-solver states, attack-planner evaluations.
+    `slack` is how far past time_limit a decision may run before it counts
+    as an overrun in BudgetUsage.
+    """
+    time_limit: Optional[float] = None
+    node_limit: Optional[int] = None
+    slack: float = 0.005
+
+    def deadline(self, start: Optional[float] = None) -> Optional[float]:
+        """Absolute time.perf_counter() deadline for a decision started at `start`."""
+        if self.time_limit is None:
+            return None
+        return (time.perf_counter() if start is None else start) + self.time_limit
+
+    def nodes(self, default: int) -> int:
+        """`default` capped by node_limit."""
+        return default if self.node_limit is None else min(default, self.node_limit)
+
+
+@dataclass
+class BudgetUsage:
+    """Actual time and nodes used per decision, accumulated for one agent."""
+    decisions: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    nodes: int = 0
+    overruns: int = 0
+
+    def record(self, elapsed: float, nodes: Optional[int] = None, budget: Optional[DecisionBudget] = None) -> None:
+        self.decisions += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        if nodes is not None:
+            self.nodes += nodes
+        if budget is not None and budget.time_limit is not None and elapsed > budget.time_limit + budget.slack:
+            self.overruns += 1
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.decisions if self.decisions else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "decisions": self.decisions,
+            "mean_ms": 1000.0 * self.mean_time,
+            "max_ms": 1000.0 * self.max_time,
+            "nodes": self.nodes,
+            "overruns": self.overruns,
+        }
@@ -1,4 +1,8 @@
-from typing import Optional, List, Dict, Union, cast
+from typing import TYPE_CHECKING, Optional, List, Dict, Union, cast
+from .keywords import keyword_flags
+
+if TYPE_CHECKING:
+    from .effects import ContinuousEffects
 
 
 class Card:
@@ -14,19 +18,87 @@ class Card:
         self.mana_cost: Optional[str] = card_data.get("manaCost")
         self.converted_mana_cost: float = card_data.get("convertedManaCost", 0)
         self.colors: List[str] = card_data.get("colors", [])
-        self.power: Optional[int] = self._safe_int(card_data.get("power"))
-        self.toughness: Optional[int] = self._safe_int(card_data.get("toughness"))
+        # Printed P/T; `power`/`toughness` below apply continuous effects
+        self.base_power: Optional[int] = self._safe_int(card_data.get("power"))
+        self.base_toughness: Optional[int] = self._safe_int(card_data.get("toughness"))
         self.text: str = card_data.get("text", "")
         self.rarity: Optional[str] = card_data.get("rarity")
+        # Evergreen keyword abilities as bitflags (see keywords.py)
+        self.keywords: int = keyword_flags(card_data)
 
         # Runtime properties (not in MTGJSON)
         self.tapped: bool = False
         self.summoning_sick: bool = True
-        self.zone: str = "library"  # Possible: library, hand, battlefield, graveyard, exile
+        self.zone: str = "library"  # Possible: library, hand, stack, battlefield, graveyard, exile
+        # Damage marked this turn (removed in the cleanup step); any of it from a deathtouch source
+        self.damage: int = 0
+        self.deathtouch_damage: bool = False
+        # The game's continuous effects while on its battlefield (see effects.py),
+        # and the P/T they last produced, valid while _pt_version matches
+        self.effects: Optional["ContinuousEffects"] = None
+        self._power = self.base_power
+        self._toughness = self.base_toughness
+        self._pt_version = -1
+
+    @property
+    def power(self) -> Optional[int]:
+        effects = self.effects
+        if effects is not None and self._pt_version != effects.version:
+            effects.refresh(self)
+        return self._power
+
+    @power.setter
+    def power(self, value: Optional[int]) -> None:
+        """Overrides the printed power."""
+        self.base_power = self._power = value
+        self._pt_version = -1
+
+    @property
+    def toughness(self) -> Optional[int]:
+        effects = self.effects
+        if effects is not None and self._pt_version != effects.version:
+            effects.refresh(self)
+        return self._toughness
+
+    @toughness.setter
+    def toughness(self, value: Optional[int]) -> None:
+        """Overrides the printed toughness."""
+        self.base_toughness = self._toughness = value
+        self._pt_version = -1
+
+    def set_computed_pt(self, power: Optional[int], toughness: Optional[int], version: int) -> None:
+        self._power, self._toughness, self._pt_version = power, toughness, version
+
+    def attach_effects(self, effects: Optional["ContinuousEffects"]) -> None:
+        """Follow `effects` (on entering a battlefield), or none: printed P/T again."""
+        self.effects = effects
+        self._pt_version = -1
+        if effects is None:
+            self._power, self._toughness = self.base_power, self.base_toughness
 
     def copy(self) -> "Card":
         return Card(self.card_data)
 
+    def clone(self) -> "Card":
+        """
+        Copy that shares the (read-only) template data but keeps runtime state.
+        Much cheaper than copy(); used when cloning games for search.
+        """
+        new = Card.__new__(Card)
+        new.__dict__.update(self.__dict__)
+        return new
+
+    def reset_runtime(self) -> None:
+        """Restore runtime properties to their fresh-from-the-deck values."""
+        self.tapped = False
+        self.summoning_sick = True
+        self.zone = "library"
+        self.damage = 0
+        self.deathtouch_damage = False
+        self.base_power = self._safe_int(self.card_data.get("power"))
+        self.base_toughness = self._safe_int(self.card_data.get("toughness"))
+        self.attach_effects(None)
+
     def _safe_int(self, val: Union[str, int, float, None]) -> Optional[int]:
         if val is None:
             return None
@@ -41,5 +113,11 @@ class Card:
     def is_land(self) -> bool:
         return "Land" in self.types
 
+    def is_instant(self) -> bool:
+        return "Instant" in self.types
+
+    def is_sorcery(self) -> bool:
+        return "Sorcery" in self.types
+
     def __repr__(self) -> str:
         return f"<Card {self.name} ({self.mana_cost})>"
@@ -37,9 +37,14 @@ if _JSON_PATH is None:
 # --------------------------------------------------------------
 
 
+def card_db_path() -> Path:
+    """The JSON file cards are loaded from."""
+    return cast(Path, _JSON_PATH)
+
+
 @lru_cache(maxsize=1)
 def load_raw_json() -> Dict[str, Any]:
-    path = cast(Path, _JSON_PATH)
+    path = card_db_path()
     with path.open("r", encoding="utf-8") as fh:
         raw = json.load(fh)
     return cast(Dict[str, Any], raw)
@@ -66,3 +71,18 @@ def get_card_template_by_name(name: str) -> Dict[str, Any]:
     if key not in idx:
         raise KeyError(f"Card “{name}” not found in DB.")
     return idx[key]
+
+
+@lru_cache(maxsize=1)
+def build_template_ids() -> Dict[str, int]:
+    """
+    Returns {card_name.lower(): template_id}.
+    Ids run 1..N in sorted name order, so they are stable for a given card DB;
+    0 is reserved for cards that are not in the DB.
+    """
+    names = sorted(build_name_index())
+    return {name: i + 1 for i, name in enumerate(names)}
+
+
+def get_template_id(name: str) -> int:
+    return build_template_ids().get(name.lower(), 0)
@@ -0,0 +1,237 @@
+"""
+Combat: attack and block legality, declarations, damage assignment
+order and combat damage.
+
+Blocks are kept both ways (game.blocking_assignments: attacker -> its
+blockers in damage assignment order, game.blocked_by: blocker ->
+attacker), so each check during declaration is a dict lookup. Damage is
+resolved in one pass over the combatants per damage step; damage is
+marked on the creatures and the state-based action check that follows
+(sba.py) removes the lethally damaged ones together.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+
+from .agent import DamageOrderAgent, FullAgent
+from .card import Card
+from .game_state import GameState, Player
+from .keywords import DEATHTOUCH, DEFENDER, FIRST_STRIKE, FLYING, HASTE, REACH, TRAMPLE, VIGILANCE
+from . import sba as SBA
+from .triggers import ATTACKS, DEALS_DAMAGE, Event, has_listeners
+
+
+# =========================
+# Legality
+# =========================
+
+
+def can_attack(card: Card) -> bool:
+    """Untapped creature without defender that is not summoning sick (or has haste)."""
+    return (
+        card.is_creature()
+        and not card.tapped
+        and not card.keywords & DEFENDER
+        and (not card.summoning_sick or bool(card.keywords & HASTE))
+    )
+
+
+def get_attackers(player: Player) -> list:
+    return [card for card in player.battlefield if can_attack(card)]
+
+
+def can_block(game: GameState, blocker: Card, attacker: Card) -> bool:
+    if blocker.tapped or not blocker.is_creature():
+        return False
+    # Flyers can only be blocked by creatures with flying or reach
+    if attacker.keywords & FLYING and not blocker.keywords & (FLYING | REACH):
+        return False
+    return True
+
+
+# =========================
+# Declarations
+# =========================
+
+
+def declare_attackers(game: GameState, attackers: list[Card]) -> None:
+    player = game.get_active_player()
+    on_battlefield = set(player.battlefield)
+    legal_attackers = []
+
+    for creature in attackers:
+        if creature in on_battlefield and can_attack(creature):
+            if not creature.keywords & VIGILANCE:
+                creature.tapped = True
+            on_battlefield.discard(creature)   # each creature attacks once
+            legal_attackers.append(creature)
+        else:
+            print(f"{creature.name} is not a valid attacker.")
+
+    game.attackers = legal_attackers
+    if legal_attackers and has_listeners(game, ATTACKS):
+        player.events.extend(Event(ATTACKS, c) for c in legal_attackers)
+
+
+def declare_blockers(game: GameState, assignments: Dict[Card, list[Card]]) -> None:
+    """
+    Record the defending player's blocks. Each attacker's blockers start
+    in the order given; the attacking player may reorder them with
+    order_blockers before damage.
+    """
+    defenders = set(game.get_opponent().battlefield)
+    attacking = set(game.attackers)
+    for attacker, blockers in assignments.items():
+        if attacker not in attacking:
+            raise ValueError(f"{attacker.name} is not attacking.")
+
+        for blocker in blockers:
+            if blocker not in defenders:
+                raise ValueError(f"{blocker.name} not controlled by defender.")
+            if not blocker.is_creature():
+                raise ValueError(f"{blocker.name} is not a creature.")
+            if blocker.tapped:
+                raise ValueError(f"{blocker.name} is tapped.")
+            if not can_block(game, blocker, attacker):
+                raise ValueError(f"{blocker.name} can't block {attacker.name}.")
+            # Prevent one blocker from blocking two attackers
+            if blocker in game.blocked_by:
+                raise ValueError(f"{blocker.name} already blocking something.")
+            game.blocked_by[blocker] = attacker
+
+        game.blocking_assignments[attacker] = list(blockers)
+
+
+def order_blockers(game: GameState, attacker: Card, order: List[Card]) -> None:
+    """Damage assignment order for `attacker`: a permutation of its blockers."""
+    blockers = game.blocking_assignments.get(attacker)
+    if blockers is None:
+        raise ValueError(f"{attacker.name} is not blocked.")
+    if len(order) != len(blockers) or set(order) != set(blockers):
+        raise ValueError(f"Damage assignment order for {attacker.name} must list each of its blockers once.")
+    game.blocking_assignments[attacker] = list(order)
+
+
+def announce_damage_orders(game: GameState, attacking_agent: FullAgent) -> None:
+    """
+    The attacking player orders the blockers of each attacker blocked by
+    two or more creatures. Agents without order_blockers keep the order
+    the blocks were declared in.
+    """
+    if not isinstance(attacking_agent, DamageOrderAgent):
+        return
+    for attacker, blockers in list(game.blocking_assignments.items()):
+        if len(blockers) > 1:
+            order_blockers(game, attacker, attacking_agent.order_blockers(game, attacker, list(blockers)))
+
+
+def declare_blockers_step(game: GameState, active_agent: FullAgent, defending_agent: FullAgent) -> None:
+    """Declare blockers step: blocks, then damage assignment orders."""
+    declare_blockers(game, defending_agent.choose_blockers(game))
+    announce_damage_orders(game, active_agent)
+
+
+# =========================
+# Damage
+# =========================
+
+
+def _deals_damage(card: Card, first_strike: Optional[bool]) -> bool:
+    """Whether `card` deals damage in this damage step (None: the only step)."""
+    return first_strike is None or bool(card.keywords & FIRST_STRIKE) == first_strike
+
+
+def _assign_attacker_damage(attacker: Card, blockers: List[Card], damage: Dict[Card, int]) -> Tuple[int, int]:
+    """
+    Blocked attacker's damage, in damage assignment order: lethal damage
+    to each blocker in turn (counting damage already marked on it; 1 is
+    lethal with deathtouch), leftovers to the last one, or to the
+    defending player with trample. Assignments are added to `damage`.
+    Returns (damage to the player, damage to blockers).
+    """
+    to_blockers = 0
+    remaining = attacker.power or 0
+    deathtouch = bool(attacker.keywords & DEATHTOUCH)
+    for i, blocker in enumerate(blockers):
+        if remaining <= 0:
+            break
+        lethal = 1 if deathtouch else max(0, (blocker.toughness or 0) - blocker.damage)
+        last = i == len(blockers) - 1 and not attacker.keywords & TRAMPLE
+        dealt = remaining if last else min(remaining, lethal)
+        if dealt > 0:
+            damage[blocker] = damage.get(blocker, 0) + dealt
+        remaining -= dealt
+        to_blockers += dealt
+    # Blocked with every blocker gone: no damage unless it has trample
+    return (remaining if attacker.keywords & TRAMPLE else 0), to_blockers
+
+
+def resolve_combat_damage(game: GameState) -> None:
+    """
+    Combat damage. If any creature in combat has first strike there are
+    two damage steps (first strikers, then everyone else); otherwise one.
+    Damage within a step is dealt simultaneously and marked on the
+    creatures, then state-based actions run, so lethally damaged
+    creatures die together before the next step.
+    """
+    attacker_controller = game.get_active_player()
+    defender_controller = game.get_opponent()
+    attacking = set(game.attackers)
+
+    # Combatants still on the battlefield (an instant may have removed some)
+    combatants = set(game.attackers)
+    for blockers in game.blocking_assignments.values():
+        combatants.update(blockers)
+    in_combat = combatants.intersection(attacker_controller.battlefield)
+    in_combat.update(combatants.intersection(defender_controller.battlefield))
+
+    has_first_strike = any(c.keywords & FIRST_STRIKE for c in in_combat)
+    steps: List[Optional[bool]] = [True, False] if has_first_strike else [None]
+
+    # Damage dealt per source, only recorded when something listens for it
+    dealt_by: Optional[Dict[Card, int]] = {} if has_listeners(game, DEALS_DAMAGE) else None
+
+    for first_strike in steps:
+        damage: Dict[Card, int] = {}
+        deathtouched: Set[Card] = set()
+        to_defender = 0
+        for attacker in game.attackers:
+            if attacker not in in_combat:
+                continue
+            assigned = game.blocking_assignments.get(attacker)
+            blockers = [b for b in assigned or [] if b in in_combat]
+
+            # --- attacker ➜ player / blockers ---------------------------
+            if _deals_damage(attacker, first_strike):
+                if not assigned:             # ── unblocked
+                    to_player, to_blockers = attacker.power or 0, 0
+                else:
+                    to_player, to_blockers = _assign_attacker_damage(attacker, blockers, damage)
+                    if attacker.keywords & DEATHTOUCH:
+                        deathtouched.update(blockers)
+                to_defender += to_player
+                if dealt_by is not None and to_player + to_blockers > 0:
+                    dealt_by[attacker] = dealt_by.get(attacker, 0) + to_player + to_blockers
+
+            # --- blockers ➜ attacker (sum of their power) -------------
+            for blocker in blockers:
+                if _deals_damage(blocker, first_strike) and (blocker.power or 0) > 0:
+                    damage[attacker] = damage.get(attacker, 0) + (blocker.power or 0)
+                    if blocker.keywords & DEATHTOUCH:
+                        deathtouched.add(attacker)
+                    if dealt_by is not None:
+                        dealt_by[blocker] = dealt_by.get(blocker, 0) + (blocker.power or 0)
+
+        for card, amount in damage.items():
+            SBA.deal_damage(game, card, amount, card in deathtouched)
+        defender_controller.life_total -= to_defender
+        for card in SBA.check_state_based_actions(game):
+            in_combat.discard(card)
+        if game.is_game_over():
+            break
+
+    if dealt_by:
+        for source, amount in dealt_by.items():
+            controller = attacker_controller if source in attacking else defender_controller
+            controller.events.append(Event(DEALS_DAMAGE, source, amount=amount))
+    game.attackers.clear()
+    game.blocking_assignments.clear()
+    game.blocked_by.clear()
@@ -0,0 +1,122 @@
+from typing import List, Optional, Sequence, Tuple
+
+from .card import Card
+from .keywords import DEATHTOUCH, FIRST_STRIKE, FLYING, REACH, TRAMPLE
+
+# (power, toughness[, combat keyword flags]) of a creature; the combat
+# planners work on these instead of Card objects so outcomes can be
+# memoized by value. The flags (flying, reach, first strike, deathtouch,
+# trample) are only present when non-zero, so keywordless creatures stay
+# (power, toughness). Other keywords are not modeled here: haste/defender
+# are already applied by get_attackers.
+PT = Tuple[int, ...]
+
+COMBAT_KEYWORDS = FLYING | REACH | FIRST_STRIKE | DEATHTOUCH | TRAMPLE
+
+
+def card_pt(card: Card) -> PT:
+    flags = card.keywords & COMBAT_KEYWORDS
+    pt = (card.power or 0, card.toughness or 0)
+    return pt + (flags,) if flags else pt
+
+
+def pt_keywords(pt: PT) -> int:
+    return pt[2] if len(pt) > 2 else 0
+
+
+def pt_can_block(blocker: PT, attacker: PT) -> bool:
+    """combat.can_block for an untapped creature blocker, by value."""
+    return not pt_keywords(attacker) & FLYING or bool(pt_keywords(blocker) & (FLYING | REACH))
+
+
+def _deals_damage(pt: PT, first_strike: Optional[bool]) -> bool:
+    return first_strike is None or bool(pt_keywords(pt) & FIRST_STRIKE) == first_strike
+
+
+def resolve_block(attacker: PT, blockers: Sequence[PT]) -> Tuple[bool, Tuple[bool, ...], int]:
+    """
+    Outcome of one attacker blocked by `blockers` (in damage order),
+    mirroring combat.resolve_combat_damage: a first-strike damage step if
+    any of them has first strike, lethal damage assigned to each blocker in
+    turn (1 with deathtouch, leftovers to the last blocker or, with
+    trample, to the player), and creatures dying between steps.
+    Returns (attacker_dies, blocker_dies per blocker, damage to the player).
+    """
+    if len(attacker) == 2 and all(len(b) == 2 for b in blockers):
+        # No combat keywords: one damage step, nothing tramples over
+        left = max(0, attacker[0])
+        killed: List[bool] = []
+        for k, blocker in enumerate(blockers):
+            assigned = left if k == len(blockers) - 1 else min(left, max(0, blocker[1]))
+            left -= assigned
+            killed.append(assigned >= blocker[1])
+        return sum(b[0] for b in blockers if b[0] > 0) >= attacker[1], tuple(killed), 0
+
+    flags = pt_keywords(attacker)
+    has_first_strike = any(pt_keywords(pt) & FIRST_STRIKE for pt in (attacker, *blockers))
+    steps: List[Optional[bool]] = [True, False] if has_first_strike else [None]
+    attacker_damage = 0
+    attacker_dies = False
+    damage = [0] * len(blockers)
+    dead = [False] * len(blockers)
+    to_player = 0
+
+    for first_strike in steps:
+        dealt = [0] * len(blockers)
+        if not attacker_dies and _deals_damage(attacker, first_strike):
+            remaining = attacker[0]
+            alive = [i for i in range(len(blockers)) if not dead[i]]
+            for k, i in enumerate(alive):
+                if remaining <= 0:
+                    break
+                lethal = 1 if flags & DEATHTOUCH else max(0, blockers[i][1] - damage[i])
+                last = k == len(alive) - 1 and not flags & TRAMPLE
+                dealt[i] = remaining if last else min(remaining, lethal)
+                remaining -= dealt[i]
+            if flags & TRAMPLE:
+                to_player += remaining
+
+        incoming = 0
+        deathtouched = False
+        for i, blocker in enumerate(blockers):
+            if not dead[i] and _deals_damage(blocker, first_strike) and blocker[0] > 0:
+                incoming += blocker[0]
+                deathtouched = deathtouched or bool(pt_keywords(blocker) & DEATHTOUCH)
+
+        for i, blocker in enumerate(blockers):
+            damage[i] += dealt[i]
+            if not dead[i]:
+                dead[i] = damage[i] >= blocker[1] or (dealt[i] > 0 and bool(flags & DEATHTOUCH))
+        if not attacker_dies:
+            attacker_damage += incoming
+            attacker_dies = attacker_damage >= attacker[1] or (incoming > 0 and deathtouched)
+    return attacker_dies, tuple(dead), to_player
+
+
+def simulate_block(attacker: PT, blockers: Sequence[PT]) -> Tuple[bool, Tuple[bool, ...]]:
+    """resolve_block without the trample damage: (attacker_dies, blocker_dies per blocker)."""
+    attacker_dies, deaths, _ = resolve_block(attacker, blockers)
+    return attacker_dies, deaths
+
+
+def simulate_combat(
+    attackers: Sequence[PT], blocks: Sequence[Sequence[PT]]
+) -> Tuple[int, List[bool], List[Tuple[bool, ...]]]:
+    """
+    Whole-combat version: blocks[i] are the blockers of attackers[i].
+    Returns (damage to defending player, attacker deaths, blocker deaths).
+    """
+    damage = 0
+    attacker_deaths: List[bool] = []
+    blocker_deaths: List[Tuple[bool, ...]] = []
+    for attacker, blockers in zip(attackers, blocks):
+        if not blockers:
+            damage += attacker[0]
+            attacker_deaths.append(False)
+            blocker_deaths.append(())
+            continue
+        dies, deaths, to_player = resolve_block(attacker, blockers)
+        damage += to_player
+        attacker_deaths.append(dies)
+        blocker_deaths.append(deaths)
+    return damage, attacker_deaths, blocker_deaths
@@ -12,6 +12,23 @@ class Deck:
     cards: List[Card]
 
 
+class DeckPool:
+    """
+    Prebuilt Card instances for one deck, reused from game to game.
+
+    `fresh()` resets runtime fields only and returns the cards in their
+    original deck order, so starting a new game constructs no Card objects.
+    """
+
+    def __init__(self, cards: List[Card]) -> None:
+        self.cards: List[Card] = list(cards)
+
+    def fresh(self) -> List[Card]:
+        for card in self.cards:
+            card.reset_runtime()
+        return list(self.cards)
+
+
 def _make_copies(template: dict, n: int) -> List[Card]:
     return [Card(template).copy() for _ in range(n)]
 
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .card import Card
+    from .game_state import Player
+
+# Layer 7 sublayers (power/toughness), applied in this order and by
+# timestamp within a sublayer. There are no counters yet (7d).
+CHARACTERISTIC_DEFINING = 0   # 7a: e.g. "power is equal to the number of creatures you control"
+SET_PT = 1                    # 7b: "becomes a 0/1"
+MODIFY_PT = 2                 # 7c: pumps and anthems
+
+# Optional P/T: None keeps the value from earlier layers
+OptPT = Tuple[Optional[int], Optional[int]]
+
+
+@dataclass(eq=False)
+class ContinuousEffect:
+    """
+    One P/T effect. It applies to `target` if given, else to every
+    creature for which `applies(effects, source, card)` is true (static
+    abilities such as anthems). SET_PT uses power/toughness as values,
+    MODIFY_PT adds them, and CHARACTERISTIC_DEFINING calls
+    `compute(effects, card)`. Static effects of a permanent last while
+    their source is on the battlefield; effects with a target end when it
+    leaves; until_end_of_turn ones also end in the cleanup step.
+    `board_dependent` effects read the battlefield, so any creature
+    entering or leaving invalidates the cache.
+    """
+    layer: int
+    source: Optional["Card"] = None
+    target: Optional["Card"] = None
+    power: Optional[int] = None
+    toughness: Optional[int] = None
+    applies: Optional[Callable[["ContinuousEffects", "Card", "Card"], bool]] = None
+    compute: Optional[Callable[["ContinuousEffects", "Card"], OptPT]] = None
+    until_end_of_turn: bool = False
+    board_dependent: bool = False
+    timestamp: int = 0
+
+    def affects(self, effects: "ContinuousEffects", card: "Card") -> bool:
+        if self.target is not None:
+            return self.target is card
+        return self.applies is not None and self.source is not None and self.applies(effects, self.source, card)
+
+
+def _you_control(effects: "ContinuousEffects", source: "Card", card: "Card") -> bool:
+    return card.is_creature() and effects.controller(card) == effects.controller(source)
+
+
+def _creatures_you_control(effects: "ContinuousEffects", card: "Card") -> OptPT:
+    seat = effects.controller(card)
+    if seat is None:
+        return None, None
+    return sum(1 for c in effects.players[seat].battlefield if c.is_creature()), None
+
+
+# card name -> static P/T abilities it has while on the battlefield
+STATIC_ABILITIES: Dict[str, Callable[["Card"], List[ContinuousEffect]]] = {
+    # Ironroot Warlord's power is equal to the number of creatures you control.
+    "Ironroot Warlord": lambda card: [
+        ContinuousEffect(
+            CHARACTERISTIC_DEFINING, source=card, target=card, compute=_creatures_you_control, board_dependent=True
+        )
+    ],
+}
+
+
+def anthem(power: int, toughness: int) -> Callable[["Card"], List[ContinuousEffect]]:
+    """Static ability "Creatures you control get +power/+toughness" (for STATIC_ABILITIES)."""
+    return lambda card: [
+        ContinuousEffect(MODIFY_PT, source=card, power=power, toughness=toughness, applies=_you_control)
+    ]
+
+
+@dataclass(eq=False)
+class ContinuousEffects:
+    """
+    All continuous P/T effects of one game, with cached results.
+
+    Every change that can alter some creature's P/T (an effect added or
+    removed, the source of a static effect changing zones, a creature
+    entering or leaving while board-dependent effects exist) bumps
+    `version`. Cards on the battlefield keep their last computed P/T
+    with the version it was computed at, and Card.power/toughness only
+    recompute (via refresh) when the version moved, so reads between
+    changes cost an integer compare.
+    """
+    players: Sequence["Player"]
+    effects: List[ContinuousEffect] = field(default_factory=list)
+    version: int = 0
+    _clock: int = 0
+    _board_dependent: int = 0
+    _controllers: Dict[int, int] = field(default_factory=dict)   # id(card) -> seat
+    # Told about each card whose P/T may have changed (None: possibly any
+    # creature), so state-based actions only look at those (see sba.py)
+    on_change: Optional[Callable[[Optional["Card"]], None]] = None
+
+    # ---- queries -------------------------------------------------------
+
+    def controller(self, card: "Card") -> Optional[int]:
+        seat = self._controllers.get(id(card))
+        if seat is None:
+            for i, player in enumerate(self.players):
+                if card in player.battlefield:
+                    return i
+        return seat
+
+    def refresh(self, card: "Card") -> None:
+        """Recompute `card`'s P/T from its printed values through layer 7."""
+        power, toughness = card.base_power, card.base_toughness
+        for effect in self.effects:
+            if not effect.affects(self, card):
+                continue
+            if effect.layer == MODIFY_PT:
+                power = (power or 0) + (effect.power or 0)
+                toughness = (toughness or 0) + (effect.toughness or 0)
+                continue
+            if effect.layer == CHARACTERISTIC_DEFINING and effect.compute is not None:
+                new_power, new_toughness = effect.compute(self, card)
+            else:
+                new_power, new_toughness = effect.power, effect.toughness
+            if new_power is not None:
+                power = new_power
+            if new_toughness is not None:
+                toughness = new_toughness
+        card.set_computed_pt(power, toughness, self.version)
+
+    # ---- changes -------------------------------------------------------
+
+    def _changed(self, effect: ContinuousEffect) -> None:
+        if self.on_change is not None:
+            self.on_change(effect.target)
+
+    def _board_changed(self) -> None:
+        """A creature entered or left: board-dependent effects may give new values."""
+        for effect in self.effects:
+            if effect.board_dependent:
+                self._changed(effect)
+
+    def add(self, effect: ContinuousEffect) -> ContinuousEffect:
+        self._clock += 1
+        effect.timestamp = self._clock
+        self.effects.append(effect)
+        self.effects.sort(key=lambda e: (e.layer, e.timestamp))
+        if effect.board_dependent:
+            self._board_dependent += 1
+        if effect.target is not None:
+            effect.target.attach_effects(self)
+        self.version += 1
+        self._changed(effect)
+        return effect
+
+    def remove(self, effect: ContinuousEffect) -> None:
+        self.effects.remove(effect)
+        if effect.board_dependent:
+            self._board_dependent -= 1
+        self.version += 1
+        self._changed(effect)
+
+    def entered(self, card: "Card", seat: int) -> None:
+        """`card` entered the battlefield under `seat`'s control."""
+        self._controllers[id(card)] = seat
+        card.attach_effects(self)
+        statics = STATIC_ABILITIES.get(card.name)
+        if statics is not None:
+            for effect in statics(card):
+                self.add(effect)
+        elif self._board_dependent and card.is_creature():
+            self.version += 1
+        if card.is_creature():
+            if self.on_change is not None:
+                self.on_change(card)
+            if self._board_dependent:
+                self._board_changed()
+
+    def left(self, card: "Card") -> None:
+        """`card` left the battlefield: its static effects and effects on it end."""
+        self._controllers.pop(id(card), None)
+        ended = [e for e in self.effects if e.source is card or e.target is card]
+        for effect in ended:
+            self.remove(effect)
+        if self._board_dependent and card.is_creature():
+            if not ended:
+                self.version += 1
+            self._board_changed()
+        card.attach_effects(None)
+
+    def end_of_turn(self) -> None:
+        """Cleanup step: "until end of turn" effects end."""
+        ended = [e for e in self.effects if e.until_end_of_turn]
+        for effect in ended:
+            self.remove(effect)
+
+    def clone(self, card_map: Dict[int, "Card"], players: Sequence["Player"]) -> "ContinuousEffects":
+        """Copy for a cloned game: effects and cards remapped, clones attached to the copy."""
+        new = ContinuousEffects(
+            players, version=self.version, _clock=self._clock, _board_dependent=self._board_dependent
+        )
+        new._controllers = {id(card_map[k]): seat for k, seat in self._controllers.items() if k in card_map}
+        for effect in self.effects:
+            copy = ContinuousEffect(**{**effect.__dict__})
+            if effect.source is not None:
+                copy.source = card_map.get(id(effect.source), effect.source)
+            if effect.target is not None:
+                copy.target = card_map.get(id(effect.target), effect.target)
+            new.effects.append(copy)
+        for card in card_map.values():
+            if card.effects is self:
+                card.attach_effects(new)
+        return new
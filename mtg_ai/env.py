@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import numpy as np
 import gymnasium as gym
-from typing import Any, Dict, Tuple, List, Optional, Callable, Protocol
+from typing import Any, Dict, Tuple, List, Optional, Callable, Protocol, Union
 from numpy.typing import NDArray
 
 from .game_state import GameState, Player
 from .game_controller import step_game
 from .card import Card
 from .agent import FullAgent
+from .card_db import get_template_id
+from .deck_builder import DeckPool
+from .block_solver import choose_blocks
+from .attack_planner import choose_attack_plans
 from . import game_actions as GA
 from .agents.simple import NaiveAgent  # opponent baseline
 
@@ -25,13 +29,24 @@ MAX_HAND = 10  # number of addressable hand slots for play/cast actions
 # 1+MAX_HAND..2*MAX_HAND -> CAST_CREATURE at hand index (i-1-MAX_HAND)
 # 2*MAX_HAND+1           -> ATTACK_NONE
 # 2*MAX_HAND+2           -> ATTACK_ALL
-ACTION_SIZE = 2 * MAX_HAND + 3
+# 2*MAX_HAND+3+k         -> ATTACK_PLAN k (k-th best attack_planner subset)
+NUM_ATTACK_PLANS = 3
+ACTION_SIZE = 2 * MAX_HAND + 3 + NUM_ATTACK_PLANS
+
+# Length of the summary observation vector (_encode_obs)
+OBS_SIZE = 48
 
 A_PASS = 0
 A_PLAY_BASE = 1
 A_CAST_BASE = 1 + MAX_HAND
 A_ATTACK_NONE = 1 + 2 * MAX_HAND
 A_ATTACK_ALL = 2 + 2 * MAX_HAND
+A_ATTACK_PLAN_BASE = 3 + 2 * MAX_HAND
+
+# Entity observation mode: padded per-card slots
+MAX_BATTLEFIELD = 32  # addressable permanents per side
+# per-card features: power, toughness, cmc, tapped, summoning_sick, is_land, is_creature
+CARD_FEATURES = 7
 
 # Phase names we care about
 PHASES = [
@@ -61,6 +76,23 @@ class HasCards(Protocol):
 
 DeckBuilderFn = Callable[[], Tuple[HasCards, HasCards]]
 
+# Flat summary vector, or the Dict of padded arrays in "entity" mode
+Observation = Union[NDArray[np.float32], Dict[str, NDArray[Any]]]
+
+
+class BatchPolicy(Protocol):
+    """Anything that maps (n, OBS_SIZE) observations and (n, A) masks to n actions."""
+
+    def act_batch(
+        self,
+        obs: NDArray[np.float32],
+        masks: NDArray[np.bool_],
+        *,
+        greedy: bool = True,
+        rng: Optional[np.random.Generator] = None,
+    ) -> NDArray[np.int64]:
+        ...
+
 
 # =========================
 # Learner Agent Proxy
@@ -71,14 +103,15 @@ class LearnerProxy(FullAgent):
     """
     A tiny adapter that returns the choices specified by the environment's
     last action. If no choice was specified for a phase, it returns defaults
-    (no casts; no attackers; no blocks).
+    (no casts; no attackers; no blocks). Blocks are not part of the action
+    space; with auto_block=True they are chosen by the block solver.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, auto_block: bool = False) -> None:
         # set by env before calling step_game
         self.pending_cast_card: Optional[Card] = None
         self.pending_attackers: Optional[List[Card]] = None
-        # (blockers omitted for baseline; returns {})
+        self.auto_block: bool = auto_block
 
     def clear(self) -> None:
         self.pending_cast_card = None
@@ -101,6 +134,8 @@ class LearnerProxy(FullAgent):
         return []
 
     def choose_blockers(self, game: GameState) -> Dict[Card, List[Card]]:
+        if self.auto_block:
+            return choose_blocks(game)
         return {}
 
 
@@ -144,47 +179,117 @@ def _battlefield_counts(player: Player) -> List[int]:
     return [untapped_lands, tapped_lands, ready_crea, sick_crea, other_crea, ready_power]
 
 
-def _onehot_phase(phase: str) -> NDArray[np.float32]:
-    vec: NDArray[np.float32] = np.zeros(len(PHASES), dtype=np.float32)
-    idx = PHASE_INDEX.get(phase, None)
+def _encode_obs(
+    game: GameState, pov: Player, out: Optional[NDArray[np.float32]] = None
+) -> NDArray[np.float32]:
+    """
+    The OBS_SIZE summary vector for `pov`. Written in place into `out` when
+    given (so hot loops can reuse one buffer), otherwise into a new array.
+    """
+    if out is None:
+        out = np.zeros(OBS_SIZE, dtype=np.float32)
+    me = pov
+    opp = game.get_opponent() if game.get_active_player() is me else game.get_active_player()
+
+    values: List[float] = [
+        me.life_total / 20.0,                                        # 1
+        float(me.lands_played_this_turn >= 1),                       # 1
+        *(me.mana_pool[c] / 10.0 for c in ("W", "U", "B", "R", "G", "C")),  # 6
+        *(n / 10.0 for n in _count_hand_buckets(me)),                # 5
+        *(n / 10.0 for n in _battlefield_counts(me)),                # 6
+        len(me.library) / 60.0, len(me.graveyard) / 60.0,            # 2
+        opp.life_total / 20.0,                                       # 1
+        *(opp.mana_pool[c] / 10.0 for c in ("W", "U", "B", "R", "G", "C")),  # 6
+        len(opp.library) / 60.0, len(opp.hand) / 10.0, len(opp.graveyard) / 60.0,  # 3
+        *(n / 10.0 for n in _battlefield_counts(opp)),               # 6
+    ]
+    # phase one-hot (11) first, then the scalar features
+    out[:len(PHASES)] = 0.0
+    idx = PHASE_INDEX.get(game.phase)
     if idx is not None:
-        vec[idx] = 1.0
-    return vec
+        out[idx] = 1.0
+    for i, value in enumerate(values, len(PHASES)):
+        out[i] = value
+    return out
 
 
-def _encode_obs(game: GameState, pov: Player) -> NDArray[np.float32]:
-    me = pov
-    opp = game.get_opponent() if game.get_active_player() is me else game.get_active_player()
-    phase_vec = _onehot_phase(game.phase)
-
-    me_life = np.array([me.life_total / 20.0], dtype=np.float32)
-    me_landplayed = np.array([float(me.lands_played_this_turn >= 1)], dtype=np.float32)
-    me_pool = np.array([me.mana_pool[c] for c in ("W", "U", "B", "R", "G", "C")], dtype=np.float32) / 10.0
-    me_hand = np.array(_count_hand_buckets(me), dtype=np.float32) / 10.0
-    me_bf = np.array(_battlefield_counts(me), dtype=np.float32) / 10.0
-    me_sizes = np.array([len(me.library) / 60.0, len(me.graveyard) / 60.0], dtype=np.float32)
-
-    opp_life = np.array([opp.life_total / 20.0], dtype=np.float32)
-    opp_pool = np.array([opp.mana_pool[c] for c in ("W", "U", "B", "R", "G", "C")], dtype=np.float32) / 10.0
-    opp_sizes = np.array([len(opp.library) / 60.0, len(opp.hand) / 10.0, len(opp.graveyard) / 60.0], dtype=np.float32)
-    opp_bf = np.array(_battlefield_counts(opp), dtype=np.float32) / 10.0
-
-    obs = np.concatenate([
-        phase_vec,            # 11
-        me_life,              # 1
-        me_landplayed,        # 1
-        me_pool,              # 6
-        me_hand,              # 5
-        me_bf,                # 6
-        me_sizes,             # 2
-        opp_life,             # 1
-        opp_pool,             # 6
-        opp_sizes,            # 3
-        opp_bf,               # 6
-    ], dtype=np.float32)
-    # mypy sees np.concatenate as Any; cast to concrete type
-    from typing import cast as _cast
-    return _cast(NDArray[np.float32], obs)
+# =========================
+# Entity observation encoder
+# =========================
+
+# name -> (template_id, cmc); static per template, so computed once per name
+_template_cache: Dict[str, Tuple[int, int]] = {}
+
+
+def _template_info(card: Card) -> Tuple[int, int]:
+    info = _template_cache.get(card.name)
+    if info is None:
+        info = (get_template_id(card.name), _cmc_from_cost(card))
+        _template_cache[card.name] = info
+    return info
+
+
+def entity_observation_space() -> gym.spaces.Dict:
+    """Dict space produced by EntityObsEncoder (and MTGEnv(obs_mode="entity"))."""
+    spaces: Dict[str, gym.spaces.Space] = {
+        "summary": gym.spaces.Box(low=-1.0, high=1.0, shape=(OBS_SIZE,), dtype=np.float32),
+    }
+    for zone, slots in (("hand", MAX_HAND), ("my_battlefield", MAX_BATTLEFIELD), ("opp_battlefield", MAX_BATTLEFIELD)):
+        spaces[zone] = gym.spaces.Box(low=-np.inf, high=np.inf, shape=(slots, CARD_FEATURES), dtype=np.float32)
+        spaces[f"{zone}_ids"] = gym.spaces.Box(low=0, high=np.iinfo(np.int32).max, shape=(slots,), dtype=np.int32)
+        spaces[f"{zone}_mask"] = gym.spaces.MultiBinary(slots)
+    return gym.spaces.Dict(spaces)
+
+
+class EntityObsEncoder:
+    """
+    Fixed-size padded per-card observation.
+
+    For each of hand, own battlefield and opponent battlefield:
+      <zone>        float32 [slots, CARD_FEATURES]  (P/T, cmc, tapped, sick, land, creature)
+      <zone>_ids    int32   [slots]                 card template id (0 = unknown)
+      <zone>_mask   int8    [slots]                 1 where a card is present
+    plus "summary", the 48-dim vector from _encode_obs, written in place.
+
+    The arrays are allocated once and overwritten on every encode() call;
+    callers that keep observations around must copy them.
+    """
+
+    def __init__(self) -> None:
+        space = entity_observation_space()
+        self.buffers: Dict[str, NDArray[Any]] = {
+            key: np.zeros(sub.shape or (), dtype=sub.dtype) for key, sub in space.spaces.items()
+        }
+
+    def encode(self, game: GameState, pov: Player) -> Dict[str, NDArray[Any]]:
+        opp = game.players[1] if game.players[0] is pov else game.players[0]
+        _encode_obs(game, pov, out=self.buffers["summary"])
+        self._fill("hand", pov.hand)
+        self._fill("my_battlefield", pov.battlefield)
+        self._fill("opp_battlefield", opp.battlefield)
+        return self.buffers
+
+    def _fill(self, zone: str, cards: List[Card]) -> None:
+        feats = self.buffers[zone]
+        ids = self.buffers[f"{zone}_ids"]
+        mask = self.buffers[f"{zone}_mask"]
+        n = min(len(cards), feats.shape[0])
+        for i in range(n):
+            card = cards[i]
+            template_id, cmc = _template_info(card)
+            row = feats[i]
+            row[0] = (card.power or 0) / 10.0
+            row[1] = (card.toughness or 0) / 10.0
+            row[2] = cmc / 10.0
+            row[3] = card.tapped
+            row[4] = card.summoning_sick
+            row[5] = card.is_land()
+            row[6] = card.is_creature()
+            ids[i] = template_id
+        feats[n:] = 0.0
+        ids[n:] = 0
+        mask[:n] = 1
+        mask[n:] = 0
 
 
 # =========================
@@ -252,6 +357,8 @@ def _legal_mask(game: GameState, pov: Player) -> NDArray[np.bool_]:
         if ready:
             mask[A_ATTACK_NONE] = True
             mask[A_ATTACK_ALL] = True
+            plans = choose_attack_plans(game, top_k=NUM_ATTACK_PLANS)
+            mask[A_ATTACK_PLAN_BASE:A_ATTACK_PLAN_BASE + len(plans)] = True
         else:
             mask[A_ATTACK_NONE] = True
 
@@ -259,6 +366,57 @@ def _legal_mask(game: GameState, pov: Player) -> NDArray[np.bool_]:
     return mask
 
 
+# =========================
+# Action decoding
+# =========================
+
+
+def _apply_action_intent(game: GameState, me: Player, proxy: LearnerProxy, action: int) -> None:
+    """
+    Translate a discrete action for seat `me` into the proxy's pending choices
+    (or play the land directly). No-op unless `me` is the active player.
+    """
+    if game.get_active_player() is not me:
+        return
+
+    phase = game.phase
+
+    if action == A_PASS:
+        return
+
+    if phase in ("MAIN1", "MAIN2"):
+        if A_PLAY_BASE <= action < A_CAST_BASE:
+            idx = action - A_PLAY_BASE
+            if 0 <= idx < len(me.hand) and me.hand[idx].is_land() and me.lands_played_this_turn < 1:
+                try:
+                    me.play_land(me.hand[idx])
+                except Exception:
+                    pass
+            return
+        if A_CAST_BASE <= action < A_ATTACK_NONE:
+            idx = action - A_CAST_BASE
+            if 0 <= idx < len(me.hand):
+                card = me.hand[idx]
+                if card.is_creature() and _can_auto_tap_to_pay_without_mutation(me, card):
+                    proxy.pending_cast_card = card
+            return
+
+    if phase == "DECLARE_ATTACKERS":
+        if action == A_ATTACK_NONE:
+            proxy.pending_attackers = []
+        elif action == A_ATTACK_ALL:
+            proxy.pending_attackers = GA.get_attackers(me)
+        elif A_ATTACK_PLAN_BASE <= action < A_ATTACK_PLAN_BASE + NUM_ATTACK_PLANS:
+            # Planner results are memoized on the board's P/T multisets, so
+            # this repeats the search done for the legal mask for free.
+            plans = choose_attack_plans(game, top_k=NUM_ATTACK_PLANS)
+            k = action - A_ATTACK_PLAN_BASE
+            if k < len(plans):
+                proxy.pending_attackers = plans[k]
+        return
+    # DECLARE_BLOCKERS and other phases: ignore (PASS)
+
+
 # =========================
 # Environment
 # =========================
@@ -270,26 +428,56 @@ class MTGEnv(gym.Env):
     Each env.step() advances exactly one phase via game_controller.step_game().
     The learner can meaningfully act during:
       • MAIN1 / MAIN2: play a land; cast one creature
-      • DECLARE_ATTACKERS: attack-none / attack-all
+      • DECLARE_ATTACKERS: attack-none / attack-all / one of the top
+        NUM_ATTACK_PLANS attack_planner subsets
     All other phases: PASS.
     """
     metadata = {"render_modes": []}
 
-    def __init__(self, deck_builder_fn: DeckBuilderFn, max_steps: int = 400):
+    def __init__(
+        self,
+        deck_builder_fn: DeckBuilderFn,
+        max_steps: int = 400,
+        reuse_decks: bool = True,
+        obs_mode: str = "summary",
+        auto_block: bool = False,
+    ):
         """
         deck_builder_fn: () -> Tuple[DeckLike, DeckLike]
             A callable returning two objects with .cards: List[Card]
+        reuse_decks:
+            If True (default), deck_builder_fn is called once and its cards are
+            kept in a DeckPool per seat; each reset only resets their runtime
+            fields. Set to False if deck_builder_fn returns different decks
+            from call to call.
+        obs_mode:
+            "summary" (default) for the 48-dim vector, or "entity" for the
+            padded per-card Dict observation of EntityObsEncoder.
+        auto_block:
+            If True, the learner's blocks are chosen by block_solver instead
+            of never blocking. The opponent baseline is unchanged.
         """
         super().__init__()
         self.deck_builder_fn: DeckBuilderFn = deck_builder_fn
         self.max_steps: int = max_steps
+        self.reuse_decks: bool = reuse_decks
+        self._deck_pools: Optional[Tuple[DeckPool, DeckPool]] = None
         self.step_count: int = 0
 
-        # 48-dim observation (see encoder)
-        self.observation_space = gym.spaces.Box(low=-1.0, high=1.0, shape=(48,), dtype=np.float32)
+        if obs_mode not in ("summary", "entity"):
+            raise ValueError(f"Unknown obs_mode {obs_mode!r}; expected 'summary' or 'entity'.")
+        self.obs_mode: str = obs_mode
+        self._entity_encoder: Optional[EntityObsEncoder] = None
+        self.observation_space: gym.spaces.Space
+        if obs_mode == "entity":
+            self._entity_encoder = EntityObsEncoder()
+            self.observation_space = entity_observation_space()
+        else:
+            # 48-dim observation (see encoder)
+            self.observation_space = gym.spaces.Box(low=-1.0, high=1.0, shape=(OBS_SIZE,), dtype=np.float32)
         self.action_space = gym.spaces.Discrete(ACTION_SIZE)
 
-        self.learner_proxy = LearnerProxy()
+        self.learner_proxy = LearnerProxy(auto_block=auto_block)
         self.opponent = NaiveAgent()
 
         self.game: Optional[GameState] = None
@@ -300,28 +488,31 @@ class MTGEnv(gym.Env):
         self,
         seed: Optional[int] = None,
         options: Optional[Dict[str, Any]] = None
-    ) -> Tuple[NDArray[np.float32], Dict[str, Any]]:
+    ) -> Tuple[Observation, Dict[str, Any]]:
         super().reset(seed=seed)
-        deckA, deckB = self.deck_builder_fn()
-        self.p1 = Player("Learner", deckA.cards)
-        self.p2 = Player("Opponent", deckB.cards)
+        pool_a, pool_b = self._get_deck_pools()
+        self.p1 = Player("Learner", pool_a.fresh())
+        self.p2 = Player("Opponent", pool_b.fresh())
         self.game = GameState(self.p1, self.p2)
+        # Shuffle seeds come from the env RNG so reset(seed=...) is reproducible
+        # while unseeded resets still produce diverse games.
+        seed_a, seed_b = (int(s) for s in self.np_random.integers(0, 2**31 - 1, size=2))
         self.game.start_game(
             opening_hand_size=7,
             skip_first_draw=True,
-            shuffle_active_seed=101,
-            shuffle_opponent_seed=202,
+            shuffle_active_seed=seed_a,
+            shuffle_opponent_seed=seed_b,
         )
         self.step_count = 0
         self.learner_proxy.clear()
 
-        obs = _encode_obs(self.game, self.p1)
+        obs = self._observe()
         info: Dict[str, Any] = {"legal_mask": _legal_mask(self.game, self.p1)}
         return obs, info
 
     def step(
         self, action: int
-    ) -> Tuple[NDArray[np.float32], float, bool, bool, Dict[str, Any]]:
+    ) -> Tuple[Observation, float, bool, bool, Dict[str, Any]]:
         assert self.game is not None and self.p1 is not None and self.p2 is not None
 
         self._apply_action_intent(action)
@@ -345,7 +536,7 @@ class MTGEnv(gym.Env):
         if terminated:
             reward = 1.0 if self.game.winner is self.p1 else -1.0
 
-        obs = _encode_obs(self.game, self.p1)
+        obs = self._observe()
         info: Dict[str, Any] = {"legal_mask": _legal_mask(self.game, self.p1)}
         return obs, reward, terminated, truncated, info
 
@@ -353,44 +544,34 @@ class MTGEnv(gym.Env):
     # Internal helpers
     # -------------------------
 
-    def _apply_action_intent(self, action: int) -> None:
-        g = self.game
-        assert g is not None and self.p1 is not None
-
-        if g.get_active_player() is not self.p1:
-            return
-
-        phase = g.phase
-        me = self.p1
+    def _observe(self) -> Observation:
+        assert self.game is not None and self.p1 is not None
+        if self._entity_encoder is not None:
+            return self._entity_encoder.encode(self.game, self.p1)
+        return _encode_obs(self.game, self.p1)
 
-        if action == A_PASS:
-            return
+    def _get_deck_pools(self) -> Tuple[DeckPool, DeckPool]:
+        if self._deck_pools is None or not self.reuse_decks:
+            deckA, deckB = self.deck_builder_fn()
+            self._deck_pools = (DeckPool(deckA.cards), DeckPool(deckB.cards))
+        return self._deck_pools
 
-        if phase in ("MAIN1", "MAIN2"):
-            if A_PLAY_BASE <= action < A_CAST_BASE:
-                idx = action - A_PLAY_BASE
-                if 0 <= idx < len(me.hand) and me.hand[idx].is_land() and me.lands_played_this_turn < 1:
-                    try:
-                        me.play_land(me.hand[idx])
-                    except Exception:
-                        pass
-                return
-            if A_CAST_BASE <= action < A_ATTACK_NONE:
-                idx = action - A_CAST_BASE
-                if 0 <= idx < len(me.hand):
-                    card = me.hand[idx]
-                    if card.is_creature() and _can_auto_tap_to_pay_without_mutation(me, card):
-                        self.learner_proxy.pending_cast_card = card
-                return
-
-        if phase == "DECLARE_ATTACKERS":
-            if action == A_ATTACK_NONE:
-                self.learner_proxy.pending_attackers = []
-            elif action == A_ATTACK_ALL:
-                self.learner_proxy.pending_attackers = GA.get_attackers(me)
-            return
-        # DECLARE_BLOCKERS and other phases: ignore (PASS)
-
-
-def make_default_env(deck_builder_fn: DeckBuilderFn, max_steps: int = 400) -> MTGEnv:
-    return MTGEnv(deck_builder_fn=deck_builder_fn, max_steps=max_steps)
+    def _apply_action_intent(self, action: int) -> None:
+        assert self.game is not None and self.p1 is not None
+        _apply_action_intent(self.game, self.p1, self.learner_proxy, action)
+
+
+def make_default_env(
+    deck_builder_fn: DeckBuilderFn,
+    max_steps: int = 400,
+    reuse_decks: bool = True,
+    obs_mode: str = "summary",
+    auto_block: bool = False,
+) -> MTGEnv:
+    return MTGEnv(
+        deck_builder_fn=deck_builder_fn,
+        max_steps=max_steps,
+        reuse_decks=reuse_decks,
+        obs_mode=obs_mode,
+        auto_block=auto_block,
+    )
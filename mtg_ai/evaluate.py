@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import math
+import random
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Sequence, Tuple
+
+from .agent import FullAgent
+from .game_state import GameState
+from .rollout import determinize, play_out
+
+
+@dataclass
+class WinEstimate:
+    p: float      # estimated win probability for `seat` (draws count half)
+    low: float    # Wilson score interval
+    high: float
+    wins: int
+    draws: int    # games that hit max_steps without a winner
+    games: int
+
+    @property
+    def width(self) -> float:
+        return self.high - self.low
+
+
+def wilson_interval(score: float, n: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval for a proportion score/n."""
+    if n == 0:
+        return 0.0, 1.0
+    p = score / n
+    denom = 1.0 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def _rollout_batch(
+    game: GameState,
+    agents: Sequence[FullAgent],
+    seeds: Sequence[int],
+    observer: Optional[int],
+    max_steps: int,
+) -> List[Optional[int]]:
+    """
+    Process-pool entry point: one rollout per seed, returns the winning
+    seat of each (None if it hit max_steps).
+
+    Every rollout plays a private copy of `game` whose hidden zones are
+    resampled from its seed: both libraries are shuffled, or, with an
+    observer seat, everything that seat cannot see (see determinize).
+    """
+    results: List[Optional[int]] = []
+    for seed in seeds:
+        rng = random.Random(seed)
+        if observer is None:
+            sim = game.clone()
+            for player in sim.players:
+                rng.shuffle(player.library)
+        else:
+            sim = determinize(game, rng, observer)
+        play_out(sim, agents, max_steps=max_steps)
+        winner = sim.winner
+        results.append(None if winner is None else (0 if winner is sim.players[0] else 1))
+    return results
+
+
+def estimate_win_probability(
+    game: GameState,
+    agents: Sequence[FullAgent],
+    *,
+    seat: Optional[int] = None,
+    max_rollouts: int = 256,
+    min_rollouts: int = 32,
+    batch_size: int = 16,
+    target_width: float = 0.1,
+    z: float = 1.96,
+    workers: int = 1,
+    executor: Optional[Executor] = None,
+    observer: Optional[int] = None,
+    max_steps: int = 2000,
+    seed: Optional[int] = None,
+) -> WinEstimate:
+    """
+    Monte Carlo win probability of `seat` (default: the active player) from
+    `game`, with agents[i] playing seat i. `game` itself is not modified.
+
+    Rollouts run in batches of `batch_size`, in a process pool when
+    workers > 1 (or on a caller-supplied `executor`, so a pool can be
+    reused across positions). After at least `min_rollouts`, sampling stops
+    as soon as the Wilson interval is narrower than `target_width`. Seeds
+    are drawn up front from `seed` and batches are consumed in order, so
+    the result does not depend on the number of workers.
+    """
+    if seat is None:
+        seat = game.active_player_index
+    rng = random.Random(seed)
+    seeds = [rng.getrandbits(32) for _ in range(max_rollouts)]
+    batches = [seeds[i:i + batch_size] for i in range(0, max_rollouts, batch_size)]
+
+    wins = draws = games = 0
+    low, high = 0.0, 1.0
+
+    def done() -> bool:
+        return games >= min_rollouts and high - low < target_width
+
+    def record(winners: List[Optional[int]]) -> None:
+        nonlocal wins, draws, games, low, high
+        for w in winners:
+            games += 1
+            if w is None:
+                draws += 1
+            elif w == seat:
+                wins += 1
+        low, high = wilson_interval(wins + 0.5 * draws, games, z)
+
+    own_pool: Optional[Executor] = None
+    if executor is None and workers > 1:
+        executor = own_pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        if executor is None:
+            for batch in batches:
+                record(_rollout_batch(game, agents, batch, observer, max_steps))
+                if done():
+                    break
+        else:
+            in_flight = max(workers, 2)
+            pending: Deque[Future[List[Optional[int]]]] = deque()
+            todo = iter(batches)
+            for batch in todo:
+                pending.append(executor.submit(_rollout_batch, game, agents, batch, observer, max_steps))
+                if len(pending) >= in_flight:
+                    break
+            while pending:
+                record(pending.popleft().result())
+                if done():
+                    for fut in pending:
+                        fut.cancel()
+                    break
+                nxt = next(todo, None)
+                if nxt is not None:
+                    pending.append(executor.submit(_rollout_batch, game, agents, nxt, observer, max_steps))
+    finally:
+        if own_pool is not None:
+            own_pool.shutdown(cancel_futures=True)
+
+    p = (wins + 0.5 * draws) / games if games else 0.5
+    return WinEstimate(p=p, low=low, high=high, wins=wins, draws=draws, games=games)
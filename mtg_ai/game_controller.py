@@ -1,7 +1,10 @@
 from typing import Callable, Dict
 from .agent import FullAgent
 from .game_state import GameState
+from . import combat as CB
 from . import game_actions as GA
+from . import stack as ST
+from .triggers import PHASE_BEGIN, Event, has_listeners
 
 # Each handler gets (game, active_agent, defending_agent)
 PhaseHandler = Callable[[GameState, FullAgent, FullAgent], None]
@@ -10,21 +13,30 @@ _phase_handlers: Dict[str, PhaseHandler] = {
     "UNTAP": lambda g, a, d: GA.untap_step(g),
     "UPKEEP": lambda g, a, d: GA.upkeep_step(g),
     "DRAW": lambda g, a, d: GA.draw_step(g),
-    "MAIN1": lambda g, a, d: GA.precombat_main_phase(g, a),
+    "MAIN1": lambda g, a, d: ST.main_phase(g, a, d),
     "BEGINNING_OF_COMBAT": lambda g, a, d: GA.beginning_of_combat(g),
-    "DECLARE_ATTACKERS": lambda g, a, d: GA.declare_attackers(g, a.choose_attackers(g)),
-    "DECLARE_BLOCKERS": lambda g, a, d: GA.declare_blockers(g, d.choose_blockers(g)),
-    "COMBAT_DAMAGE": lambda g, a, d: GA.resolve_combat_damage(g),
+    "DECLARE_ATTACKERS": lambda g, a, d: CB.declare_attackers(g, a.choose_attackers(g)),
+    "DECLARE_BLOCKERS": lambda g, a, d: CB.declare_blockers_step(g, a, d),
+    "COMBAT_DAMAGE": lambda g, a, d: CB.resolve_combat_damage(g),
     "END_OF_COMBAT": lambda g, a, d: GA.end_of_combat(g),
-    "MAIN2": lambda g, a, d: GA.postcombat_main_phase(g, a),
+    "MAIN2": lambda g, a, d: ST.main_phase(g, a, d),
     "ENDING": lambda g, a, d: GA.ending_phase(g),
 }
 
 
 def step_game(game: GameState, active_agent: FullAgent, defending_agent: FullAgent) -> None:
     """
-    Advance exactly one phase for the active player using agents.
+    Advance exactly one phase for the active player using agents: the
+    phase's own actions, then a priority round (triggered abilities go on
+    the stack; skipped when nothing can happen), then the cleanup step at
+    the end of the turn.
     """
+    if has_listeners(game, PHASE_BEGIN):
+        game.get_active_player().events.append(Event(PHASE_BEGIN, phase=game.phase))
     handler = _phase_handlers[game.phase]
     handler(game, active_agent, defending_agent)
+    if game.phase in ST.PRIORITY_PHASES and not game.is_game_over():
+        ST.run_priority(game, active_agent, defending_agent)
+    if game.phase == "ENDING":
+        GA.cleanup_step(game)
     game.next_phase()
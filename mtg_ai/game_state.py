@@ -1,5 +1,11 @@
+from dataclasses import dataclass, field, replace
+from functools import partial
 from typing import List, Dict, Optional
 from .card import Card
+from .effects import ContinuousEffects
+from .triggers import DIES, ENTERS_BATTLEFIELD, Event, TriggerIndex, TriggeredAbility
+from .budget import DecisionBudget
+from . import sba
 import random
 
 phases = [
@@ -31,6 +37,20 @@ phase_step_map = {
 }
 
 
+@dataclass
+class StackItem:
+    """
+    A spell on the stack (the card, its controller's seat and its targets),
+    or a triggered ability: then `card` is its source, still wherever it
+    is, and `event` is what triggered it.
+    """
+    card: Card
+    controller: int
+    targets: List[Card] = field(default_factory=list)
+    ability: Optional[TriggeredAbility] = None
+    event: Optional[Event] = None
+
+
 class Player:
     def __init__(self, name: str, deck: List[Card]):
         self.name = name
@@ -49,10 +69,20 @@ class Player:
             "C": 0,  # Colorless
         }
         self.lands_played_this_turn: int = 0
+        # Mulligans taken this game (see mulligan.py)
+        self.mulligans: int = 0
+        # Tried to draw from an empty library (loses at the next state-based action check)
+        self.drew_from_empty: bool = False
+        # Permanents with triggered abilities, by event; events not yet checked for triggers
+        self.triggers = TriggerIndex()
+        self.events: List[Event] = []
+        # The game's continuous effects, shared with the opponent (set by GameState)
+        self.effects: Optional[ContinuousEffects] = None
 
     def draw_card(self, game: "GameState") -> None:
         if not self.library:
-            game.winner = game.get_opponent()
+            self.drew_from_empty = True
+            game.check_winner()
             return
         card = self.library.pop(0)
         card.zone = "hand"
@@ -66,9 +96,17 @@ class Player:
             raise ValueError(f"{self.name} has already played a land this turn.")
 
         self.hand.remove(card)
+        self.enter_battlefield(card)
+        self.lands_played_this_turn += 1
+
+    def enter_battlefield(self, card: Card, *, cast: bool = False) -> None:
+        """Put `card` onto this player's battlefield (already out of its old zone)."""
         card.zone = "battlefield"
         self.battlefield.append(card)
-        self.lands_played_this_turn += 1
+        if self.effects is not None:
+            self.effects.entered(card, self.effects.players.index(self))
+        self.triggers.subscribe(card)
+        self.events.append(Event(ENTERS_BATTLEFIELD, card, cast=cast))
 
     def tap_land_for_mana(self, land: Card) -> bool:
         if land.tapped or not land.is_land():
@@ -91,10 +129,75 @@ class Player:
         land.tapped = True
         return True
 
+    def move_card(self, card: Card, from_zone: str, to_zone: str) -> None:
+        """
+        Move `card` between two of this player's zones. A card leaving the
+        battlefield becomes a new object: untapped, summoning sick and rid
+        of the continuous effects on it.
+        """
+        getattr(self, from_zone).remove(card)
+        self._moved(card, from_zone, to_zone)
+
+    def move_cards(self, cards: List[Card], from_zone: str, to_zone: str) -> None:
+        """
+        move_card for cards that move simultaneously (e.g. creatures dying
+        in the same damage step): the old zone is filtered in one pass
+        instead of a list.remove per card. They arrive in the given order.
+        """
+        if not cards:
+            return
+        moving = set(cards)
+        zone: List[Card] = getattr(self, from_zone)
+        zone[:] = [c for c in zone if c not in moving]
+        for card in cards:
+            self._moved(card, from_zone, to_zone)
+
+    def _moved(self, card: Card, from_zone: str, to_zone: str) -> None:
+        """Bookkeeping of move_card once `card` is out of `from_zone`."""
+        if from_zone == "battlefield":
+            self.triggers.unsubscribe(card)
+            card.damage = 0
+            card.deathtouch_damage = False
+            if card.effects is not None:
+                card.effects.left(card)
+            card.tapped = False
+            card.summoning_sick = True
+            if to_zone == "graveyard" and card.is_creature():
+                self.events.append(Event(DIES, card))
+        if to_zone == "battlefield":
+            self.enter_battlefield(card)
+            return
+        card.zone = to_zone
+        getattr(self, to_zone).append(card)
+
     def reset_mana_pool(self) -> None:
         for color in self.mana_pool:
             self.mana_pool[color] = 0
 
+    def clone(self, card_map: Dict[int, Card]) -> "Player":
+        """
+        Copy with cloned cards. Battlefield and graveyard cards are recorded
+        in `card_map` (id(original) -> clone) so combat, stack and trigger
+        references can be remapped.
+        """
+        new = Player.__new__(Player)
+        new.__dict__.update(self.__dict__)
+        new.library = [c.clone() for c in self.library]
+        new.hand = [c.clone() for c in self.hand]
+        new.battlefield = []
+        for card in self.battlefield:
+            copy = card_map[id(card)] = card.clone()
+            new.battlefield.append(copy)
+        new.graveyard = []
+        for card in self.graveyard:
+            copy = card_map[id(card)] = card.clone()
+            new.graveyard.append(copy)
+        new.exile = [c.clone() for c in self.exile]
+        new.mana_pool = dict(self.mana_pool)
+        new.triggers = self.triggers.clone(card_map)
+        new.events = [replace(e, card=card_map.get(id(e.card), e.card)) for e in self.events]
+        return new
+
     def __repr__(self) -> str:
         return f"<Player {self.name}: {self.life_total} Life>"
 
@@ -105,14 +208,69 @@ class GameState:
         self.active_player_index = 0
         self.turn_number = 1
         self.phase = "UNTAP"
-        self.stack: List = []
+        self.stack: List[StackItem] = []
         self.line_length = line_length
 
         self.skip_first_draw: bool = True
         self.winner: Optional[Player] = None
 
         self.attackers: List[Card] = []
+        # attacker -> its blockers in damage assignment order, and the reverse index
         self.blocking_assignments: Dict[Card, list[Card]] = {}
+        self.blocked_by: Dict[Card, Card] = {}
+
+        # Continuous P/T effects (pumps, anthems, characteristic-defining abilities)
+        self.effects = ContinuousEffects(self.players)
+        for player in self.players:
+            player.effects = self.effects
+
+        # Creatures to look at in the next state-based action check (an
+        # ordered set), or all of them (see sba.py)
+        self.sba_dirty: Dict[Card, None] = {}
+        self.sba_check_all = False
+        self.effects.on_change = partial(sba.mark, self)
+
+        # Per-decision limits for search agents (see budget.py); None = agent defaults
+        self.decision_budget: Optional[DecisionBudget] = None
+
+    def clone(self) -> "GameState":
+        """
+        Independent copy of the whole game for search and rollouts.
+        Cards are cloned (sharing template data) and every zone, combat
+        assignment and the winner are remapped onto the copies.
+        """
+        card_map: Dict[int, Card] = {}
+        new = GameState.__new__(GameState)
+        new.__dict__.update(self.__dict__)
+        new.players = [p.clone(card_map) for p in self.players]
+        # Spells on the stack are in no player zone, so they are cloned here;
+        # ability sources, targets and event cards are remapped
+        new.stack = [
+            StackItem(
+                card_map[id(item.card)] if id(item.card) in card_map else item.card.clone(),
+                item.controller,
+                [card_map.get(id(t), t) for t in item.targets],
+                item.ability,
+                None if item.event is None else replace(item.event, card=card_map.get(id(item.event.card), item.event.card)),
+            )
+            for item in self.stack
+        ]
+        new.effects = self.effects.clone(card_map, new.players)
+        for player in new.players:
+            player.effects = new.effects
+        new.sba_dirty = {card_map.get(id(c), c): None for c in self.sba_dirty}
+        new.effects.on_change = partial(sba.mark, new)
+        new.attackers = [card_map[id(a)] for a in self.attackers]
+        new.blocking_assignments = {
+            card_map[id(a)]: [card_map[id(b)] for b in blockers]
+            for a, blockers in self.blocking_assignments.items()
+        }
+        new.blocked_by = {card_map[id(b)]: card_map[id(a)] for b, a in self.blocked_by.items()}
+        if self.winner is not None:
+            new.winner = new.players[self.players.index(self.winner)]
+        # budgets apply to the real decision, not to agents inside simulations
+        new.decision_budget = None
+        return new
 
     def shuffle_library(self, player: "Player", *, seed: Optional[int] = None) -> None:
         """
@@ -146,6 +304,7 @@ class GameState:
         """
         Prepare game start: shuffle libraries, draw opening hands, and set phase to BEGINNING.
         The active player at turn 1 skips their beginning-phase draw if `skip_first_draw` is True.
+        Both hands are kept; mulligan.london_mulligan(game, agents) lets agents mulligan them.
         """
         # Shuffle each player's library (single-player shuffle, called twice)
         self.shuffle_both_libraries(
@@ -188,10 +347,15 @@ class GameState:
         return self.winner is not None
 
     def check_winner(self) -> None:
-        if self.players[self.active_player_index].life_total <= 0:
-            self.winner = self.players[1 - self.active_player_index]
-        elif self.players[1 - self.active_player_index].life_total <= 0:
-            self.winner = self.players[self.active_player_index]
+        """
+        Players at 0 or less life or who drew from an empty library lose
+        (the active player is checked first).
+        """
+        for seat in (self.active_player_index, 1 - self.active_player_index):
+            player = self.players[seat]
+            if player.life_total <= 0 or player.drew_from_empty:
+                self.winner = self.players[1 - seat]
+                return
 
     def board_state(self) -> str:
 
@@ -0,0 +1,135 @@
+"""
+Vectorized goldfish simulator: turns to kill an opponent who does nothing.
+
+All games of a batch advance together as NumPy arrays. Library orders
+are one (B, deck size) matrix of template indices (mulligan.shuffled_decks);
+hands, lands in play and creature power are (B, ...) arrays updated a
+turn at a time:
+
+  * draw the next card of each library (not on turn 1 on the play);
+  * play a land if the hand has one, preferring a color not yet in play;
+  * cast creatures greedily, most expensive first, while the lands in
+    play pay for their mana value and colored pips (each pip needs a
+    source of that color; sources are not split between spells);
+  * attack with every creature that has been in play since the start
+    of the turn (or has haste): the power goes straight to the face.
+
+Non-creature spells and abilities are not modeled, "*" power counts as
+0, and nothing blocks, so the result is a fast lower bound on the clock
+for screening decks before full-engine simulation (rollout.play_out).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .mulligan import OPENING_HAND, DeckProfile, shuffled_decks, to_counts
+
+STARTING_LIFE = 20
+
+
+@dataclass
+class GoldfishResult:
+    """kill_turn[b]: turn game b dealt lethal damage, 0 if not within max_turns."""
+    kill_turn: NDArray[np.int64]
+    max_turns: int
+
+    @property
+    def killed(self) -> NDArray[np.bool_]:
+        return self.kill_turn > 0
+
+    def summary(self) -> Dict[str, float]:
+        killed = self.kill_turn[self.killed]
+        out = {
+            "games": float(len(self.kill_turn)),
+            "kill_rate": float(self.killed.mean()),
+            "mean_turn": float(killed.mean()) if killed.size else float("nan"),
+            "median_turn": float(np.median(killed)) if killed.size else float("nan"),
+        }
+        for turn in range(1, self.max_turns + 1):
+            out[f"p_by_turn_{turn}"] = float(((self.kill_turn > 0) & (self.kill_turn <= turn)).mean())
+        return out
+
+
+def goldfish(
+    profile: DeckProfile, orders: NDArray[np.int64], *, max_turns: int = 20, on_the_play: bool = True
+) -> GoldfishResult:
+    """Play out one game per row of `orders` (library orders as template indices)."""
+    games, deck_size = orders.shape
+    templates = len(profile.names)
+    rows = np.arange(games)
+
+    hand = to_counts(orders[:, :OPENING_HAND], templates)
+    next_card = OPENING_HAND
+    land = profile.is_land
+    land_ids = np.flatnonzero(land)
+    land_produces = profile.produces[land].astype(np.int64)             # (L, 5)
+    # Creatures in the order they are cast: most expensive first
+    creature_ids = np.flatnonzero((profile.power > 0) & ~land)
+    creature_ids = creature_ids[np.argsort(-profile.mana_value[creature_ids], kind="stable")]
+
+    lands_in_play = np.zeros(games, dtype=np.int64)
+    sources = np.zeros((games, profile.pips.shape[1]), dtype=np.int64)  # lands in play per color
+    ready_power = np.zeros(games, dtype=np.int64)
+    damage = np.zeros(games, dtype=np.int64)
+    kill_turn = np.zeros(games, dtype=np.int64)
+
+    for turn in range(1, max_turns + 1):
+        if (turn > 1 or not on_the_play) and next_card < deck_size:
+            hand[rows, orders[:, next_card]] += 1
+            next_card += 1
+
+        # --- land drop -------------------------------------------------
+        if land_ids.size:
+            lands_in_hand = hand[:, land_ids]                            # (B, L)
+            new_color = (land_produces[None, :, :] * (sources[:, None, :] == 0)).sum(axis=2) > 0
+            priority = (lands_in_hand > 0) * (1 + new_color)
+            has_land = priority.max(axis=1) > 0
+            pick = priority.argmax(axis=1)
+            hand[rows[has_land], land_ids[pick[has_land]]] -= 1
+            lands_in_play += has_land
+            sources += land_produces[pick] * has_land[:, None]
+
+        # --- creatures -------------------------------------------------
+        mana = lands_in_play.copy()
+        new_power = np.zeros(games, dtype=np.int64)
+        for t in creature_ids:
+            cost = profile.mana_value[t]
+            colors_ok = np.all(sources >= profile.pips[t], axis=1)
+            n = np.minimum(hand[:, t], mana // max(cost, 1)) * colors_ok
+            hand[:, t] -= n
+            mana -= n * cost
+            if profile.haste[t]:
+                ready_power += n * profile.power[t]
+            else:
+                new_power += n * profile.power[t]
+
+        # --- attack ----------------------------------------------------
+        alive = kill_turn == 0
+        damage += ready_power * alive
+        kill_turn[alive & (damage >= STARTING_LIFE)] = turn
+        ready_power += new_power
+        if not (kill_turn == 0).any():
+            break
+    return GoldfishResult(kill_turn, max_turns)
+
+
+def simulate(
+    profile: DeckProfile,
+    games: int = 100_000,
+    *,
+    max_turns: int = 20,
+    on_the_play: bool = True,
+    seed: Optional[int] = None,
+    batch: int = 50_000,
+) -> GoldfishResult:
+    """Goldfish `games` random shuffles of `profile`, `batch` games at a time."""
+    rng = np.random.default_rng(seed)
+    kill_turns = []
+    for start in range(0, games, batch):
+        orders = shuffled_decks(profile, min(batch, games - start), rng)
+        kill_turns.append(goldfish(profile, orders, max_turns=max_turns, on_the_play=on_the_play).kill_turn)
+    return GoldfishResult(np.concatenate(kill_turns), max_turns)
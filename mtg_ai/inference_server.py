@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import time
+import zipfile
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Event
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .env import ACTION_SIZE, OBS_SIZE, BatchPolicy
+
+# weights path -> policy; must be picklable (e.g. agents.mlp.MLPPolicy.load)
+PolicyLoader = Callable[[str], BatchPolicy]
+
+# Slot states
+FREE, PENDING, DONE = 0, 1, 2
+
+# Shared counters (int64): batches evaluated, requests served, weight reloads
+STAT_BATCHES, STAT_REQUESTS, STAT_RELOADS = 0, 1, 2
+
+
+# =========================
+# Shared-memory layout
+# =========================
+
+
+def _layout(num_slots: int) -> Dict[str, Tuple[int, Tuple[int, ...], Any]]:
+    """name -> (byte offset, shape, dtype) of each array in the shared block."""
+    fields = [
+        ("obs", (num_slots, OBS_SIZE), np.float32),
+        ("masks", (num_slots, ACTION_SIZE), np.bool_),
+        ("actions", (num_slots,), np.int64),
+        ("greedy", (num_slots,), np.bool_),
+        ("state", (num_slots,), np.int8),
+        ("stats", (3,), np.int64),
+    ]
+    out: Dict[str, Tuple[int, Tuple[int, ...], Any]] = {}
+    offset = 0
+    for name, shape, dtype in fields:
+        offset = (offset + 7) // 8 * 8
+        out[name] = (offset, shape, dtype)
+        offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return out
+
+
+def _nbytes(num_slots: int) -> int:
+    offset, shape, dtype = _layout(num_slots)["stats"]
+    return int(offset + int(np.prod(shape)) * np.dtype(dtype).itemsize)
+
+
+def _views(shm: SharedMemory, num_slots: int) -> Dict[str, NDArray[Any]]:
+    return {
+        name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        for name, (offset, shape, dtype) in _layout(num_slots).items()
+    }
+
+
+@dataclass
+class ClientHandle:
+    """Picklable (at process start) description of one client's slots."""
+    shm_name: str
+    num_slots: int
+    start: int
+    stop: int
+    request: Event
+    ready: List[Event]    # one per slot in [start, stop)
+
+
+# =========================
+# Server
+# =========================
+
+
+def _file_version(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_ino
+
+
+def _serve(
+    shm_name: str,
+    num_slots: int,
+    weights_path: str,
+    loader: PolicyLoader,
+    request: Event,
+    ready: List[Event],
+    stop: Event,
+    max_batch: int,
+    max_latency: float,
+    reload_interval: float,
+    seed: Optional[int],
+) -> None:
+    """Server process loop: gather pending slots, one forward pass, reply."""
+    shm = SharedMemory(name=shm_name)
+    try:
+        arr = _views(shm, num_slots)
+        state, stats = arr["state"], arr["stats"]
+        rng = np.random.default_rng(seed)
+        policy = loader(weights_path)
+        version = _file_version(weights_path)
+        next_check = time.perf_counter() + reload_interval
+
+        while not stop.is_set():
+            if time.perf_counter() >= next_check:
+                next_check = time.perf_counter() + reload_interval
+                try:
+                    new_version = _file_version(weights_path)
+                    if new_version != version:
+                        policy = loader(weights_path)
+                        version = new_version
+                        stats[STAT_RELOADS] += 1
+                except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+                    pass  # file missing, truncated or mid-write: keep serving the old weights
+
+            if not request.wait(timeout=min(0.05, reload_interval)):
+                continue
+            request.clear()
+            # Wait (briefly) for the batch to fill up
+            deadline = time.perf_counter() + max_latency
+            pending = np.flatnonzero(state == PENDING)
+            while len(pending) < max_batch:
+                left = deadline - time.perf_counter()
+                if left <= 0:
+                    break
+                if request.wait(timeout=left):
+                    request.clear()
+                pending = np.flatnonzero(state == PENDING)
+            if len(pending) == 0:
+                continue
+            if len(pending) > max_batch:
+                pending = pending[:max_batch]
+                request.set()  # leftovers go in the next batch
+
+            actions = arr["actions"]
+            greedy = arr["greedy"][pending]
+            for flag in (True, False):
+                rows = pending[greedy == flag]
+                if len(rows):
+                    actions[rows] = policy.act_batch(arr["obs"][rows], arr["masks"][rows], greedy=flag, rng=rng)
+            state[pending] = DONE
+            stats[STAT_BATCHES] += 1
+            stats[STAT_REQUESTS] += len(pending)
+            for slot in pending:
+                ready[slot].set()
+    finally:
+        shm.close()
+
+
+class InferenceServer:
+    """
+    Local CPU policy server. Game worker processes write observations and
+    legal masks into shared-memory request slots; a server process gathers
+    pending slots until `max_batch` are waiting or `max_latency` seconds
+    passed since the first, evaluates them with one act_batch call of the
+    policy `loader(weights_path)` returns (e.g. MLPPolicy.load) and writes
+    the actions back. Weights are reloaded between batches when the
+    file's mtime or inode changes (write a temp file and os.replace it, so
+    the server never sees a partial file). A file that fails to load, e.g.
+    a truncated .npz, is skipped and retried; the old weights stay live.
+
+    Usage: create the server, start() it, hand client_handle(...) objects to
+    worker processes at process creation, and wrap them in PolicyClient
+    there. The synchronization objects in a handle cannot be sent through
+    a Pool's task queue.
+    """
+
+    def __init__(
+        self,
+        weights_path: Union[str, Path],
+        loader: PolicyLoader,
+        num_slots: int = 256,
+        *,
+        max_batch: int = 64,
+        max_latency: float = 0.002,
+        reload_interval: float = 0.1,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.weights_path = str(weights_path)
+        self.loader = loader
+        self.num_slots = num_slots
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.reload_interval = reload_interval
+        self.seed = seed
+        self._shm = SharedMemory(create=True, size=_nbytes(num_slots))
+        self._arrays = _views(self._shm, num_slots)
+        self._arrays["state"][:] = FREE
+        self._arrays["stats"][:] = 0
+        self._request = mp.Event()
+        self._stop = mp.Event()
+        self._ready = [mp.Event() for _ in range(num_slots)]
+        self._next_slot = 0
+        self._process: Optional[mp.process.BaseProcess] = None
+
+    def start(self) -> "InferenceServer":
+        self._process = mp.Process(
+            target=_serve,
+            args=(
+                self._shm.name, self.num_slots, self.weights_path, self.loader, self._request, self._ready,
+                self._stop, self.max_batch, self.max_latency, self.reload_interval, self.seed,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+        return self
+
+    def client_handle(self, slots: int = 1) -> ClientHandle:
+        """Reserve `slots` request slots (the max rows per client call)."""
+        start = self._next_slot
+        if start + slots > self.num_slots:
+            raise ValueError(f"Out of request slots ({self.num_slots} total).")
+        self._next_slot += slots
+        return ClientHandle(
+            self._shm.name, self.num_slots, start, start + slots, self._request, self._ready[start:start + slots]
+        )
+
+    def stats(self) -> Dict[str, int]:
+        s = self._arrays["stats"]
+        return {"batches": int(s[STAT_BATCHES]), "requests": int(s[STAT_REQUESTS]), "reloads": int(s[STAT_RELOADS])}
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._process is not None:
+            self._process.join(timeout=5.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        self._arrays = {}
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "InferenceServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+# =========================
+# Client
+# =========================
+
+
+class PolicyClient:
+    """
+    Worker-side end of a ClientHandle. Implements act_batch like MLPPolicy,
+    so it can back a PolicyAgent directly (rows beyond the client's slot
+    count are sent in chunks). Sampling happens on the server, so `rng`
+    is ignored.
+    """
+
+    def __init__(self, handle: ClientHandle, timeout: float = 10.0) -> None:
+        self.handle = handle
+        self.timeout = timeout
+        self._shm: Optional[SharedMemory] = None
+        self._arrays: Dict[str, NDArray[Any]] = {}
+
+    def _attach(self) -> Dict[str, NDArray[Any]]:
+        if self._shm is None:
+            self._shm = SharedMemory(name=self.handle.shm_name)
+            self._arrays = _views(self._shm, self.handle.num_slots)
+        return self._arrays
+
+    def act_batch(
+        self,
+        obs: NDArray[np.float32],
+        masks: NDArray[np.bool_],
+        *,
+        greedy: bool = True,
+        rng: Optional[np.random.Generator] = None,
+    ) -> NDArray[np.int64]:
+        arr = self._attach()
+        h = self.handle
+        width = h.stop - h.start
+        out: NDArray[np.int64] = np.empty(len(obs), dtype=np.int64)
+        for lo in range(0, len(obs), width):
+            n = min(width, len(obs) - lo)
+            slots = slice(h.start, h.start + n)
+            arr["obs"][slots] = obs[lo:lo + n]
+            arr["masks"][slots] = masks[lo:lo + n]
+            arr["greedy"][slots] = greedy
+            arr["state"][slots] = PENDING
+            h.request.set()
+            for ev in h.ready[:n]:
+                if not ev.wait(self.timeout):
+                    raise TimeoutError("Inference server did not answer in time.")
+                ev.clear()
+            out[lo:lo + n] = arr["actions"][slots]
+            arr["state"][slots] = FREE
+        return out
+
+    def close(self) -> None:
+        if self._shm is not None:
+            self._arrays = {}
+            self._shm.close()
+            self._shm = None
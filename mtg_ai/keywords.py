@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+# Evergreen keyword abilities as bitflags. Card.keywords holds the OR of a
+# card's flags, computed once per template at load; rules code tests bits
+# (`card.keywords & FLYING`) instead of looking at card text.
+FLYING = 1 << 0
+REACH = 1 << 1
+HASTE = 1 << 2
+TRAMPLE = 1 << 3
+VIGILANCE = 1 << 4
+FIRST_STRIKE = 1 << 5
+DEATHTOUCH = 1 << 6
+DEFENDER = 1 << 7
+
+KEYWORDS: Dict[str, int] = {
+    "flying": FLYING,
+    "reach": REACH,
+    "haste": HASTE,
+    "trample": TRAMPLE,
+    "vigilance": VIGILANCE,
+    "first strike": FIRST_STRIKE,
+    "deathtouch": DEATHTOUCH,
+    "defender": DEFENDER,
+}
+
+_REMINDER = re.compile(r"\([^)]*\)")
+
+
+@lru_cache(maxsize=None)
+def parse_keywords(keywords: Tuple[str, ...], text: str) -> int:
+    """
+    Flags from MTGJSON's `keywords` list plus keyword-only lines of the
+    rules text ("Flying", "Vigilance, reach"; reminder text ignored), so
+    hand-written card dicts without `keywords` work too. Other lines are
+    never matched, e.g. "This creature can't block." is not defender.
+    """
+    flags = 0
+    for name in keywords:
+        flags |= KEYWORDS.get(name.lower(), 0)
+    for line in _REMINDER.sub("", text).lower().splitlines():
+        parts = [p.strip() for p in line.replace(";", ",").split(",")]
+        if parts and all(p in KEYWORDS for p in parts):
+            for p in parts:
+                flags |= KEYWORDS[p]
+    return flags
+
+
+def keyword_flags(card_data: Dict[str, Any]) -> int:
+    """Keyword flags of a card template (cached by its keywords and text)."""
+    return parse_keywords(tuple(card_data.get("keywords") or ()), card_data.get("text") or "")
+
+
+def keyword_names(flags: int) -> List[str]:
+    return [name for name, flag in KEYWORDS.items() if flags & flag]
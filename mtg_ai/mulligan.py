@@ -0,0 +1,314 @@
+"""
+London mulligan and a vectorized opening-hand evaluator.
+
+The evaluator works on hands as template-count vectors: a DeckProfile
+turns a deck into per-template arrays (land?, mana value, colored pips,
+mana produced), sample_hands draws many hands at once as an (n, T)
+count matrix, and evaluate_hands scores all of them with array math
+(land count, which spells the lands in hand can cast, on-curve plays).
+The same code backs the default keep/mulligan policy (one hand) and deck
+analysis (analyze_deck, thousands of sampled hands).
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .agent import FullAgent, MulliganAgent
+from .card import Card
+from .card_db import get_card_template_by_name
+from .game_actions import parse_mana_cost
+from .game_state import GameState
+from .keywords import HASTE, keyword_flags
+
+COLORS = "WUBRG"
+_BASIC_LAND_COLOR = {"Plains": "W", "Island": "U", "Swamp": "B", "Mountain": "R", "Forest": "G"}
+
+OPENING_HAND = 7
+# Curve plays are counted on turns 1..CURVE_TURNS
+CURVE_TURNS = 4
+
+
+# =========================
+# Deck profiles
+# =========================
+
+
+@dataclass(frozen=True)
+class DeckProfile:
+    """
+    A deck as per-template arrays (T distinct templates, in `names` order).
+    `pips[t, c]` counts colored symbols of COLORS[c] in the mana cost,
+    `produces[t, c]` whether a land taps for that color.
+    """
+    names: Tuple[str, ...]
+    counts: NDArray[np.int64]       # (T,) copies in the deck
+    is_land: NDArray[np.bool_]      # (T,)
+    mana_value: NDArray[np.int64]   # (T,)
+    pips: NDArray[np.int64]         # (T, 5)
+    produces: NDArray[np.bool_]     # (T, 5)
+    power: NDArray[np.int64]        # (T,) printed power of creatures ("*" and non-creatures: 0)
+    haste: NDArray[np.bool_]        # (T,)
+
+    @property
+    def size(self) -> int:
+        return int(self.counts.sum())
+
+    @staticmethod
+    def from_counts(counts: Dict[str, int]) -> "DeckProfile":
+        return _profile(frozenset(counts.items()))
+
+    @staticmethod
+    def from_cards(cards: Sequence[Card]) -> "DeckProfile":
+        """Profile built from each card's own card_data (no card DB lookup)."""
+        counts: Dict[str, int] = {}
+        templates: Dict[str, Dict[str, Any]] = {}
+        for card in cards:
+            counts[card.name] = counts.get(card.name, 0) + 1
+            templates.setdefault(card.name, card.card_data)
+        return _build_profile(counts, templates)
+
+    def hand_counts(self, cards: Sequence[Card]) -> NDArray[np.int64]:
+        """Count vector (T,) of `cards`, all of which must be in the deck."""
+        index = {name: i for i, name in enumerate(self.names)}
+        out = np.zeros(len(self.names), dtype=np.int64)
+        for card in cards:
+            out[index[card.name]] += 1
+        return out
+
+
+@lru_cache(maxsize=64)
+def _profile(items: FrozenSet[Tuple[str, int]]) -> DeckProfile:
+    counts = dict(items)
+    return _build_profile(counts, {name: get_card_template_by_name(name) for name in counts})
+
+
+def _build_profile(counts: Dict[str, int], by_name: Dict[str, Dict[str, Any]]) -> DeckProfile:
+    names = tuple(sorted(counts))
+    templates = [by_name[name] for name in names]
+    pips = np.zeros((len(names), len(COLORS)), dtype=np.int64)
+    produces = np.zeros((len(names), len(COLORS)), dtype=np.bool_)
+    for t, template in enumerate(templates):
+        cost = parse_mana_cost(template.get("manaCost") or "")
+        for c, color in enumerate(COLORS):
+            pips[t, c] = cost.get(color, 0)
+        for subtype in template.get("subtypes", []):
+            if subtype in _BASIC_LAND_COLOR:
+                produces[t, COLORS.index(_BASIC_LAND_COLOR[subtype])] = True
+    return DeckProfile(
+        names=names,
+        counts=np.array([counts[n] for n in names], dtype=np.int64),
+        is_land=np.array(["Land" in t.get("types", []) for t in templates], dtype=np.bool_),
+        mana_value=np.array([_mana_value(t) for t in templates], dtype=np.int64),
+        pips=pips,
+        produces=produces,
+        power=np.array([_printed_power(t) for t in templates], dtype=np.int64),
+        haste=np.array([bool(keyword_flags(t) & HASTE) for t in templates], dtype=np.bool_),
+    )
+
+
+def _mana_value(template: Dict[str, Any]) -> int:
+    if "manaValue" in template:
+        return int(template["manaValue"])
+    cost = parse_mana_cost(template.get("manaCost") or "")
+    return sum(cost.values())
+
+
+def _printed_power(template: Dict[str, Any]) -> int:
+    if "Creature" not in template.get("types", []):
+        return 0
+    power = str(template.get("power", ""))
+    return int(power) if power.isdigit() else 0
+
+
+# =========================
+# Vectorized evaluation
+# =========================
+
+
+def deck_order(profile: DeckProfile) -> NDArray[np.int64]:
+    """The deck as a flat array of template indices (one entry per card)."""
+    return np.repeat(np.arange(len(profile.names)), profile.counts)
+
+
+def shuffled_decks(profile: DeckProfile, n: int, rng: np.random.Generator) -> NDArray[np.int64]:
+    """(n, deck size) template indices: the library orders of n independent shuffles."""
+    deck = deck_order(profile)
+    return deck[np.argsort(rng.random((n, deck.size)), axis=1)]
+
+
+def sample_hands(
+    profile: DeckProfile, n: int, size: int = OPENING_HAND, rng: Optional[np.random.Generator] = None
+) -> NDArray[np.int64]:
+    """(n, T) template counts of `n` random `size`-card hands."""
+    rng = rng if rng is not None else np.random.default_rng()
+    deck = deck_order(profile)
+    picks = np.argpartition(rng.random((n, deck.size)), size - 1, axis=1)[:, :size]
+    return to_counts(deck[picks], len(profile.names))
+
+
+def to_counts(cards: NDArray[np.int64], templates: int) -> NDArray[np.int64]:
+    """(n, k) template indices -> (n, T) count matrix."""
+    n = cards.shape[0]
+    flat = (cards + templates * np.arange(n)[:, None]).ravel()
+    return np.bincount(flat, minlength=n * templates).reshape(n, templates)
+
+
+@dataclass
+class HandScores:
+    """Per-hand results of evaluate_hands (arrays of shape (n,))."""
+    lands: NDArray[np.int64]
+    spells: NDArray[np.int64]
+    castable: NDArray[np.int64]     # spells castable with the lands in hand
+    curve_plays: NDArray[np.int64]  # turns 1..CURVE_TURNS with an on-curve play from hand
+    keepable: NDArray[np.bool_]
+    score: NDArray[np.float64]
+
+
+def evaluate_hands(
+    profile: DeckProfile, hands: NDArray[np.int64], *, min_lands: int = 2, max_lands: int = 5
+) -> HandScores:
+    """
+    Score (n, T) hands without drawing: lands in hand, spells those lands
+    can pay for (mana value and colors), and on how many of the first
+    CURVE_TURNS turns there is a spell of exactly that mana value to cast.
+    A hand is keepable with min_lands..max_lands lands and at least one
+    castable spell; `score` (0..1) ranks hands for analysis.
+    """
+    hands = np.asarray(hands, dtype=np.int64)
+    land = profile.is_land
+    lands = hands[:, land].sum(axis=1)
+    spells = hands[:, ~land].sum(axis=1)
+    # (n, 5) lands in hand producing each color
+    sources = hands[:, land] @ profile.produces[land].astype(np.int64)
+    # (n, T) template payable: enough lands for its mana value and each color
+    colors_ok = np.all(sources[:, None, :] >= profile.pips[None, :, :], axis=2)
+    payable = colors_ok & (lands[:, None] >= profile.mana_value[None, :]) & ~land[None, :]
+    castable = (hands * payable).sum(axis=1)
+
+    curve_plays = np.zeros(len(hands), dtype=np.int64)
+    for turn in range(1, CURVE_TURNS + 1):
+        on_curve = payable & (profile.mana_value[None, :] == turn)
+        curve_plays += ((hands * on_curve).sum(axis=1) > 0) & (lands >= turn)
+
+    keepable = (lands >= min_lands) & (lands <= max_lands) & (castable > 0)
+    land_fit = 1.0 - np.minimum(np.abs(lands - 3), 3) / 3.0
+    score = 0.5 * land_fit + 0.5 * curve_plays / CURVE_TURNS
+    return HandScores(lands, spells, castable, curve_plays, keepable, score)
+
+
+def analyze_deck(profile: DeckProfile, samples: int = 10_000, seed: Optional[int] = None) -> Dict[str, float]:
+    """Opening-hand statistics of `profile` over `samples` random seven-card hands."""
+    rng = np.random.default_rng(seed)
+    scores = evaluate_hands(profile, sample_hands(profile, samples, rng=rng))
+    out = {
+        "keep_rate": float(scores.keepable.mean()),
+        "mean_lands": float(scores.lands.mean()),
+        "mean_castable": float(scores.castable.mean()),
+        "mean_curve_plays": float(scores.curve_plays.mean()),
+        "mean_score": float(scores.score.mean()),
+    }
+    for lands in range(OPENING_HAND + 1):
+        out[f"p_{lands}_lands"] = float((scores.lands == lands).mean())
+    return out
+
+
+# =========================
+# London mulligan
+# =========================
+
+
+def default_keep(game: GameState, seat: int) -> bool:
+    """
+    Default policy: keep a keepable seven (see evaluate_hands); after one
+    mulligan any hand with 2-5 lands; after two or more, anything.
+    """
+    player = game.players[seat]
+    if player.mulligans >= 2:
+        return True
+    profile = DeckProfile.from_cards(player.library + player.hand)
+    scores = evaluate_hands(profile, profile.hand_counts(player.hand)[None, :])
+    if player.mulligans == 1:
+        return bool(2 <= scores.lands[0] <= 5)
+    return bool(scores.keepable[0])
+
+
+def default_bottom(game: GameState, seat: int, count: int) -> List[Card]:
+    """
+    Put `count` cards on the bottom, aiming for about three lands in seven
+    (never below two): excess lands first, then the most expensive spells.
+    """
+    hand = game.players[seat].hand
+    keep = len(hand) - count
+    target_lands = max(2, round(keep * 3 / 7))
+    lands = [c for c in hand if c.is_land()]
+    spells = sorted((c for c in hand if not c.is_land()), key=lambda c: c.converted_mana_cost, reverse=True)
+    excess_lands = max(0, len(lands) - target_lands)
+    return (lands[:excess_lands] + spells + lands[excess_lands:])[:count]
+
+
+def take_mulligan(game: GameState, seat: int, *, seed: Optional[int] = None) -> None:
+    """Shuffle `seat`'s hand into its library and draw a new seven."""
+    player = game.players[seat]
+    for card in player.hand:
+        card.zone = "library"
+    player.library.extend(player.hand)
+    player.hand.clear()
+    game.shuffle_library(player, seed=seed)
+    for _ in range(OPENING_HAND):
+        player.draw_card(game)
+    player.mulligans += 1
+
+
+def put_on_bottom(game: GameState, seat: int, cards: Sequence[Card]) -> None:
+    player = game.players[seat]
+    if len(set(cards)) != len(cards) or any(c not in player.hand for c in cards):
+        raise ValueError("Cards put on the bottom must be distinct cards from the hand.")
+    for card in cards:
+        player.hand.remove(card)
+        card.zone = "library"
+        player.library.append(card)
+
+
+def london_mulligan(game: GameState, agents: Sequence[FullAgent], *, seed: Optional[int] = None) -> None:
+    """
+    Mulligans after start_game, agents[seat] deciding for each seat. In
+    turn order each player still deciding keeps or mulligans (shuffle the
+    hand away, draw seven); once every player has kept, each puts one card
+    per mulligan on the bottom of their library. Agents implementing
+    MulliganAgent decide themselves, others use default_keep and
+    default_bottom.
+    """
+    rng = random.Random(seed)
+    order = [game.active_player_index, 1 - game.active_player_index]
+    deciding = list(order)
+    while deciding:
+        mulligans = []
+        for seat in deciding:
+            agent = agents[seat]
+            if game.players[seat].mulligans >= OPENING_HAND:
+                continue
+            keep = agent.keep_hand(game, seat) if isinstance(agent, MulliganAgent) else default_keep(game, seat)
+            if not keep:
+                mulligans.append(seat)
+        for seat in mulligans:
+            take_mulligan(game, seat, seed=rng.getrandbits(32) if seed is not None else None)
+        deciding = mulligans
+
+    for seat in order:
+        count = game.players[seat].mulligans
+        if count == 0:
+            continue
+        agent = agents[seat]
+        if isinstance(agent, MulliganAgent):
+            bottom = agent.choose_bottom(game, seat, count)
+        else:
+            bottom = default_bottom(game, seat, count)
+        if len(bottom) != count:
+            raise ValueError(f"Must put exactly {count} card(s) on the bottom.")
+        put_on_bottom(game, seat, bottom)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+import gymnasium as gym
+from numpy.typing import NDArray
+
+Batch = Dict[str, Any]
+ObsArrays = Union[NDArray[Any], Dict[str, NDArray[Any]]]
+
+
+# =========================
+# Sum tree
+# =========================
+
+
+class SumTree:
+    """
+    Binary sum tree over `capacity` non-negative priorities, stored as a flat
+    array (root at index 1, leaves at [size, 2*size)). Batched updates and
+    prefix-sum lookups are vectorized over the batch and cost O(log n) each.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.size = 1
+        while self.size < capacity:
+            self.size *= 2
+        self.tree: NDArray[np.float64] = np.zeros(2 * self.size, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        return float(self.tree[1])
+
+    def update(self, indices: NDArray[np.int64], priorities: NDArray[np.float64]) -> None:
+        nodes = np.asarray(indices, dtype=np.int64) + self.size
+        if not len(nodes):
+            return
+        self.tree[nodes] = priorities
+        nodes = np.unique(nodes // 2)
+        while nodes[0] >= 1:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            if nodes[0] == 1:
+                break
+            nodes = np.unique(nodes // 2)
+
+    def find(self, values: NDArray[np.float64]) -> NDArray[np.int64]:
+        """Leaf index whose prefix-sum interval contains each value."""
+        values = np.array(values, dtype=np.float64, copy=True)
+        nodes: NDArray[Any] = np.ones(len(values), dtype=np.int64)
+        while nodes[0] < self.size:
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = values > left_sum
+            values = np.where(go_right, values - left_sum, values)
+            nodes = np.where(go_right, left + 1, left)
+        leaves: NDArray[np.int64] = np.minimum(nodes - self.size, self.capacity - 1)
+        # (float round-off can land on an empty padding leaf past the end)
+        return leaves
+
+    def get(self, indices: NDArray[np.int64]) -> NDArray[np.float64]:
+        return self.tree[np.asarray(indices, dtype=np.int64) + self.size]
+
+
+# =========================
+# Replay buffer
+# =========================
+
+
+def _alloc(space: gym.spaces.Space, capacity: int) -> ObsArrays:
+    if isinstance(space, gym.spaces.Dict):
+        return {key: np.zeros((capacity, *(sub.shape or ())), dtype=sub.dtype) for key, sub in space.spaces.items()}
+    if space.shape is None or space.dtype is None:
+        raise TypeError(f"Unsupported observation space: {space}")
+    return np.zeros((capacity, *space.shape), dtype=space.dtype)
+
+
+def _write(store: ObsArrays, idx: NDArray[np.int64], values: Any) -> None:
+    if isinstance(store, dict):
+        for key, arr in store.items():
+            arr[idx] = values[key]
+    else:
+        store[idx] = values
+
+
+def _gather(store: ObsArrays, idx: NDArray[np.int64]) -> Any:
+    if isinstance(store, dict):
+        return {key: arr[idx] for key, arr in store.items()}
+    return store[idx]
+
+
+class PrioritizedReplayBuffer:
+    """
+    Fixed-capacity ring buffer of preallocated NumPy arrays with proportional
+    prioritized sampling (Schaul et al., 2016).
+
+    Storage is sized from the env's observation_space (Box or Dict of Boxes)
+    and Discrete action_space; each transition keeps the next state's
+    legal-action mask for masked bootstrapping. Inserts are batched (leading
+    axis = env index), so vector-env outputs can be added directly.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        observation_space: gym.spaces.Space,
+        action_space: gym.spaces.Space,
+        *,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        eps: float = 1e-6,
+        seed: Optional[int] = None,
+    ) -> None:
+        if not isinstance(action_space, gym.spaces.Discrete):
+            raise TypeError(f"Expected a Discrete action space, got {action_space}")
+        self.capacity = capacity
+        self.alpha = alpha
+        self.beta = beta
+        self.eps = eps
+        self.rng = np.random.default_rng(seed)
+
+        self.obs = _alloc(observation_space, capacity)
+        self.next_obs = _alloc(observation_space, capacity)
+        self.actions: NDArray[np.int64] = np.zeros(capacity, dtype=np.int64)
+        self.rewards: NDArray[np.float32] = np.zeros(capacity, dtype=np.float32)
+        self.dones: NDArray[np.bool_] = np.zeros(capacity, dtype=np.bool_)
+        self.next_legal_masks: NDArray[np.bool_] = np.zeros((capacity, int(action_space.n)), dtype=np.bool_)
+
+        self.tree = SumTree(capacity)
+        self.max_priority: float = 1.0
+        self.ptr: int = 0
+        self.size: int = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add_batch(
+        self,
+        obs: Any,
+        actions: NDArray[Any],
+        rewards: NDArray[Any],
+        next_obs: Any,
+        dones: NDArray[Any],
+        next_legal_masks: NDArray[np.bool_],
+    ) -> NDArray[np.int64]:
+        """Insert n transitions at max priority; returns their buffer indices."""
+        n = len(actions)
+        if n > self.capacity:
+            raise ValueError(f"Batch of {n} exceeds buffer capacity {self.capacity}.")
+        idx = (self.ptr + np.arange(n, dtype=np.int64)) % self.capacity
+        _write(self.obs, idx, obs)
+        _write(self.next_obs, idx, next_obs)
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.dones[idx] = dones
+        self.next_legal_masks[idx] = next_legal_masks
+        self.tree.update(idx, np.full(n, self.max_priority ** self.alpha))
+
+        self.ptr = int((self.ptr + n) % self.capacity)
+        self.size = min(self.size + n, self.capacity)
+        return idx
+
+    def add(self, obs: Any, action: int, reward: float, next_obs: Any, done: bool, next_legal_mask: NDArray[np.bool_]) -> int:
+        def one(x: Any) -> Any:
+            if isinstance(x, dict):
+                return {k: np.asarray(v)[None] for k, v in x.items()}
+            return np.asarray(x)[None]
+
+        idx = self.add_batch(
+            one(obs), np.array([action]), np.array([reward]), one(next_obs), np.array([done]), one(next_legal_mask)
+        )
+        return int(idx[0])
+
+    def sample(
+        self, batch_size: int, beta: Optional[float] = None
+    ) -> Tuple[Batch, NDArray[np.int64], NDArray[np.float32]]:
+        """
+        Stratified proportional sample. Returns (batch, indices, importance
+        weights normalized to max 1); pass `indices` to update_priorities().
+        """
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty buffer.")
+        beta = self.beta if beta is None else beta
+        total = self.tree.total
+        bounds = np.linspace(0.0, total, batch_size + 1)
+        values = self.rng.uniform(bounds[:-1], bounds[1:])
+        idx = np.minimum(self.tree.find(values), self.size - 1)
+
+        probs = self.tree.get(idx) / total
+        weights = (self.size * np.maximum(probs, 1e-12)) ** (-beta)
+        weights /= weights.max()
+
+        batch: Batch = {
+            "obs": _gather(self.obs, idx),
+            "actions": self.actions[idx],
+            "rewards": self.rewards[idx],
+            "next_obs": _gather(self.next_obs, idx),
+            "dones": self.dones[idx],
+            "next_legal_masks": self.next_legal_masks[idx],
+        }
+        return batch, idx, weights.astype(np.float32)
+
+    def update_priorities(self, indices: NDArray[np.int64], td_errors: NDArray[Any]) -> None:
+        priorities = np.abs(np.asarray(td_errors, dtype=np.float64)) + self.eps
+        if not len(priorities):
+            return
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
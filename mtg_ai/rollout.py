@@ -0,0 +1,83 @@
+import random
+from typing import List, Optional, Sequence
+
+from .agent import FullAgent
+from .card import Card
+from .game_state import GameState
+from .game_controller import step_game
+
+
+def play_land_if_possible(game: GameState) -> None:
+    """
+    During MAIN1/MAIN2, play the first land in the active player's hand if
+    they have not played a land this turn. FullAgent has no land decision,
+    so game loops without a learner (demos, rollouts) use this default.
+    """
+    if game.phase not in ("MAIN1", "MAIN2"):
+        return
+    player = game.get_active_player()
+    if player.lands_played_this_turn >= 1:
+        return
+    for card in player.hand:
+        if card.is_land():
+            player.play_land(card)
+            return
+
+
+def play_out(
+    game: GameState,
+    agents: Sequence[FullAgent],
+    *,
+    max_steps: Optional[int] = None,
+    max_turn: Optional[int] = None,
+    play_lands: bool = True,
+) -> int:
+    """
+    Fast-forward `game` in place with agents[seat] deciding for each seat.
+    Stops when the game is over, after `max_steps` phases, or once the turn
+    number exceeds `max_turn`. Returns the number of phases stepped.
+    """
+    steps = 0
+    while not game.is_game_over():
+        if max_steps is not None and steps >= max_steps:
+            break
+        if max_turn is not None and game.turn_number > max_turn:
+            break
+        if play_lands:
+            play_land_if_possible(game)
+        active = game.active_player_index
+        step_game(game, agents[active], agents[1 - active])
+        steps += 1
+    return steps
+
+
+def determinize(game: GameState, rng: random.Random, observer: int) -> GameState:
+    """
+    Clone `game` and re-deal everything `observer` cannot see.
+
+    The opponent's hand and library are pooled and dealt back at their
+    current sizes, and the observer's own library is shuffled; everything
+    else (own hand, battlefields, graveyards, zone sizes) is public or known.
+    The hidden zones are filled from the clone's own Card objects, so a
+    determinization builds no new cards beyond the clone itself. The pool is
+    put in a canonical order first, so the sample does not depend on where
+    the hidden cards really are.
+    """
+    sim = game.clone()
+    me = sim.players[observer]
+    opp = sim.players[1 - observer]
+
+    hidden: List[Card] = opp.hand + opp.library
+    hidden.sort(key=lambda c: c.name)
+    rng.shuffle(hidden)
+    n_hand = len(opp.hand)
+    opp.hand = hidden[:n_hand]
+    opp.library = hidden[n_hand:]
+    for card in opp.hand:
+        card.zone = "hand"
+    for card in opp.library:
+        card.zone = "library"
+
+    me.library.sort(key=lambda c: c.name)
+    rng.shuffle(me.library)
+    return sim
@@ -0,0 +1,366 @@
+"""
+Rules-text compiler: MTGJSON `text` -> ability IR.
+
+Each card's text is compiled once per template into CompiledCard (a list
+of Ability records with costs, triggers, targets and effects) and cached
+on disk next to the card DB, keyed by a hash of the text and the
+compiler version. Sentences the compiler does not understand are kept in
+CompiledCard.unsupported and reported, so a card is never mistaken for
+a vanilla creature. Run `python -m mtg_ai.rules_compiler` for a report.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import warnings
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import card_db
+from .keywords import KEYWORDS
+from .triggers import ATTACKS, DEALS_DAMAGE, DIES, ENTERS_BATTLEFIELD, PHASE_BEGIN
+
+# Bump whenever the IR or the patterns change: cached entries are then recompiled
+COMPILER_VERSION = 1
+
+
+# =========================
+# IR
+# =========================
+
+
+@dataclass
+class Effect:
+    """
+    One thing an ability does. `op` is e.g. pump, destroy, add_mana,
+    create_token, set_power (characteristic-defining), cant_block; `subject`
+    says who it applies to: "target", "self", "controller" or a group such
+    as "creatures_you_control". `args` holds op-specific values.
+    """
+    op: str
+    subject: str = "self"
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Ability:
+    """
+    kind: "keyword", "spell" (instant/sorcery text), "activated",
+    "triggered" or "static". `cost` is the mana cost of an activated
+    ability; `trigger` a triggers.py event kind, narrowed by
+    `trigger_filter`, and `condition` an intervening "if" clause.
+    `targets` lists the allowed card types of each target.
+    """
+    kind: str
+    text: str
+    keywords: List[str] = field(default_factory=list)
+    cost: str = ""
+    trigger: str = ""
+    trigger_filter: str = ""
+    condition: str = ""
+    targets: List[List[str]] = field(default_factory=list)
+    effects: List[Effect] = field(default_factory=list)
+
+
+@dataclass
+class CompiledCard:
+    name: str
+    abilities: List[Ability] = field(default_factory=list)
+    unsupported: List[str] = field(default_factory=list)  # sentences not understood
+
+    @property
+    def supported(self) -> bool:
+        return not self.unsupported
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "CompiledCard":
+        abilities = []
+        for a in data["abilities"]:
+            a = dict(a)
+            a["effects"] = [Effect(**e) for e in a["effects"]]
+            abilities.append(Ability(**a))
+        return CompiledCard(data["name"], abilities, list(data["unsupported"]))
+
+
+# =========================
+# Patterns
+# =========================
+
+_REMINDER = re.compile(r"\s*\([^)]*\)")
+_ABILITY_WORD = re.compile(r"^[a-z ]+ — ")
+_ACTIVATED = re.compile(r"^(?P<cost>(?:\{[^}]+\})+): (?P<rest>.+)$")
+_TRIGGERED = re.compile(r"^(?:when|whenever|at) (?P<event>[^,]+), (?P<rest>.+)$")
+_INTERVENING_IF = re.compile(r"^if (?P<cond>[^,]+), (?P<rest>.+)$")
+_SENTENCE_END = re.compile(r"(?<=\.)\s+")
+
+_TARGET_TYPES = r"(?P<what>creature|land|artifact|artifact or land|creature or player)"
+
+# trigger phrase -> (event kind, filter)
+_TRIGGERS: Dict[str, Tuple[str, str]] = {
+    "this creature enters": (ENTERS_BATTLEFIELD, "self"),
+    "a land you control enters": (ENTERS_BATTLEFIELD, "land_you_control"),
+    "a creature you control enters": (ENTERS_BATTLEFIELD, "creature_you_control"),
+    "this creature dies": (DIES, "self"),
+    "this creature attacks": (ATTACKS, "self"),
+    "this creature deals combat damage to a player": (DEALS_DAMAGE, "self_to_player"),
+    "the beginning of your upkeep": (PHASE_BEGIN, "your_upkeep"),
+    "the beginning of your end step": (PHASE_BEGIN, "your_end_step"),
+}
+
+_CONDITIONS = {"you cast it from your hand": "cast_from_hand"}
+
+# Basic land types have an intrinsic mana ability; their printed text is
+# only reminder text
+_BASIC_LAND_MANA = {"Plains": "{W}", "Island": "{U}", "Swamp": "{B}", "Mountain": "{R}", "Forest": "{G}"}
+
+
+def _pt(m: "re.Match[str]") -> Dict[str, Any]:
+    return {"power": int(m["p"]), "toughness": int(m["t"])}
+
+
+def _targets(what: str) -> List[str]:
+    return what.replace(" or ", ",").split(",")
+
+
+# sentence regex -> builder(match) -> (targets, effects)
+_Built = Tuple[List[List[str]], List[Effect]]
+_SENTENCES: List[Tuple["re.Pattern[str]", Callable[["re.Match[str]"], _Built]]] = [
+    (
+        re.compile(rf"^target {_TARGET_TYPES} gets (?P<p>[+-]\d+)/(?P<t>[+-]\d+) until end of turn\.$"),
+        lambda m: ([_targets(m["what"])], [Effect("pump", "target", {**_pt(m), "duration": "end_of_turn"})]),
+    ),
+    (
+        re.compile(r"^this creature gets (?P<p>[+-]\d+)/(?P<t>[+-]\d+) until end of turn\.$"),
+        lambda m: ([], [Effect("pump", "self", {**_pt(m), "duration": "end_of_turn"})]),
+    ),
+    (
+        re.compile(r"^creatures you control get (?P<p>[+-]\d+)/(?P<t>[+-]\d+)\.$"),
+        lambda m: ([], [Effect("pump", "creatures_you_control", _pt(m))]),
+    ),
+    (
+        re.compile(rf"^destroy target {_TARGET_TYPES}\.$"),
+        lambda m: ([_targets(m["what"])], [Effect("destroy", "target")]),
+    ),
+    (
+        re.compile(r"^it can't be regenerated\.$"),
+        lambda m: ([], [Effect("cant_regenerate", "target")]),
+    ),
+    (
+        re.compile(r"^add (?P<mana>(?:\{[wubrgc]\})+)\.$"),
+        lambda m: ([], [Effect("add_mana", "controller", {"mana": m["mana"].upper()})]),
+    ),
+    (
+        re.compile(r"^create an? (?P<p>\d+)/(?P<t>\d+) (?P<colors>(?:white|blue|black|red|green|colorless)(?: and \w+)?) "
+                   r"(?P<subtype>\w+) creature token\.$"),
+        lambda m: ([], [Effect("create_token", "controller", {
+            **_pt(m), "colors": m["colors"].split(" and "), "subtype": m["subtype"].capitalize()
+        })]),
+    ),
+    (
+        re.compile(r"^this creature can't block\.$"),
+        lambda m: ([], [Effect("cant_block")]),
+    ),
+    (
+        re.compile(r"^this creature can't be blocked\.$"),
+        lambda m: ([], [Effect("cant_be_blocked")]),
+    ),
+    (
+        re.compile(r"^this creature can't attack or block alone\.$"),
+        lambda m: ([], [Effect("cant_attack_alone"), Effect("cant_block_alone")]),
+    ),
+    (
+        re.compile(r"^this creature's power is equal to the number of creatures you control\.$"),
+        lambda m: ([], [Effect("set_power", "self", {"count": "creatures_you_control"})]),
+    ),
+]
+
+
+def _compile_sentences(text: str) -> Optional[_Built]:
+    """All sentences of one ability's effect text, or None if any is not understood."""
+    targets: List[List[str]] = []
+    effects: List[Effect] = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        for pattern, build in _SENTENCES:
+            m = pattern.match(sentence)
+            if m:
+                t, e = build(m)
+                targets += t
+                effects += e
+                break
+        else:
+            return None
+    return targets, effects
+
+
+def _compile_line(line: str, is_spell: bool) -> Optional[Ability]:
+    """One line of rules text (already lowercased, reminder text removed)."""
+    parts = [p.strip() for p in line.rstrip(".").split(",")]
+    if all(p in KEYWORDS for p in parts):
+        return Ability("keyword", line, keywords=parts)
+
+    body = _ABILITY_WORD.sub("", line)
+
+    m = _ACTIVATED.match(body)
+    if m:
+        built = _compile_sentences(m["rest"])
+        if built is None:
+            return None
+        return Ability("activated", line, cost=m["cost"].upper(), targets=built[0], effects=built[1])
+
+    m = _TRIGGERED.match(body)
+    if m:
+        trigger = _TRIGGERS.get(m["event"])
+        if trigger is None:
+            return None
+        rest, condition = m["rest"], ""
+        cond = _INTERVENING_IF.match(rest)
+        if cond:
+            condition = _CONDITIONS.get(cond["cond"], "")
+            if not condition:
+                return None
+            rest = cond["rest"]
+        built = _compile_sentences(rest)
+        if built is None:
+            return None
+        return Ability(
+            "triggered", line, trigger=trigger[0], trigger_filter=trigger[1], condition=condition,
+            targets=built[0], effects=built[1],
+        )
+
+    built = _compile_sentences(body)
+    if built is None:
+        return None
+    return Ability("spell" if is_spell else "static", line, targets=built[0], effects=built[1])
+
+
+def compile_card(template: Dict[str, Any]) -> CompiledCard:
+    """Compile one card template's rules text."""
+    name = template["name"]
+    types = template.get("types", [])
+    result = CompiledCard(name)
+    text = _REMINDER.sub("", template.get("text") or "")
+    # Older wording names the card itself; current wording says "this creature"
+    text = text.replace(name, "this creature" if "Creature" in types else "this")
+    is_spell = "Instant" in types or "Sorcery" in types
+    for subtype in template.get("subtypes", []):
+        mana = _BASIC_LAND_MANA.get(subtype)
+        if mana is not None:
+            result.abilities.append(Ability(
+                "activated", f"{{T}}: Add {mana}.", cost="{T}",
+                effects=[Effect("add_mana", "controller", {"mana": mana})],
+            ))
+    for raw in text.splitlines():
+        line = raw.strip().lower()
+        if not line:
+            continue
+        ability = _compile_line(line, is_spell)
+        if ability is None:
+            result.unsupported.append(raw.strip())
+        else:
+            result.abilities.append(ability)
+    return result
+
+
+# =========================
+# On-disk cache
+# =========================
+
+
+def _text_hash(template: Dict[str, Any]) -> str:
+    key = json.dumps([template.get("text") or "", template.get("types", [])])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def cache_path() -> Path:
+    """Next to the card DB: cards/CoreSubset.json -> cards/CoreSubset.abilities.json."""
+    db = card_db.card_db_path()
+    return db.with_name(f"{db.stem}.abilities.json")
+
+
+def compile_pool(templates: Iterable[Dict[str, Any]], path: Optional[Path] = None) -> Dict[str, CompiledCard]:
+    """
+    {name.lower(): CompiledCard} for `templates`. With `path`, entries whose
+    text hash and compiler version match are read from that JSON file
+    instead of compiled, and the file is rewritten (atomically) if
+    anything had to be compiled. The cache is only an optimization: if it
+    can't be written (read-only install), a warning is issued and the
+    compiled result is returned anyway.
+    """
+    cached: Dict[str, Any] = {}
+    if path is not None and path.exists():
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("compiler") == COMPILER_VERSION:
+                cached = data.get("cards", {})
+        except (OSError, ValueError):
+            cached = {}
+
+    out: Dict[str, CompiledCard] = {}
+    entries: Dict[str, Any] = {}
+    dirty = False
+    for template in templates:
+        key = template["name"].lower()
+        digest = _text_hash(template)
+        entry = cached.get(key)
+        if entry is not None and entry.get("hash") == digest:
+            out[key] = CompiledCard.from_dict(entry["ir"])
+        else:
+            out[key] = compile_card(template)
+            entry = {"hash": digest, "ir": out[key].to_dict()}
+            dirty = True
+        entries[key] = entry
+
+    if path is not None and (dirty or set(entries) != set(cached)):
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps({"compiler": COMPILER_VERSION, "cards": entries}, indent=1), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as exc:
+            warnings.warn(f"Could not write ability cache {path}: {exc}", stacklevel=2)
+    return out
+
+
+@lru_cache(maxsize=1)
+def load_abilities() -> Dict[str, CompiledCard]:
+    """
+    Compiled abilities of every card in the card DB (cached on disk and in
+    memory). Warns once if some cards have text the compiler can't handle.
+    """
+    compiled = compile_pool(card_db.build_name_index().values(), cache_path())
+    bad = sorted(c.name for c in compiled.values() if not c.supported)
+    if bad:
+        warnings.warn(f"Rules text not understood for {len(bad)} card(s): {', '.join(bad)}", stacklevel=2)
+    return compiled
+
+
+def get_abilities(name: str) -> CompiledCard:
+    compiled = load_abilities()
+    key = name.lower()
+    if key not in compiled:
+        raise KeyError(f"Card “{name}” not found in DB.")
+    return compiled[key]
+
+
+def unsupported_cards() -> Dict[str, List[str]]:
+    """{card name: sentences not understood} for the card DB."""
+    return {c.name: c.unsupported for c in load_abilities().values() if not c.supported}
+
+
+def main() -> None:
+    compiled = load_abilities()
+    for card in sorted(compiled.values(), key=lambda c: c.name):
+        kinds = ", ".join(a.kind for a in card.abilities) or "vanilla"
+        status = "ok" if card.supported else "UNSUPPORTED: " + " | ".join(card.unsupported)
+        print(f"{card.name:<24} {kinds:<28} {status}")
+    print(f"{sum(c.supported for c in compiled.values())}/{len(compiled)} cards compiled; cache: {cache_path()}")
+
+
+if __name__ == "__main__":
+    main()
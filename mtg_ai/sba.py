@@ -0,0 +1,86 @@
+"""
+State-based actions (rule 704), checked whenever a player would receive
+priority, between combat damage steps and in the cleanup step:
+
+  * a player with 0 or less life, or who drew from an empty library,
+    loses (GameState.check_winner);
+  * a creature with toughness 0 or less is put into its owner's graveyard;
+  * a creature with lethal damage marked on it (or any damage from a
+    deathtouch source) is destroyed.
+
+The creature checks only look at game.sba_dirty: creatures dealt damage
+(deal_damage) and creatures whose P/T may have changed (reported by
+ContinuousEffects.on_change). An effect without a single target, such as
+an anthem, sets game.sba_check_all instead. With nothing dirty a check is
+just the two players' life totals.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional
+
+from .card import Card
+
+if TYPE_CHECKING:
+    from .game_state import GameState
+
+
+def mark(game: "GameState", card: Optional[Card]) -> None:
+    """`card` (None: possibly any creature) needs a look at the next check."""
+    if card is None:
+        game.sba_check_all = True
+    else:
+        game.sba_dirty[card] = None
+
+
+def deal_damage(game: "GameState", card: Card, amount: int, deathtouch: bool = False) -> None:
+    """Mark `amount` damage on creature `card`; it dies at the next check if that's lethal."""
+    if amount <= 0:
+        return
+    card.damage += amount
+    if deathtouch:
+        card.deathtouch_damage = True
+    game.sba_dirty[card] = None
+
+
+def _dies(card: Card) -> bool:
+    toughness = card.toughness
+    if toughness is None or not card.is_creature():
+        return False
+    return toughness <= 0 or card.damage >= toughness or (card.damage > 0 and card.deathtouch_damage)
+
+
+def check_state_based_actions(game: "GameState") -> List[Card]:
+    """
+    Perform state-based actions, repeating while any were performed
+    (a death can shrink another creature). All creatures that die in one
+    pass leave together. Returns the creatures put into graveyards.
+    """
+    died: List[Card] = []
+    while True:
+        game.check_winner()
+        if not (game.sba_dirty or game.sba_check_all):
+            return died
+        if game.sba_check_all:
+            candidates = [c for p in game.players for c in p.battlefield]
+        else:
+            candidates = list(game.sba_dirty)
+        game.sba_dirty.clear()
+        game.sba_check_all = False
+
+        dead = [c for c in candidates if _dies(c)]
+        if not dead:
+            return died
+        for seat, player in enumerate(game.players):
+            mine = [c for c in dead if game.effects.controller(c) == seat]
+            player.move_cards(mine, "battlefield", "graveyard")
+            died.extend(mine)
+        if game.is_game_over():
+            return died
+
+
+def remove_damage(game: "GameState") -> None:
+    """Cleanup step: damage marked on permanents wears off."""
+    for player in game.players:
+        for card in player.battlefield:
+            card.damage = 0
+            card.deathtouch_damage = False
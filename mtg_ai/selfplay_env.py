@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import numpy as np
+import gymnasium as gym
+from typing import Any, Dict, List, Optional, Tuple
+from numpy.typing import NDArray
+
+from .game_state import GameState, Player
+from .game_controller import step_game
+from .deck_builder import DeckPool
+from .env import (
+    ACTION_SIZE,
+    OBS_SIZE,
+    DeckBuilderFn,
+    LearnerProxy,
+    _apply_action_intent,
+    _encode_obs,
+    _legal_mask,
+)
+
+
+class SelfPlayVectorEnv:
+    """
+    N two-seat games where both seats are controlled by the caller.
+
+    Each step() advances every game by one phase, exactly like MTGEnv.step().
+    The seat that decides in a game is its active player (`seat[i]` in the
+    info dict, 0 or 1); observations and legal masks are always encoded from
+    that seat's point of view, so one batched policy forward pass over the
+    (N, OBS_SIZE) observation serves both seats of all N games. The defending seat
+    is passive (no blocks), matching MTGEnv.
+
+    Rewards are from the perspective of the seat that acted: +1 / -1 on the
+    step that ends the game, 0 otherwise. Finished games are reset in place
+    (auto-reset); the terminal observation is reported in info["final_obs"].
+    Output arrays are reused between steps; copy them if you keep them.
+    """
+
+    def __init__(
+        self,
+        deck_builder_fn: DeckBuilderFn,
+        num_envs: int,
+        max_steps: int = 400,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.num_envs = num_envs
+        self.max_steps = max_steps
+        self.single_observation_space = gym.spaces.Box(low=-1.0, high=1.0, shape=(OBS_SIZE,), dtype=np.float32)
+        self.single_action_space = gym.spaces.Discrete(ACTION_SIZE)
+        self.np_random = np.random.default_rng(seed)
+
+        # Each game slot owns its own card instances (a DeckPool per seat).
+        self._pools: List[Tuple[DeckPool, DeckPool]] = []
+        for _ in range(num_envs):
+            deckA, deckB = deck_builder_fn()
+            self._pools.append((DeckPool(deckA.cards), DeckPool(deckB.cards)))
+        self._proxies = [(LearnerProxy(), LearnerProxy()) for _ in range(num_envs)]
+
+        self.games: List[Optional[GameState]] = [None] * num_envs
+        self.step_counts: NDArray[np.int64] = np.zeros(num_envs, dtype=np.int64)
+
+        self._obs: NDArray[np.float32] = np.zeros((num_envs, OBS_SIZE), dtype=np.float32)
+        self._masks: NDArray[np.bool_] = np.zeros((num_envs, ACTION_SIZE), dtype=np.bool_)
+        self._seats: NDArray[np.int64] = np.zeros(num_envs, dtype=np.int64)
+        self._rewards: NDArray[np.float32] = np.zeros(num_envs, dtype=np.float32)
+        self._terminated: NDArray[np.bool_] = np.zeros(num_envs, dtype=np.bool_)
+        self._truncated: NDArray[np.bool_] = np.zeros(num_envs, dtype=np.bool_)
+
+    def reset(
+        self, seed: Optional[int] = None
+    ) -> Tuple[NDArray[np.float32], Dict[str, Any]]:
+        if seed is not None:
+            self.np_random = np.random.default_rng(seed)
+        for i in range(self.num_envs):
+            self._reset_game(i)
+            self._observe(i)
+        return self._obs, self._info()
+
+    def step(
+        self, actions: NDArray[np.integer[Any]]
+    ) -> Tuple[NDArray[np.float32], NDArray[np.float32], NDArray[np.bool_], NDArray[np.bool_], Dict[str, Any]]:
+        final_obs: Dict[int, NDArray[np.float32]] = {}
+        winners = np.full(self.num_envs, -1, dtype=np.int64)
+        for i in range(self.num_envs):
+            game = self.games[i]
+            assert game is not None, "call reset() before step()"
+            seat = game.active_player_index
+            proxies = self._proxies[i]
+            me = game.players[seat]
+
+            _apply_action_intent(game, me, proxies[seat], int(actions[i]))
+            step_game(game, proxies[seat], proxies[1 - seat])
+            proxies[seat].clear()
+            self.step_counts[i] += 1
+
+            terminated = game.is_game_over()
+            truncated = bool(self.step_counts[i] >= self.max_steps)
+            reward = 0.0
+            if terminated:
+                winner = game.players.index(game.winner) if game.winner is not None else -1
+                winners[i] = winner
+                reward = 1.0 if winner == seat else -1.0
+            self._rewards[i] = reward
+            self._terminated[i] = terminated
+            self._truncated[i] = truncated and not terminated
+
+            if terminated or truncated:
+                final_obs[i] = _encode_obs(game, me)
+                self._reset_game(i)
+            self._observe(i)
+
+        info = self._info()
+        info["final_obs"] = final_obs
+        info["winner"] = winners
+        return self._obs, self._rewards, self._terminated, self._truncated, info
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+
+    def _reset_game(self, i: int) -> None:
+        pool_a, pool_b = self._pools[i]
+        p1 = Player("Seat0", pool_a.fresh())
+        p2 = Player("Seat1", pool_b.fresh())
+        game = GameState(p1, p2)
+        seed_a, seed_b = (int(s) for s in self.np_random.integers(0, 2**31 - 1, size=2))
+        game.start_game(
+            opening_hand_size=7,
+            skip_first_draw=True,
+            shuffle_active_seed=seed_a,
+            shuffle_opponent_seed=seed_b,
+        )
+        for proxy in self._proxies[i]:
+            proxy.clear()
+        self.games[i] = game
+        self.step_counts[i] = 0
+
+    def _observe(self, i: int) -> None:
+        game = self.games[i]
+        assert game is not None
+        seat = game.active_player_index
+        me = game.players[seat]
+        self._seats[i] = seat
+        self._obs[i] = _encode_obs(game, me)
+        self._masks[i] = _legal_mask(game, me)
+
+    def _info(self) -> Dict[str, Any]:
+        return {"legal_mask": self._masks, "seat": self._seats}
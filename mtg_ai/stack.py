@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .agent import FullAgent, InstantAgent
+from .card import Card
+from .effects import MODIFY_PT, ContinuousEffect
+from .game_state import GameState, StackItem, phases
+from .game_actions import auto_tap_for_cost, can_afford, cast_creature, pay_mana_cost
+from .sba import check_state_based_actions
+from .triggers import DIES, TRIGGERED_ABILITIES
+
+# Players get priority in every step except untap (and cleanup, handled
+# separately by game_actions.cleanup_step).
+PRIORITY_PHASES = frozenset(p for p in phases if p != "UNTAP")
+
+
+# =========================
+# Spell effects
+# =========================
+
+
+@dataclass(frozen=True)
+class SpellEffect:
+    """
+    Rules text of one instant or sorcery: the permanents it may target
+    (for a caster in `seat`), the target to pick when the caster did not
+    choose one, and what resolving does.
+    """
+    legal_targets: Callable[[GameState, int], List[Card]]
+    default_target: Callable[[GameState, int, List[Card]], Card]
+    resolve: Callable[[GameState, StackItem], None]
+
+
+def _creatures(game: GameState) -> List[Card]:
+    return [c for p in game.players for c in p.battlefield if c.is_creature()]
+
+
+def _lands(game: GameState) -> List[Card]:
+    return [c for p in game.players for c in p.battlefield if c.is_land()]
+
+
+def _controller_seat(game: GameState, card: Card) -> Optional[int]:
+    for seat, player in enumerate(game.players):
+        if card in player.battlefield:
+            return seat
+    return None
+
+
+def pump(game: GameState, card: Card, power: int, toughness: int) -> None:
+    """+power/+toughness until end of turn (ends in game_actions.cleanup_step)."""
+    game.effects.add(
+        ContinuousEffect(MODIFY_PT, target=card, power=power, toughness=toughness, until_end_of_turn=True)
+    )
+
+
+def destroy(game: GameState, card: Card) -> None:
+    seat = _controller_seat(game, card)
+    if seat is not None:
+        game.players[seat].move_card(card, "battlefield", "graveyard")
+
+
+def _best_own_creature(game: GameState, seat: int, legal: List[Card]) -> Card:
+    """Own creature in combat first, then own biggest creature."""
+    own = [c for c in legal if c in game.players[seat].battlefield] or legal
+    in_combat = set(game.attackers)
+    in_combat.update(game.blocked_by)
+    return max(own, key=lambda c: (c in in_combat, c.power or 0))
+
+
+def _best_enemy_land(game: GameState, seat: int, legal: List[Card]) -> Card:
+    """Opponent's untapped land first, then any opponent's land."""
+    enemy = [c for c in legal if c in game.players[1 - seat].battlefield] or legal
+    return min(enemy, key=lambda c: c.tapped)
+
+
+SPELL_EFFECTS: Dict[str, SpellEffect] = {
+    # Target creature gets +3/+3 until end of turn.
+    "Giant Growth": SpellEffect(
+        legal_targets=lambda g, seat: _creatures(g),
+        default_target=_best_own_creature,
+        resolve=lambda g, item: pump(g, item.targets[0], 3, 3),
+    ),
+    # Destroy target artifact or land (no artifacts in the card pool yet).
+    "Pillage": SpellEffect(
+        legal_targets=lambda g, seat: _lands(g),
+        default_target=_best_enemy_land,
+        resolve=lambda g, item: destroy(g, item.targets[0]),
+    ),
+}
+
+
+# =========================
+# Triggered abilities
+# =========================
+
+
+def collect_triggers(game: GameState) -> int:
+    """
+    Match the events queued since the last check against the listeners of
+    both players and put the triggered abilities on the stack in APNAP
+    order: the active player's first, so the non-active player's resolve
+    first. A dying permanent has left the index already, so its own "dies"
+    abilities are found by looking back at the card. Returns how many
+    abilities were put on the stack.
+    """
+    players = game.players
+    if not players[0].events and not players[1].events:
+        return 0
+    triggered: List[List[StackItem]] = [[], []]
+    for event_seat, player in enumerate(players):
+        events, player.events = player.events, []
+        for event in events:
+            for seat, listener_player in enumerate(players):
+                for source in listener_player.triggers.get(event.kind):
+                    for ability in TRIGGERED_ABILITIES[source.name]:
+                        if ability.event == event.kind and ability.condition(source, seat, event, event_seat):
+                            triggered[seat].append(StackItem(source, seat, [], ability, event))
+            if event.kind == DIES and event.card is not None:
+                for ability in TRIGGERED_ABILITIES.get(event.card.name, ()):
+                    if ability.event == DIES and ability.condition(event.card, event_seat, event, event_seat):
+                        triggered[event_seat].append(StackItem(event.card, event_seat, [], ability, event))
+    active = game.active_player_index
+    game.stack.extend(triggered[active])
+    game.stack.extend(triggered[1 - active])
+    return len(triggered[0]) + len(triggered[1])
+
+
+# =========================
+# Casting and resolving
+# =========================
+
+
+def castable_instants(game: GameState, seat: int) -> List[Card]:
+    """Instants `seat` could cast right now: known effect, affordable, with a legal target."""
+    player = game.players[seat]
+    out = []
+    for card in player.hand:
+        if not card.is_instant():
+            continue
+        effect = SPELL_EFFECTS.get(card.name)
+        if effect is None or not can_afford(player, card.mana_cost or ""):
+            continue
+        if effect.legal_targets(game, seat):
+            out.append(card)
+    return out
+
+
+def cast_spell(game: GameState, seat: int, card: Card, targets: List[Card]) -> bool:
+    """
+    Pay for `card` (tapping lands as needed) and put it on the stack with
+    `targets`. False, with nothing changed, if the card is not in hand,
+    has no known effect, targets are illegal or the cost can't be paid.
+    """
+    player = game.players[seat]
+    effect = SPELL_EFFECTS.get(card.name)
+    if card not in player.hand or effect is None:
+        return False
+    legal = effect.legal_targets(game, seat)
+    if not targets or any(t not in legal for t in targets):
+        return False
+    if card.mana_cost:
+        if not can_afford(player, card.mana_cost):
+            return False
+        auto_tap_for_cost(player, card.mana_cost)
+        pay_mana_cost(player, card.mana_cost)
+    player.hand.remove(card)
+    card.zone = "stack"
+    game.stack.append(StackItem(card, seat, list(targets)))
+    return True
+
+
+def resolve_top(game: GameState) -> None:
+    """
+    Resolve the top of the stack. A spell whose targets have all left the
+    battlefield does nothing; either way the card then goes to its
+    controller's graveyard. A triggered ability leaves its source alone.
+    """
+    item = game.stack.pop()
+    if item.ability is not None:
+        item.ability.resolve(game, item)
+        check_state_based_actions(game)
+        return
+    item.targets = [t for t in item.targets if _controller_seat(game, t) is not None]
+    if item.targets:
+        SPELL_EFFECTS[item.card.name].resolve(game, item)
+    item.card.zone = "graveyard"
+    game.players[item.controller].graveyard.append(item.card)
+    check_state_based_actions(game)
+
+
+# =========================
+# Priority
+# =========================
+
+
+def _choose_instant(agent: FullAgent, game: GameState, seat: int) -> Optional[Tuple[Card, List[Card]]]:
+    if not isinstance(agent, InstantAgent) or not castable_instants(game, seat):
+        return None
+    return agent.choose_instant(game, seat)
+
+
+def _can_respond(game: GameState) -> bool:
+    return bool(castable_instants(game, 0) or castable_instants(game, 1))
+
+
+def run_priority(game: GameState, active_agent: FullAgent, defending_agent: FullAgent) -> None:
+    """
+    Priority round for the current step: starting with the active player,
+    players may cast instants (the caster keeps priority); when both pass
+    in succession the top of the stack resolves and the active player gets
+    priority again, and with an empty stack the step ends.
+
+    State-based actions are checked first, then pending triggered
+    abilities go on the stack (collect_triggers); both again after each
+    resolution (resolve_top checks state-based actions).
+
+    Fast path: with an empty stack and no castable instant in either hand,
+    nothing can happen, so the round is skipped without asking any agent.
+    The same check ends the round after each resolution.
+    """
+    check_state_based_actions(game)
+    collect_triggers(game)
+    if not game.stack and not _can_respond(game):
+        return
+    agents = [active_agent, defending_agent]
+    if game.active_player_index == 1:
+        agents.reverse()
+    seat = game.active_player_index
+    passes = 0
+    while not game.is_game_over():
+        choice = _choose_instant(agents[seat], game, seat)
+        if choice is not None and cast_spell(game, seat, *choice):
+            passes = 0
+            continue
+        passes += 1
+        if passes < 2:
+            seat = 1 - seat
+            continue
+        if not game.stack:
+            return
+        resolve_top(game)
+        collect_triggers(game)
+        if not game.stack and not _can_respond(game):
+            return
+        seat = game.active_player_index
+        passes = 0
+
+
+def main_phase(game: GameState, active_agent: FullAgent, defending_agent: FullAgent) -> None:
+    """
+    Main-phase casting: creatures enter the battlefield directly (they are
+    not put on the stack), while sorceries and instants go on the stack
+    with their default target and resolve through a priority round, so
+    the opponent may respond.
+    """
+    seat = game.active_player_index
+    player = game.players[seat]
+    for card in active_agent.choose_casts(game):
+        if card not in player.hand:
+            continue
+        if card.is_creature():
+            if card.mana_cost and auto_tap_for_cost(player, card.mana_cost) and cast_creature(player, card):
+                run_priority(game, active_agent, defending_agent)  # its enter-the-battlefield triggers
+            continue
+        effect = SPELL_EFFECTS.get(card.name)
+        if effect is None:
+            continue
+        legal = effect.legal_targets(game, seat)
+        if legal and cast_spell(game, seat, card, [effect.default_target(game, seat, legal)]):
+            run_priority(game, active_agent, defending_agent)
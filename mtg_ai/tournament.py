@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .agent import DamageOrderAgent, FullAgent, InstantAgent, MulliganAgent
+from .budget import BudgetUsage, DecisionBudget
+from .card import Card
+from .game_state import GameState, Player
+from .env import DeckBuilderFn
+from .mulligan import default_bottom, default_keep, london_mulligan
+from .rollout import play_out
+
+
+class _Metered(FullAgent):
+    """
+    Times every decision of `agent` into `usage` (plus MCTS-style
+    last_iterations). Optional decisions (instants, damage assignment
+    order, mulligans) are forwarded only if `agent` makes them.
+    """
+
+    def __init__(self, agent: FullAgent, usage: BudgetUsage) -> None:
+        self.agent = agent
+        self.usage = usage
+
+    def _timed(self, game: GameState, fn: Callable[..., Any], *args: Any) -> Any:
+        start = time.perf_counter()
+        result = fn(game, *args)
+        nodes = getattr(self.agent, "last_iterations", None)
+        self.usage.record(time.perf_counter() - start, nodes, game.decision_budget)
+        return result
+
+    def choose_casts(self, game: GameState) -> List[Card]:
+        return list(self._timed(game, self.agent.choose_casts))
+
+    def choose_attackers(self, game: GameState) -> List[Card]:
+        return list(self._timed(game, self.agent.choose_attackers))
+
+    def choose_blockers(self, game: GameState) -> Dict[Card, List[Card]]:
+        return dict(self._timed(game, self.agent.choose_blockers))
+
+    def choose_instant(self, game: GameState, seat: int) -> Optional[Tuple[Card, List[Card]]]:
+        if not isinstance(self.agent, InstantAgent):
+            return None
+        choice: Optional[Tuple[Card, List[Card]]] = self._timed(game, self.agent.choose_instant, seat)
+        return choice
+
+    def order_blockers(self, game: GameState, attacker: Card, blockers: List[Card]) -> List[Card]:
+        if isinstance(self.agent, DamageOrderAgent):
+            return list(self._timed(game, self.agent.order_blockers, attacker, blockers))
+        return blockers
+
+    def keep_hand(self, game: GameState, seat: int) -> bool:
+        if isinstance(self.agent, MulliganAgent):
+            return self.agent.keep_hand(game, seat)
+        return default_keep(game, seat)
+
+    def choose_bottom(self, game: GameState, seat: int, count: int) -> List[Card]:
+        if isinstance(self.agent, MulliganAgent):
+            return self.agent.choose_bottom(game, seat, count)
+        return default_bottom(game, seat, count)
+
+
+@dataclass
+class MatchResult:
+    names: List[str]
+    wins: List[int] = field(default_factory=lambda: [0, 0])
+    draws: int = 0
+    games: int = 0
+    usage: List[BudgetUsage] = field(default_factory=lambda: [BudgetUsage(), BudgetUsage()])
+
+    def report(self) -> str:
+        lines = [f"{self.games} games: {self.names[0]} {self.wins[0]} - {self.wins[1]} {self.names[1]}"
+                 f" ({self.draws} unfinished)"]
+        for name, usage in zip(self.names, self.usage):
+            u = usage.as_dict()
+            lines.append(
+                f"  {name}: {u['decisions']} decisions, mean {u['mean_ms']:.1f} ms, "
+                f"max {u['max_ms']:.1f} ms, {u['nodes']} nodes, {u['overruns']} overruns"
+            )
+        return "\n".join(lines)
+
+
+def play_match(
+    agents: Sequence[FullAgent],
+    deck_builder_fn: DeckBuilderFn,
+    *,
+    games: int = 10,
+    budget: Optional[DecisionBudget] = None,
+    names: Optional[Sequence[str]] = None,
+    max_steps: int = 2000,
+    seed: Optional[int] = None,
+) -> MatchResult:
+    """
+    Play `games` games between agents[0] and agents[1] at a fixed
+    per-decision budget (set as game.decision_budget), alternating who
+    starts. Opening hands go through the London mulligan (agents without
+    their own keep_hand use the default policy). Every decision is timed,
+    so the result reports each agent's actual time and node usage against
+    the budget.
+    """
+    rng = random.Random(seed)
+    result = MatchResult(names=list(names or [type(a).__name__ for a in agents]))
+    metered = [_Metered(agent, usage) for agent, usage in zip(agents, result.usage)]
+
+    for g in range(games):
+        deck_a, deck_b = deck_builder_fn()
+        first = g % 2  # index into `agents` of the starting player
+        p1, p2 = Player("P1", deck_a.cards), Player("P2", deck_b.cards)
+        game = GameState(p1, p2)
+        game.start_game(shuffle_active_seed=rng.getrandbits(32), shuffle_opponent_seed=rng.getrandbits(32))
+        seats = [metered[first], metered[1 - first]]
+        london_mulligan(game, seats, seed=rng.getrandbits(32))
+        game.decision_budget = budget
+
+        play_out(game, seats, max_steps=max_steps)
+        result.games += 1
+        if game.winner is None:
+            result.draws += 1
+        else:
+            seat = 0 if game.winner is game.players[0] else 1
+            result.wins[first if seat == 0 else 1 - first] += 1
+    return result
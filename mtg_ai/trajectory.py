@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import gymnasium as gym
+from numpy.typing import NDArray
+
+# --------------------------------------------------------------
+# On-disk layout (one directory per dataset):
+#
+#   manifest.json
+#   shard_00000/obs.npy, action.npy, reward.npy, done.npy, truncated.npy,
+#               legal_mask.npy
+#   shard_00001/...
+#
+# Every column is a plain .npy file, preallocated for a full shard and
+# written through a memory map. Dict observations get one column per key
+# ("obs.hand", "obs.hand_mask", ...). The manifest records how many rows of
+# each shard are valid; it is rewritten whenever a shard is rotated and on
+# close, so a crashed writer loses at most the current shard. On close the
+# last shard's files are cut down to the rows actually written.
+#
+# `done` marks the last transition of an episode, however it ended;
+# `truncated` marks the ones cut off by a step limit rather than a game
+# result, so terminated = done & ~truncated. Datasets written before the
+# truncated column existed simply lack it.
+# --------------------------------------------------------------
+
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+
+ColumnSpec = Tuple[Tuple[int, ...], np.dtype]
+
+
+def _obs_columns(space: gym.spaces.Space) -> Dict[str, ColumnSpec]:
+    if isinstance(space, gym.spaces.Dict):
+        cols: Dict[str, ColumnSpec] = {}
+        for key, sub in space.spaces.items():
+            cols[f"obs.{key}"] = (tuple(sub.shape or ()), np.dtype(sub.dtype))
+        return cols
+    if space.shape is None or space.dtype is None:
+        raise TypeError(f"Unsupported observation space: {space}")
+    return {"obs": (tuple(space.shape), np.dtype(space.dtype))}
+
+
+def _column_specs(observation_space: gym.spaces.Space, action_size: int) -> Dict[str, ColumnSpec]:
+    cols = _obs_columns(observation_space)
+    cols["action"] = ((), np.dtype(np.int64))
+    cols["reward"] = ((), np.dtype(np.float32))
+    cols["done"] = ((), np.dtype(np.bool_))
+    cols["truncated"] = ((), np.dtype(np.bool_))
+    cols["legal_mask"] = ((action_size,), np.dtype(np.bool_))
+    return cols
+
+
+def _split_obs(obs: Any) -> Dict[str, Any]:
+    if isinstance(obs, dict):
+        return {f"obs.{k}": v for k, v in obs.items()}
+    return {"obs": obs}
+
+
+def _truncate_npy(path: Path, rows: int) -> None:
+    """Shrink a .npy file in place to its first `rows` rows."""
+    with open(path, "r+b") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        data_start = f.tell()
+        prefix = np.lib.format.MAGIC_LEN + (2 if version == (1, 0) else 4)
+        header = repr({
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": fortran_order,
+            "shape": (rows, *shape[1:]),
+        })
+        # A shorter shape never needs a longer header: pad to the old length so the data stays put
+        f.seek(prefix)
+        f.write(header.ljust(data_start - prefix - 1).encode("latin1") + b"\n")
+        f.truncate(data_start + rows * int(np.prod(shape[1:], dtype=np.int64)) * dtype.itemsize)
+
+
+class TrajectoryWriter:
+    """
+    Streams transitions into memory-mapped, columnar .npy shards.
+
+    A transition is (obs, action, reward, done, legal_mask, truncated),
+    where obs and legal_mask are the ones the action was chosen from and
+    `done` ends the episode for any reason (see the layout notes above). A
+    new shard is started once the current one reaches `max_shard_bytes`.
+    Writing after close() raises ValueError.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        observation_space: gym.spaces.Space,
+        action_size: int,
+        *,
+        max_shard_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        if (self.root / MANIFEST).exists():
+            raise FileExistsError(f"{self.root} already contains a dataset.")
+
+        self.columns = _column_specs(observation_space, action_size)
+        row_bytes = sum(int(np.prod(shape, dtype=np.int64)) * dtype.itemsize for shape, dtype in self.columns.values())
+        self.rows_per_shard: int = max(1, max_shard_bytes // row_bytes)
+
+        self._shards: List[Dict[str, Any]] = []
+        self._arrays: Dict[str, np.memmap] = {}
+        self._row: int = 0
+        self._closed = False
+
+    # -------------------------
+    # Writing
+    # -------------------------
+
+    def add(
+        self,
+        obs: Any,
+        action: int,
+        reward: float,
+        done: bool,
+        legal_mask: NDArray[np.bool_],
+        truncated: bool = False,
+    ) -> None:
+        self._check_open()
+        if not self._arrays or self._row >= self.rows_per_shard:
+            self._open_shard()
+        row = self._row
+        for name, value in _split_obs(obs).items():
+            self._arrays[name][row] = value
+        self._arrays["action"][row] = action
+        self._arrays["reward"][row] = reward
+        self._arrays["done"][row] = done
+        self._arrays["truncated"][row] = truncated
+        self._arrays["legal_mask"][row] = legal_mask
+        self._row += 1
+
+    def add_batch(
+        self,
+        obs: Any,
+        actions: NDArray[Any],
+        rewards: NDArray[Any],
+        dones: NDArray[Any],
+        legal_masks: NDArray[np.bool_],
+        truncated: Optional[NDArray[Any]] = None,
+    ) -> None:
+        """Write a batch (leading axis = env index), e.g. straight from a vector env."""
+        self._check_open()
+        values = _split_obs(obs)
+        values.update(action=actions, reward=rewards, done=dones, legal_mask=legal_masks)
+        values["truncated"] = np.zeros(len(actions), dtype=np.bool_) if truncated is None else truncated
+        n = len(actions)
+        start = 0
+        while start < n:
+            if not self._arrays or self._row >= self.rows_per_shard:
+                self._open_shard()
+            take = min(n - start, self.rows_per_shard - self._row)
+            for name, value in values.items():
+                self._arrays[name][self._row:self._row + take] = value[start:start + take]
+            self._row += take
+            start += take
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._finish_shard()
+        self._closed = True
+
+    def __enter__(self) -> "TrajectoryWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValueError(f"TrajectoryWriter for {self.root} is closed.")
+
+    def _open_shard(self) -> None:
+        self._finish_shard()
+        shard_dir = f"shard_{len(self._shards):05d}"
+        (self.root / shard_dir).mkdir()
+        self._arrays = {
+            name: np.lib.format.open_memmap(
+                self.root / shard_dir / f"{name}.npy",
+                mode="w+",
+                dtype=dtype,
+                shape=(self.rows_per_shard, *shape),
+            )
+            for name, (shape, dtype) in self.columns.items()
+        }
+        self._shards.append({"dir": shard_dir, "rows": 0})
+        self._row = 0
+
+    def _finish_shard(self) -> None:
+        if self._arrays:
+            names = list(self._arrays)
+            for name in names:
+                self._arrays[name].flush()
+            self._shards[-1]["rows"] = self._row
+            self._arrays = {}  # drops the memory maps before the files shrink
+            if self._row < self.rows_per_shard:
+                shard_dir = self.root / self._shards[-1]["dir"]
+                for name in names:
+                    _truncate_npy(shard_dir / f"{name}.npy", self._row)
+        self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "columns": {name: {"shape": list(shape), "dtype": dtype.str} for name, (shape, dtype) in self.columns.items()},
+            "shards": self._shards,
+            "total_rows": sum(s["rows"] for s in self._shards),
+        }
+        tmp = self.root / (MANIFEST + ".tmp")
+        tmp.write_text(json.dumps(manifest, indent=2))
+        tmp.replace(self.root / MANIFEST)
+
+
+class TrajectoryReader:
+    """
+    Read-only view of a dataset written by TrajectoryWriter.
+
+    Minibatches are slices of the memory-mapped shards, so no transition is
+    copied into RAM until the caller touches it. Batches never straddle a
+    shard boundary, which keeps every batch a zero-copy view.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        manifest = json.loads((self.root / MANIFEST).read_text())
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported dataset version {manifest.get('version')!r}.")
+        self.columns: List[str] = list(manifest["columns"])
+        self.shards: List[Dict[str, NDArray[Any]]] = []
+        for shard in manifest["shards"]:
+            rows = int(shard["rows"])
+            if rows == 0:
+                continue
+            self.shards.append({
+                name: np.load(self.root / shard["dir"] / f"{name}.npy", mmap_mode="r")[:rows]
+                for name in self.columns
+            })
+
+    def __len__(self) -> int:
+        return sum(len(s["action"]) for s in self.shards)
+
+    def iter_minibatches(
+        self,
+        batch_size: int,
+        *,
+        shuffle: bool = False,
+        rng: Optional[np.random.Generator] = None,
+        drop_last: bool = False,
+    ) -> Iterator[Dict[str, NDArray[Any]]]:
+        """
+        Yield {column: array} minibatches of up to `batch_size` rows.
+        With shuffle=True the order of the (contiguous) batches is randomized,
+        not the rows inside them, so batches stay zero-copy.
+        """
+        blocks: List[Tuple[int, int, int]] = []
+        for i, shard in enumerate(self.shards):
+            n = len(shard["action"])
+            for start in range(0, n, batch_size):
+                stop = min(start + batch_size, n)
+                if drop_last and stop - start < batch_size:
+                    continue
+                blocks.append((i, start, stop))
+        if shuffle:
+            order = (rng or np.random.default_rng()).permutation(len(blocks))
+            blocks = [blocks[j] for j in order]
+        for i, start, stop in blocks:
+            shard = self.shards[i]
+            yield {name: shard[name][start:stop] for name in self.columns}
+
+
+def _snapshot(obs: Any) -> Any:
+    # Entity observations reuse their buffers step to step, so keep a copy.
+    if isinstance(obs, dict):
+        return {k: np.array(v, copy=True) for k, v in obs.items()}
+    return np.array(obs, copy=True)
+
+
+class RecordingWrapper(gym.Wrapper):
+    """
+    Records every MTGEnv transition into a TrajectoryWriter.
+    Expects the wrapped env to report `legal_mask` in its info dict.
+    """
+
+    def __init__(self, env: gym.Env, writer: TrajectoryWriter) -> None:
+        super().__init__(env)
+        self.writer = writer
+        self._last_obs: Any = None
+        self._last_mask: Optional[NDArray[np.bool_]] = None
+
+    def reset(self, **kwargs: Any) -> Tuple[Any, Dict[str, Any]]:
+        obs, info = self.env.reset(**kwargs)
+        self._last_obs, self._last_mask = _snapshot(obs), info["legal_mask"]
+        return obs, info
+
+    def step(self, action: Any) -> Tuple[Any, Any, bool, bool, Dict[str, Any]]:
+        assert self._last_mask is not None, "call reset() before step()"
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        self.writer.add(
+            self._last_obs, int(action), float(reward), bool(terminated or truncated), self._last_mask, bool(truncated)
+        )
+        self._last_obs, self._last_mask = _snapshot(obs), info["legal_mask"]
+        return obs, reward, terminated, truncated, info
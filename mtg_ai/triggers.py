@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from .effects import MODIFY_PT, ContinuousEffect
+
+if TYPE_CHECKING:
+    from .card import Card
+    from .game_state import GameState, StackItem
+
+# Event types
+PHASE_BEGIN = "phase_begin"
+ENTERS_BATTLEFIELD = "enters_battlefield"
+DIES = "dies"
+ATTACKS = "attacks"
+DEALS_DAMAGE = "deals_damage"
+
+EVENTS = (PHASE_BEGIN, ENTERS_BATTLEFIELD, DIES, ATTACKS, DEALS_DAMAGE)
+
+
+def has_listeners(game: "GameState", kind: str) -> bool:
+    """Whether any permanent listens for `kind` events (if not, don't record them)."""
+    return any(kind in p.triggers.listeners for p in game.players)
+
+
+@dataclass
+class Event:
+    """
+    Something that happened, queued on the player it happened to (the
+    permanent's controller, or the active player for PHASE_BEGIN) until
+    triggers are collected at the next priority round.
+    """
+    kind: str
+    card: Optional["Card"] = None
+    phase: str = ""
+    amount: int = 0
+    cast: bool = False  # ENTERS_BATTLEFIELD: the permanent was cast from hand
+
+
+@dataclass(frozen=True)
+class TriggeredAbility:
+    """
+    "When/whenever <event>, <effect>" on a permanent. `condition(source,
+    seat, event, event_seat)` filters the events of kind `event` (seat is
+    the source's controller, event_seat the player the event happened to);
+    `resolve(game, item)` runs when the ability resolves from the stack.
+    """
+    event: str
+    condition: Callable[["Card", int, Event, int], bool]
+    resolve: Callable[[Any, Any], None]
+
+
+def _landfall(source: "Card", seat: int, event: Event, event_seat: int) -> bool:
+    return event_seat == seat and event.card is not None and event.card.is_land()
+
+
+def _cast_self(source: "Card", seat: int, event: Event, event_seat: int) -> bool:
+    return event.card is source and event.cast
+
+
+def _add_mana(game: "GameState", item: "StackItem", color: str, amount: int) -> None:
+    game.players[item.controller].mana_pool[color] += amount
+
+
+def _pump_source(game: "GameState", item: "StackItem", power: int, toughness: int) -> None:
+    """+power/+toughness until end of turn, if the source is still on the battlefield."""
+    if any(item.card in player.battlefield for player in game.players):
+        game.effects.add(ContinuousEffect(
+            MODIFY_PT, target=item.card, power=power, toughness=toughness, until_end_of_turn=True
+        ))
+
+
+# card name -> its triggered abilities
+TRIGGERED_ABILITIES: Dict[str, Tuple[TriggeredAbility, ...]] = {
+    # Landfall — Whenever a land you control enters, this creature gets +2/+2 until end of turn.
+    "Territorial Baloth": (
+        TriggeredAbility(ENTERS_BATTLEFIELD, _landfall, lambda g, item: _pump_source(g, item, 2, 2)),
+    ),
+    # When this creature enters, if you cast it from your hand, add {R}{R}{R}.
+    "Coal Stoker": (
+        TriggeredAbility(ENTERS_BATTLEFIELD, _cast_self, lambda g, item: _add_mana(g, item, "R", 3)),
+    ),
+}
+
+
+class TriggerIndex:
+    """
+    Per-player index of the permanents listening for each event type.
+    Permanents subscribe when they enter the battlefield and unsubscribe
+    when they leave, so an event only visits its listeners instead of
+    every permanent on the battlefield.
+    """
+
+    __slots__ = ("listeners",)
+
+    def __init__(self) -> None:
+        self.listeners: Dict[str, List["Card"]] = {}
+
+    def subscribe(self, card: "Card") -> None:
+        abilities = TRIGGERED_ABILITIES.get(card.name)
+        if not abilities:
+            return
+        for kind in {a.event for a in abilities}:
+            self.listeners.setdefault(kind, []).append(card)
+
+    def unsubscribe(self, card: "Card") -> None:
+        abilities = TRIGGERED_ABILITIES.get(card.name)
+        if not abilities:
+            return
+        for kind in {a.event for a in abilities}:
+            listeners = self.listeners.get(kind)
+            if listeners and card in listeners:
+                listeners.remove(card)
+                if not listeners:
+                    del self.listeners[kind]
+
+    def get(self, kind: str) -> List["Card"]:
+        return self.listeners.get(kind, [])
+
+    def clone(self, card_map: Dict[int, "Card"]) -> "TriggerIndex":
+        new = TriggerIndex()
+        new.listeners = {kind: [card_map[id(c)] for c in cards] for kind, cards in self.listeners.items()}
+        return new
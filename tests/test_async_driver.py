@@ -0,0 +1,108 @@
+import asyncio
+import time
+import unittest
+from typing import Dict, List, Optional, Tuple
+
+from mtg_ai.card import Card
+from mtg_ai.game_state import GameState, Player
+from mtg_ai.agent import AsyncFullAgent
+from mtg_ai.agents.simple import NaiveAgent
+from mtg_ai.async_driver import SyncAgentAdapter, play_game_async, run_games, run_games_blocking
+from mtg_ai.rollout import play_out
+from tests.test_env import make_stub_decks
+from tests.test_stack import BlockFirstAttacker, InstantPlayer, growth_combat
+
+
+def new_game(seed: int) -> GameState:
+    deck_a, deck_b = make_stub_decks()
+    game = GameState(Player("A", deck_a.cards), Player("B", deck_b.cards))
+    game.start_game(shuffle_active_seed=seed, shuffle_opponent_seed=seed + 50)
+    return game
+
+
+class SlowServiceAgent(AsyncFullAgent):
+    """Stand-in for an agent behind a remote service: every decision awaits."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.inner = NaiveAgent()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _wait(self) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+
+    async def choose_casts(self, game: GameState) -> List[Card]:
+        await self._wait()
+        return self.inner.choose_casts(game)
+
+    async def choose_attackers(self, game: GameState) -> List[Card]:
+        await self._wait()
+        return self.inner.choose_attackers(game)
+
+    async def choose_blockers(self, game: GameState) -> Dict[Card, List[Card]]:
+        await self._wait()
+        return self.inner.choose_blockers(game)
+
+
+class AsyncInstantPlayer(SlowServiceAgent):
+    """SlowServiceAgent whose instants also come from the service."""
+
+    def __init__(self) -> None:
+        super().__init__(latency=0.001)
+        self.caster = InstantPlayer()
+        self.inner = self.caster
+
+    async def choose_instant(self, game: GameState, seat: int) -> Optional[Tuple[Card, List[Card]]]:
+        await self._wait()
+        return self.caster.choose_instant(game, seat)
+
+
+class AsyncDriverTest(unittest.TestCase):
+    def test_sync_adapter_matches_play_out(self) -> None:
+        agents = [SyncAgentAdapter(NaiveAgent()), SyncAgentAdapter(NaiveAgent(block=True), offload=True)]
+        winners = run_games_blocking([new_game(i) for i in range(3)], agents, max_steps=3000)
+        for i, winner in enumerate(winners):
+            game = new_game(i)
+            play_out(game, [NaiveAgent(), NaiveAgent(block=True)], max_steps=3000)
+            self.assertEqual(winner, 0 if game.winner is game.players[0] else 1)
+
+    def test_slow_agents_do_not_block_other_games(self) -> None:
+        slow = SlowServiceAgent(latency=0.005)
+        games = [new_game(i) for i in range(200)]
+        start = time.perf_counter()
+        winners = asyncio.run(run_games(games, [slow, slow], max_steps=60))
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(winners), 200)
+        self.assertEqual(slow.max_in_flight, 200)
+        # ~25 sequential decisions per game: serially this would take 200x longer
+        self.assertLess(elapsed, 10.0)
+
+    def test_concurrency_limit(self) -> None:
+        slow = SlowServiceAgent(latency=0.001)
+        asyncio.run(run_games([new_game(i) for i in range(10)], [slow, slow], max_concurrency=3, max_steps=30))
+        self.assertEqual(slow.max_in_flight, 3)
+
+    def test_instants_are_cast(self) -> None:
+        for caster in (AsyncInstantPlayer(), SyncAgentAdapter(InstantPlayer())):
+            game, atk, blk = growth_combat()
+            blocker = SyncAgentAdapter(BlockFirstAttacker())
+            asyncio.run(play_game_async(game, [caster, blocker], max_steps=2, play_lands=False))
+            inner = caster.caster if isinstance(caster, AsyncInstantPlayer) else caster.agent
+            assert isinstance(inner, InstantPlayer)
+            self.assertGreater(inner.calls, 0)
+            self.assertIn(atk, game.players[0].battlefield)
+            self.assertIn(blk, game.players[1].graveyard)
+
+    def test_max_steps_leaves_game_unfinished(self) -> None:
+        game = new_game(0)
+        agent = SyncAgentAdapter(NaiveAgent())
+        self.assertIsNone(asyncio.run(play_game_async(game, [agent, agent], max_steps=5)))
+        self.assertFalse(game.is_game_over())
+
+
+if __name__ == "__main__":
+    unittest.main()
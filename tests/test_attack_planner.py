@@ -0,0 +1,81 @@
+import random
+import time
+import unittest
+
+from mtg_ai.game_state import GameState, Player
+from mtg_ai.attack_planner import _search, choose_attack, plan_attacks
+from mtg_ai.agents.simple import NaiveAgent
+from mtg_ai.env import A_ATTACK_PLAN_BASE, NUM_ATTACK_PLANS, _legal_mask
+from mtg_ai.keywords import FLYING, REACH
+from tests.test_mcts import creature, library
+
+
+class PlanAttacksTest(unittest.TestCase):
+    def test_no_blockers_attacks_with_everything(self) -> None:
+        (plan,) = plan_attacks([(2, 2), (3, 1)], [], life=20)
+        self.assertEqual(plan.attackers, (0, 1))
+        self.assertEqual(plan.damage, 5)
+
+    def test_holds_back_attacker_that_would_die_for_nothing(self) -> None:
+        # The 1/1 runs into a 3/3; the 5/5 cannot be killed by it.
+        (plan,) = plan_attacks([(1, 1), (5, 5)], [(3, 3)], life=20)
+        self.assertEqual(plan.attackers, (1,))
+
+    def test_finds_lethal_alpha_strike(self) -> None:
+        (plan,) = plan_attacks([(2, 2), (2, 2), (2, 2)], [(3, 3)], life=4)
+        self.assertTrue(plan.lethal)
+        self.assertEqual(plan.attackers, (0, 1, 2))
+
+    def test_zero_power_never_attacks(self) -> None:
+        plans = plan_attacks([(0, 4), (2, 2)], [(1, 1)], life=20, top_k=5)
+        for plan in plans:
+            self.assertNotIn(0, plan.attackers)
+
+    def test_flyer_attacks_past_ground_blockers(self) -> None:
+        (plan,) = plan_attacks([(1, 1, FLYING), (1, 1)], [(3, 3)], life=20)
+        self.assertEqual(plan.attackers, (0,))
+        self.assertEqual(plan.damage, 1)
+        (plan,) = plan_attacks([(1, 1, FLYING)], [(3, 3, REACH)], life=20)
+        self.assertEqual(plan.attackers, ())
+
+    def test_top_k_is_sorted_and_distinct(self) -> None:
+        plans = plan_attacks([(2, 2), (3, 3), (4, 1)], [(2, 3), (1, 1)], life=20, top_k=3)
+        self.assertEqual(len(plans), 3)
+        self.assertEqual(len({p.attackers for p in plans}), 3)
+        self.assertEqual([p.score for p in plans], sorted((p.score for p in plans), reverse=True))
+
+    def test_large_board_is_fast_and_memoized(self) -> None:
+        rng = random.Random(1)
+        attackers = [(rng.randint(1, 6), rng.randint(1, 6)) for _ in range(15)]
+        blockers = [(rng.randint(0, 6), rng.randint(1, 6)) for _ in range(15)]
+        _search.cache_clear()
+        start = time.perf_counter()
+        plan_attacks(attackers, blockers, life=20)
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+        rng.shuffle(attackers)
+        plan_attacks(attackers, blockers, life=20)
+        self.assertEqual(_search.cache_info().hits, 1)
+
+
+class AttackIntegrationTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.p1, self.p2 = Player("A", library(5)), Player("B", library(5))
+        self.game = GameState(self.p1, self.p2)
+        self.small, self.big = creature("Small", 1, 1), creature("Big", 5, 5)
+        self.p1.battlefield.extend([self.small, self.big])
+        self.p2.battlefield.append(creature("Wall", 3, 3))
+        self.game.phase = "DECLARE_ATTACKERS"
+
+    def test_agent_and_env_mask_use_planner(self) -> None:
+        self.assertEqual(choose_attack(self.game), [self.big])
+        self.assertEqual(NaiveAgent(plan=True).choose_attackers(self.game), [self.big])
+        self.assertEqual(NaiveAgent().choose_attackers(self.game), [self.small, self.big])
+
+        # The 5/5 always attacks (dominance), so only two subsets remain.
+        mask = _legal_mask(self.game, self.p1)
+        self.assertEqual(mask[A_ATTACK_PLAN_BASE:A_ATTACK_PLAN_BASE + NUM_ATTACK_PLANS].tolist(), [True, True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from typing import List
+
+from mtg_ai.agent import BatchAgent
+from mtg_ai.game_state import GameState, Player
+from mtg_ai.agents.simple import NaiveAgent
+from mtg_ai.agents.mlp import MLPPolicy, PolicyAgent
+from mtg_ai.batch_controller import LockstepController
+from mtg_ai.rollout import play_out
+from tests.test_combat import BlockWithAll, SmallestFirst
+from tests.test_env import make_stub_decks
+from tests.test_mcts import creature
+from tests.test_stack import BlockFirstAttacker, InstantPlayer, growth_combat
+
+
+def new_games(n: int) -> List[GameState]:
+    games = []
+    for i in range(n):
+        deck_a, deck_b = make_stub_decks()
+        game = GameState(Player("A", deck_a.cards), Player("B", deck_b.cards))
+        game.start_game(shuffle_active_seed=i, shuffle_opponent_seed=i + 50)
+        games.append(game)
+    return games
+
+
+class LockstepControllerTest(unittest.TestCase):
+    def test_matches_sequential_play(self) -> None:
+        agents = [NaiveAgent(), NaiveAgent(block=True)]
+        lockstep = new_games(4)
+        winners = LockstepController(lockstep, agents).run(max_steps=3000)
+
+        sequential = new_games(4)
+        for game in sequential:
+            play_out(game, agents, max_steps=3000)
+        self.assertEqual(winners, [0 if g.winner is g.players[0] else 1 for g in sequential])
+        self.assertEqual([g.turn_number for g in lockstep], [g.turn_number for g in sequential])
+        self.assertNotIn(None, winners)
+
+    def test_batch_agent_gets_grouped_decisions(self) -> None:
+        policy = PolicyAgent(MLPPolicy.init(seed=0), greedy=False, seed=0)
+        self.assertIsInstance(policy, BatchAgent)
+        self.assertNotIsInstance(NaiveAgent(), BatchAgent)
+
+        controller = LockstepController(new_games(8), [policy, policy])
+        controller.run(max_steps=200)
+        self.assertEqual(policy.single_decisions, 0)
+        self.assertGreater(policy.batched_decisions, 0)
+        self.assertEqual(max(controller.batch_sizes), 8)
+        self.assertEqual(max(controller.steps), 200)
+
+    def test_instants_and_damage_order_reach_the_agents(self) -> None:
+        game, atk, blk = growth_combat()
+        caster = InstantPlayer()
+        controller = LockstepController([game], [caster, BlockFirstAttacker()], play_lands=False)
+        controller.tick()  # DECLARE_BLOCKERS: Giant Growth in the priority round
+        controller.tick()  # COMBAT_DAMAGE
+        self.assertGreater(caster.calls, 0)
+        self.assertIn(atk, game.players[0].battlefield)
+        self.assertIn(blk, game.players[1].graveyard)
+
+        game = GameState(Player("A", []), Player("B", []))
+        ogre = creature("Ogre", 3, 3)
+        wall, elf = creature("Wall", 0, 4), creature("Elf", 1, 1)
+        for card in (ogre, wall, elf):
+            card.summoning_sick = False
+        game.players[0].battlefield.append(ogre)
+        game.players[1].battlefield.extend([wall, elf])
+        game.phase = "DECLARE_ATTACKERS"
+        controller = LockstepController([game], [SmallestFirst(), BlockWithAll()], play_lands=False)
+        controller.tick()
+        controller.tick()
+        self.assertEqual(game.blocking_assignments[ogre], [elf, wall])
+
+    def test_agent_arguments_are_validated(self) -> None:
+        games = new_games(2)
+        with self.assertRaises(ValueError):
+            LockstepController(games)
+        with self.assertRaises(ValueError):
+            LockstepController(games, agents_per_game=[[NaiveAgent(), NaiveAgent()]])
+
+
+if __name__ == "__main__":
+    unittest.main()
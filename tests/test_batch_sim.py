@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from mtg_ai.batch_sim import HAND, LIBRARY, BatchGames, cross_check, simulate, validate_ruleset
+
+GREEN = ["Forest"] * 24 + ["Grizzly Bears"] * 8 + ["Elvish Warrior"] * 8 + ["Kalonian Tusker"] * 8 + [
+    "Nessian Courser"] * 8 + ["Craw Wurm"] * 4
+GRUUL = ["Forest"] * 16 + ["Mountain"] * 8 + ["Runeclaw Bear"] * 8 + ["Gray Ogre"] * 8 + ["Hill Giant"] * 8 + [
+    "Centaur Courser"] * 8 + ["Craw Wurm"] * 4
+
+
+class BatchSimTest(unittest.TestCase):
+    def test_matches_engine_game_for_game(self) -> None:
+        seeds = [(i, 100 + i) for i in range(40)]
+        self.assertEqual(cross_check([GREEN, GRUUL], seeds), [])
+        self.assertEqual(cross_check([GRUUL, GREEN], seeds), [])
+
+    def test_drawing_from_an_empty_library_loses(self) -> None:
+        # Three cards left after the opening hand: seat 0 draws on turns 3, 5, 7 and loses on turn 9
+        decks = [["Forest"] * 10, ["Mountain"] * 12]
+        result = BatchGames.from_seeds(decks, [(1, 2)]).run()
+        self.assertEqual((result.winner.tolist(), result.turns.tolist()), ([1], [9]))
+        self.assertEqual(cross_check(decks, [(1, 2)]), [])
+
+    def test_opening_hands_and_zone_counts(self) -> None:
+        games = BatchGames.from_seeds([GREEN, GRUUL], [(3, 4), (5, 6)])
+        hands = games.zone_counts(HAND)
+        self.assertEqual(hands.shape, (2, 2, len(games.templates)))
+        self.assertTrue((hands.sum(axis=2) == 7).all())
+        self.assertTrue((games.zone_counts(LIBRARY).sum(axis=2) == 53).all())
+
+    def test_compaction_keeps_results_in_game_order(self) -> None:
+        seeds = [(i, 50 + i) for i in range(30)]
+        together = BatchGames.from_seeds([GREEN, GRUUL], seeds).run()
+        alone = [BatchGames.from_seeds([GREEN, GRUUL], [pair]).run() for pair in seeds]
+        self.assertEqual(together.winner.tolist(), [r.winner[0] for r in alone])
+        self.assertEqual(together.turns.tolist(), [r.turns[0] for r in alone])
+
+    def test_simulate_is_seeded(self) -> None:
+        a = simulate([GREEN, GRUUL], 2000, seed=1, batch=500)
+        b = simulate([GREEN, GRUUL], 2000, seed=1)
+        self.assertTrue(np.array_equal(a.winner, b.winner))
+        self.assertEqual(a.summary()["unfinished"], 0.0)
+        self.assertAlmostEqual(a.summary()["p0_win_rate"] + a.summary()["p1_win_rate"], 1.0)
+
+    def test_rejects_cards_outside_the_ruleset(self) -> None:
+        with self.assertRaises(ValueError):
+            validate_ruleset(["Forest", "Giant Growth"])
+        with self.assertRaises(ValueError):
+            validate_ruleset(["Mountain", "Raging Goblin"])
+        validate_ruleset(GRUUL)
+
+
+if __name__ == "__main__":
+    unittest.main()
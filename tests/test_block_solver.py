@@ -0,0 +1,187 @@
+import random
+import time
+import unittest
+from itertools import product
+
+from mtg_ai.game_state import GameState, Player
+from mtg_ai.block_solver import _outcome, _solve, choose_blocks, solve_blocks
+from mtg_ai.card import Card
+from mtg_ai.combat import can_block
+from mtg_ai.combat_sim import card_pt, pt_can_block, resolve_block, simulate_block
+from mtg_ai.keywords import DEATHTOUCH, FLYING, REACH, TRAMPLE
+from mtg_ai.agents.simple import NaiveAgent
+from mtg_ai import game_actions as GA
+from tests.test_mcts import creature, library
+
+
+class CombatSimTest(unittest.TestCase):
+    def test_matches_resolve_combat_damage(self) -> None:
+        for a, b1, b2 in product([(3, 3), (5, 2)], [(1, 1), (2, 4)], [(2, 2), (0, 3)]):
+            p1, p2 = Player("A", library(1)), Player("B", library(1))
+            game = GameState(p1, p2)
+            atk = creature("Atk", *a)
+            blk = [creature("B1", *b1), creature("B2", *b2)]
+            p1.battlefield.append(atk)
+            p2.battlefield.extend(blk)
+            game.phase = "DECLARE_ATTACKERS"
+            GA.declare_attackers(game, [atk])
+            GA.declare_blockers(game, {atk: blk})
+            GA.resolve_combat_damage(game)
+
+            dies, deaths = simulate_block(a, [b1, b2])
+            self.assertEqual(atk not in p1.battlefield, dies)
+            self.assertEqual(tuple(b not in p2.battlefield for b in blk), deaths)
+
+    def test_keywords_match_resolve_combat_damage(self) -> None:
+        rng = random.Random(4)
+        keywords = ["First strike", "Deathtouch", "Trample"]
+
+        def keyworded(name: str) -> Card:
+            c = Card({"name": name, "uuid": name, "types": ["Creature"], "power": str(rng.randint(0, 5)),
+                      "toughness": str(rng.randint(1, 5)), "keywords": rng.sample(keywords, rng.randint(0, 2))})
+            c.summoning_sick = False
+            return c
+
+        for _ in range(300):
+            p1, p2 = Player("A", library(1)), Player("B", library(1))
+            game = GameState(p1, p2)
+            atk = keyworded("Atk")
+            blk = [keyworded(f"B{i}") for i in range(rng.randint(1, 3))]
+            p1.battlefield.append(atk)
+            p2.battlefield.extend(blk)
+            game.phase = "DECLARE_ATTACKERS"
+            GA.declare_attackers(game, [atk])
+            GA.declare_blockers(game, {atk: blk})
+            GA.resolve_combat_damage(game)
+
+            dies, deaths, to_player = resolve_block(card_pt(atk), [card_pt(b) for b in blk])
+            self.assertEqual(atk not in p1.battlefield, dies)
+            self.assertEqual(tuple(b not in p2.battlefield for b in blk), deaths)
+            self.assertEqual(20 - p2.life_total, to_player)
+
+    def test_solver_trades_with_deathtouch_and_counts_trample(self) -> None:
+        plan = solve_blocks([(5, 5)], [(1, 1, DEATHTOUCH)], life=20)
+        self.assertEqual(plan.blocks, {0: (0,)})
+        self.assertGreater(plan.score, 0)
+        plan = solve_blocks([(6, 6, TRAMPLE)], [(0, 2)], life=20)
+        self.assertEqual(plan.damage, 6 if not plan.blocks else 4)
+
+    def test_block_legality_matches_can_block(self) -> None:
+        game = GameState(Player("A", []), Player("B", []))
+        for atk_kw, blk_kw in product([[], ["Flying"]], [[], ["Flying"], ["Reach"]]):
+            atk = Card({"name": "Atk", "uuid": "Atk", "types": ["Creature"], "power": "2", "toughness": "2",
+                        "keywords": atk_kw})
+            blk = Card({"name": "Blk", "uuid": "Blk", "types": ["Creature"], "power": "2", "toughness": "2",
+                        "keywords": blk_kw})
+            self.assertEqual(pt_can_block(card_pt(blk), card_pt(atk)), can_block(game, blk, atk))
+
+
+class SolveBlocksTest(unittest.TestCase):
+    def test_chump_blocks_when_damage_is_lethal(self) -> None:
+        plan = solve_blocks([(5, 5)], [(1, 1)], life=5)
+        self.assertEqual(plan.blocks, {0: (0,)})
+        self.assertEqual(plan.damage, 0)
+
+    def test_takes_free_kill_and_skips_bad_trade(self) -> None:
+        # The wall stops the 2/2 for free; chumping the 6/6 with the 1/1
+        # costs more than the 6 life is worth at this weight.
+        plan = solve_blocks([(6, 6), (2, 2)], [(0, 4), (1, 1)], life=20, life_weight=0.25)
+        self.assertEqual(plan.blocks, {1: (0,)})
+        self.assertEqual(plan.damage, 6)
+        self.assertTrue(plan.exact)
+
+    def test_double_block_kills_bigger_attacker(self) -> None:
+        plan = solve_blocks([(3, 4)], [(2, 2), (2, 3)], life=20)
+        self.assertEqual(sorted(plan.blocks[0]), [0, 1])
+
+    def test_only_legal_blockers_are_considered(self) -> None:
+        # Killing the flyer is not an option for the ground 1/1: chump the 3/3 to survive
+        plan = solve_blocks([(3, 1, FLYING), (3, 3)], [(1, 1)], life=6)
+        self.assertEqual(plan.blocks, {1: (0,)})
+        self.assertEqual(plan.damage, 3)
+        plan = solve_blocks([(3, 1, FLYING), (3, 3)], [(1, 1, REACH)], life=6)
+        self.assertEqual(plan.blocks, {0: (0,)})
+
+    def test_indices_refer_to_caller_order(self) -> None:
+        plan = solve_blocks([(1, 1), (4, 4)], [(1, 1), (0, 5), (1, 1)], life=4)
+        self.assertEqual(plan.blocks.get(1), (1,))
+        used = [b for bs in plan.blocks.values() for b in bs]
+        self.assertEqual(len(used), len(set(used)))
+
+    def test_large_board_is_fast_and_cached(self) -> None:
+        rng = random.Random(0)
+        attackers = [(rng.randint(1, 8), rng.randint(1, 8)) for _ in range(15)]
+        blockers = [(rng.randint(0, 8), rng.randint(1, 8)) for _ in range(15)]
+        _solve.cache_clear()
+        start = time.perf_counter()
+        plan = solve_blocks(attackers, blockers, life=20)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertLess(plan.damage, 20)
+
+        # Same P/T multisets in a different order hit the cache.
+        rng.shuffle(attackers)
+        rng.shuffle(blockers)
+        solve_blocks(attackers, blockers, life=20)
+        self.assertEqual(_solve.cache_info().hits, 1)
+
+    def test_exact_large_board_solve(self) -> None:
+        # Without a node budget the bounded search finishes exactly; this
+        # board takes ~50 ms, the hardest random ones up to ~1 s (see _search_blocks).
+        rng = random.Random(0)
+        attackers = [(rng.randint(1, 8), rng.randint(1, 8)) for _ in range(15)]
+        blockers = [(rng.randint(0, 8), rng.randint(1, 8)) for _ in range(15)]
+        _solve.cache_clear()
+        _outcome.cache_clear()
+        start = time.perf_counter()
+        plan = solve_blocks(attackers, blockers, life=20, node_budget=10 ** 9)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertTrue(plan.exact)
+        budgeted = solve_blocks(attackers, blockers, life=20)
+        self.assertLessEqual(budgeted.score, plan.score)
+
+
+class ChooseBlocksTest(unittest.TestCase):
+    def test_naive_agent_blocks_with_solver(self) -> None:
+        p1, p2 = Player("A", library(1)), Player("B", library(1))
+        game = GameState(p1, p2)
+        atk = creature("Atk", 3, 3)
+        wall = creature("Wall", 0, 4)
+        p1.battlefield.append(atk)
+        p2.battlefield.append(wall)
+        game.phase = "DECLARE_ATTACKERS"
+        GA.declare_attackers(game, [atk])
+
+        self.assertEqual(choose_blocks(game), {atk: [wall]})
+        self.assertEqual(NaiveAgent(block=True).choose_blockers(game), {atk: [wall]})
+        self.assertEqual(NaiveAgent().choose_blockers(game), {})
+        self.assertEqual(card_pt(wall), (0, 4))
+
+    def test_flyer_is_not_blocked_by_ground_creatures(self) -> None:
+        p1, p2 = Player("A", library(1)), Player("B", library(1))
+        game = GameState(p1, p2)
+        flyer = Card({"name": "Flyer", "uuid": "Flyer", "types": ["Creature"], "power": "3", "toughness": "1",
+                      "keywords": ["Flying"]})
+        flyer.summoning_sick = False
+        ogre, elf = creature("Ogre", 3, 3), creature("Elf", 1, 1)
+        p1.battlefield.extend([flyer, ogre])
+        p2.battlefield.append(elf)
+        p2.life_total = 6
+        game.phase = "DECLARE_ATTACKERS"
+        GA.declare_attackers(game, [flyer, ogre])
+        self.assertEqual(choose_blocks(game), {ogre: [elf]})
+
+    def test_declare_blockers_rejects_double_use(self) -> None:
+        p1, p2 = Player("A", library(1)), Player("B", library(1))
+        game = GameState(p1, p2)
+        a1, a2 = creature("A1", 2, 2), creature("A2", 2, 2)
+        blk = creature("Blk", 1, 1)
+        p1.battlefield.extend([a1, a2])
+        p2.battlefield.append(blk)
+        game.phase = "DECLARE_ATTACKERS"
+        GA.declare_attackers(game, [a1, a2])
+        with self.assertRaises(ValueError):
+            GA.declare_blockers(game, {a1: [blk], a2: [blk]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import random
+import time
+import unittest
+from typing import List, Optional, Tuple
+
+from mtg_ai.attack_planner import choose_attack_plans, plan_attacks
+from mtg_ai.block_solver import choose_blocks, solve_blocks
+from mtg_ai.budget import BudgetUsage, DecisionBudget
+from mtg_ai.card import Card
+from mtg_ai.game_state import GameState, Player
+from mtg_ai.agents.mcts import MCTSAgent
+from mtg_ai.agents.simple import NaiveAgent
+from mtg_ai.tournament import play_match
+from tests.test_env import StubDeck, make_stub_decks
+from tests.test_mcts import FOREST, creature, library
+from tests.test_stack import InstantPlayer, db_card
+
+
+def combat_position() -> GameState:
+    p1, p2 = Player("A", library(20)), Player("B", library(20))
+    game = GameState(p1, p2)
+    p1.battlefield.extend([creature("Bear", 2, 2), creature("Ogre", 3, 3), creature("Elf", 1, 1)])
+    p2.battlefield.extend([creature("Wall", 0, 4), creature("Bear", 2, 2)])
+    game.phase = "DECLARE_ATTACKERS"
+    return game
+
+
+class DecisionBudgetTest(unittest.TestCase):
+    def test_helpers_and_usage(self) -> None:
+        budget = DecisionBudget(time_limit=0.1, node_limit=50)
+        self.assertEqual(budget.deadline(start=1.0), 1.1)
+        self.assertIsNone(DecisionBudget(node_limit=5).deadline())
+        self.assertEqual(budget.nodes(1000), 50)
+        self.assertEqual(DecisionBudget().nodes(1000), 1000)
+
+        usage = BudgetUsage()
+        usage.record(0.05, 10, budget)
+        usage.record(0.2, None, budget)
+        self.assertEqual((usage.decisions, usage.nodes, usage.overruns), (2, 10, 1))
+        self.assertAlmostEqual(usage.mean_time, 0.125)
+
+    def test_clone_does_not_carry_budget(self) -> None:
+        game = combat_position()
+        game.decision_budget = DecisionBudget(node_limit=3)
+        self.assertIsNone(game.clone().decision_budget)
+
+
+class SearchBudgetTest(unittest.TestCase):
+    def test_node_budget_overrides_agent_iterations(self) -> None:
+        game = combat_position()
+        game.decision_budget = DecisionBudget(node_limit=7)
+        agent = MCTSAgent(iterations=10_000, seed=0)
+        agent.choose_attackers(game)
+        self.assertEqual(agent.last_iterations, 7)
+
+    def test_time_budget_returns_best_so_far(self) -> None:
+        game = combat_position()
+        game.decision_budget = DecisionBudget(time_limit=0.05)
+        agent = MCTSAgent(iterations=10_000_000, seed=0)
+        start = time.perf_counter()
+        attackers = agent.choose_attackers(game)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertGreater(agent.last_iterations, 0)
+        self.assertTrue(set(attackers) <= set(game.players[0].battlefield))
+
+    def test_solver_and_planner_stop_at_deadline(self) -> None:
+        rng = random.Random(1)
+        attackers = [(rng.randint(1, 8), rng.randint(1, 8)) for _ in range(15)]
+        blockers = [(rng.randint(0, 8), rng.randint(1, 8)) for _ in range(15)]
+        start = time.perf_counter()
+        plan = solve_blocks(attackers, blockers, life=20, node_budget=10 ** 9, deadline=start)
+        self.assertFalse(plan.exact)
+        used = [b for bs in plan.blocks.values() for b in bs]
+        self.assertEqual(len(used), len(set(used)))
+        plans = plan_attacks(attackers, blockers, 20, top_k=5, max_evals=10 ** 6, deadline=start)
+        self.assertEqual(len(plans), 1)  # only the first subset was scored
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_time_budget_bounds_blocks_and_attacks(self) -> None:
+        game = combat_position()
+        game.decision_budget = DecisionBudget(time_limit=0.0)
+        attack = choose_attack_plans(game, top_k=3, max_evals=10 ** 6)
+        self.assertEqual(len(attack), 1)
+        self.assertTrue(set(attack[0]) <= set(game.players[0].battlefield))
+
+        game.attackers = list(game.players[0].battlefield)
+        blocks = choose_blocks(game, node_budget=10 ** 9)
+        self.assertTrue(set(blocks) <= set(game.attackers))
+        self.assertTrue(all(set(bs) <= set(game.players[1].battlefield) for bs in blocks.values()))
+
+
+class CountingCaster(InstantPlayer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.casts = 0
+
+    def choose_instant(self, game: GameState, seat: int) -> Optional[Tuple[Card, List[Card]]]:
+        choice = super().choose_instant(game, seat)
+        self.casts += choice is not None
+        return choice
+
+
+def growth_decks() -> Tuple[StubDeck, StubDeck]:
+    def deck() -> StubDeck:
+        cards = [Card({**FOREST, "uuid": f"F{i}"}) for i in range(20)]
+        cards += [creature(f"Bear{i}", 2, 2) for i in range(12)]
+        return StubDeck(cards + [db_card("Giant Growth") for _ in range(8)])
+    return deck(), deck()
+
+
+class TournamentTest(unittest.TestCase):
+    def test_fixed_time_match_reports_usage(self) -> None:
+        agents = [MCTSAgent(iterations=None, time_limit=1.0, seed=0), NaiveAgent()]
+        result = play_match(agents, make_stub_decks, games=2, budget=DecisionBudget(time_limit=0.005), seed=0)
+        self.assertEqual(result.games, 2)
+        self.assertEqual(sum(result.wins) + result.draws, 2)
+        mcts_usage = result.usage[0]
+        self.assertGreater(mcts_usage.decisions, 0)
+        self.assertGreater(mcts_usage.nodes, 0)
+        self.assertLess(mcts_usage.max_time, 0.25)
+        self.assertIn("MCTSAgent", result.report())
+
+    def test_match_forwards_instants(self) -> None:
+        caster = CountingCaster()
+        result = play_match([caster, NaiveAgent(block=True)], growth_decks, games=2, seed=0)
+        self.assertGreater(caster.casts, 0)
+        self.assertGreaterEqual(result.usage[0].decisions, caster.calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
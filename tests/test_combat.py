@@ -0,0 +1,100 @@
+import unittest
+from typing import List
+
+from mtg_ai.card import Card
+from mtg_ai.game_state import GameState, Player
+from mtg_ai.game_controller import step_game
+from mtg_ai.agents.simple import NaiveAgent
+from mtg_ai import combat as CB
+from tests.test_mcts import creature
+
+
+class SmallestFirst(NaiveAgent):
+    """Attacks with everything and assigns damage to the smallest blocker first."""
+
+    def order_blockers(self, game: GameState, attacker: Card, blockers: List[Card]) -> List[Card]:
+        return sorted(blockers, key=lambda b: b.toughness or 0)
+
+
+class BlockWithAll(NaiveAgent):
+    def choose_blockers(self, game: GameState) -> dict:
+        attacker = game.attackers[0]
+        return {attacker: list(game.get_opponent().battlefield)}
+
+
+class CombatTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.p1, self.p2 = Player("A", []), Player("B", [])
+        self.game = GameState(self.p1, self.p2)
+
+    def ready(self, player: Player, name: str, p: int, t: int) -> Card:
+        card = creature(name, p, t)
+        card.summoning_sick = False
+        player.enter_battlefield(card)
+        return card
+
+    def test_attacking_player_orders_damage(self) -> None:
+        ogre = self.ready(self.p1, "Ogre", 3, 3)
+        wall = self.ready(self.p2, "Wall", 0, 4)
+        elf = self.ready(self.p2, "Elf", 1, 1)
+        self.game.phase = "DECLARE_ATTACKERS"
+        step_game(self.game, SmallestFirst(), BlockWithAll())
+        step_game(self.game, SmallestFirst(), BlockWithAll())
+        self.assertEqual(self.game.blocking_assignments[ogre], [elf, wall])
+        step_game(self.game, SmallestFirst(), BlockWithAll())
+        self.assertEqual(self.p2.graveyard, [elf])
+
+    def test_declared_order_without_hook(self) -> None:
+        ogre = self.ready(self.p1, "Ogre", 3, 3)
+        wall = self.ready(self.p2, "Wall", 0, 4)
+        elf = self.ready(self.p2, "Elf", 1, 1)
+        CB.declare_attackers(self.game, [ogre])
+        CB.declare_blockers_step(self.game, NaiveAgent(), BlockWithAll())
+        self.assertEqual(self.game.blocking_assignments[ogre], [wall, elf])
+        CB.resolve_combat_damage(self.game)
+        self.assertEqual(self.p2.graveyard, [])
+
+    def test_order_must_be_a_permutation_of_the_blockers(self) -> None:
+        ogre = self.ready(self.p1, "Ogre", 3, 3)
+        elf, bear = self.ready(self.p2, "Elf", 1, 1), self.ready(self.p2, "Bear", 2, 2)
+        CB.declare_attackers(self.game, [ogre])
+        CB.declare_blockers(self.game, {ogre: [elf, bear]})
+        with self.assertRaises(ValueError):
+            CB.order_blockers(self.game, ogre, [elf])
+        with self.assertRaises(ValueError):
+            CB.order_blockers(self.game, ogre, [elf, elf])
+        CB.order_blockers(self.game, ogre, [bear, elf])
+        self.assertEqual(self.game.blocking_assignments[ogre], [bear, elf])
+
+    def test_blocker_index(self) -> None:
+        a1, a2 = self.ready(self.p1, "A1", 2, 2), self.ready(self.p1, "A2", 2, 2)
+        elf = self.ready(self.p2, "Elf", 1, 1)
+        CB.declare_attackers(self.game, [a1, a2])
+        CB.declare_blockers(self.game, {a1: [elf]})
+        self.assertEqual(self.game.blocked_by, {elf: a1})
+        with self.assertRaises(ValueError):
+            CB.declare_blockers(self.game, {a2: [elf]})
+
+        copy = self.game.clone()
+        elf_copy, a1_copy = copy.players[1].battlefield[0], copy.players[0].battlefield[0]
+        self.assertEqual(copy.blocked_by, {elf_copy: a1_copy})
+
+        CB.resolve_combat_damage(self.game)
+        self.assertEqual(self.game.blocked_by, {})
+
+    def test_simultaneous_deaths_on_a_large_board(self) -> None:
+        attackers = [self.ready(self.p1, f"A{i}", 2, 2) for i in range(150)]
+        blockers = [self.ready(self.p2, f"B{i}", 2, 2) for i in range(150)]
+        CB.declare_attackers(self.game, attackers)
+        # Every other attacker is blocked; the rest connect
+        CB.declare_blockers(self.game, {a: [b] for a, b in zip(attackers[::2], blockers[::2])})
+        CB.resolve_combat_damage(self.game)
+        self.assertEqual(self.p1.battlefield, attackers[1::2])
+        self.assertEqual(self.p2.battlefield, blockers[1::2])
+        self.assertEqual(self.p1.graveyard, attackers[::2])
+        self.assertEqual(self.p2.life_total, 20 - 2 * 75)
+        self.assertIs(self.game.winner, self.p1)
+
+
+if __name__ == "__main__":
+    unittest.main()
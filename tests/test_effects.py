@@ -0,0 +1,98 @@
+import unittest
+from typing import List
+
+from mtg_ai.card import Card
+from mtg_ai.card_db import get_card_template_by_name
+from mtg_ai.game_state import GameState, Player
+from mtg_ai import effects as FX
+from mtg_ai import stack as ST
+from mtg_ai import game_actions as GA
+from tests.test_mcts import creature
+
+ANTHEM = {"name": "Test Anthem", "uuid": "anthem", "types": ["Enchantment"], "manaCost": "{2}{W}"}
+
+
+class EffectsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.p1, self.p2 = Player("A", []), Player("B", [])
+        self.game = GameState(self.p1, self.p2)
+        FX.STATIC_ABILITIES["Test Anthem"] = FX.anthem(1, 1)
+
+    def tearDown(self) -> None:
+        FX.STATIC_ABILITIES.pop("Test Anthem", None)
+
+    def test_reads_are_cached_until_effects_change(self) -> None:
+        bear = creature("Bear", 2, 2)
+        self.p1.enter_battlefield(bear)
+        calls: List[Card] = []
+        refresh = self.game.effects.refresh
+
+        def counting_refresh(card: Card) -> None:
+            calls.append(card)
+            refresh(card)
+
+        self.game.effects.refresh = counting_refresh  # type: ignore[method-assign]
+
+        for _ in range(100):
+            self.assertEqual((bear.power, bear.toughness), (2, 2))
+        self.assertEqual(len(calls), 1)
+
+        ST.pump(self.game, bear, 3, 3)
+        for _ in range(100):
+            self.assertEqual((bear.power, bear.toughness), (5, 5))
+        self.assertEqual(len(calls), 2)
+
+        GA.cleanup_step(self.game)
+        self.assertEqual((bear.power, bear.toughness), (2, 2))
+
+    def test_layer_7b_before_7c_regardless_of_timestamp(self) -> None:
+        bear = creature("Bear", 2, 2)
+        self.p1.enter_battlefield(bear)
+        ST.pump(self.game, bear, 3, 3)
+        self.game.effects.add(FX.ContinuousEffect(FX.SET_PT, target=bear, power=0, toughness=1))
+        self.assertEqual((bear.power, bear.toughness), (3, 4))
+
+    def test_anthem_applies_to_own_creatures_while_on_battlefield(self) -> None:
+        mine, theirs = creature("Mine", 2, 2), creature("Theirs", 2, 2)
+        self.p1.enter_battlefield(mine)
+        self.p2.enter_battlefield(theirs)
+        anthem = Card(ANTHEM)
+        self.p1.enter_battlefield(anthem)
+        late = creature("Late", 1, 1)
+        self.p1.enter_battlefield(late)
+        self.assertEqual([mine.power, late.power, theirs.power], [3, 2, 2])
+
+        self.p1.move_card(anthem, "battlefield", "graveyard")
+        self.assertEqual([mine.power, late.power, theirs.power], [2, 1, 2])
+
+    def test_characteristic_defining_power_tracks_the_board(self) -> None:
+        warlord = Card(get_card_template_by_name("Ironroot Warlord"))
+        self.assertIsNone(warlord.power)  # printed "*"
+        self.p1.enter_battlefield(warlord)
+        self.assertEqual((warlord.power, warlord.toughness), (1, 5))
+        bear = creature("Bear", 2, 2)
+        self.p1.enter_battlefield(bear)
+        self.p2.enter_battlefield(creature("Theirs", 2, 2))
+        self.assertEqual(warlord.power, 2)
+        self.p1.move_card(bear, "battlefield", "graveyard")
+        self.assertEqual(warlord.power, 1)
+
+    def test_leaving_ends_effects_and_clone_is_independent(self) -> None:
+        bear = creature("Bear", 2, 2)
+        self.p1.enter_battlefield(bear)
+        ST.pump(self.game, bear, 1, 1)
+
+        copy = self.game.clone()
+        bear_copy = copy.players[0].battlefield[0]
+        self.assertIs(bear_copy.effects, copy.effects)
+        ST.pump(copy, bear_copy, 2, 2)
+        self.assertEqual((bear.power, bear_copy.power), (3, 5))
+
+        self.p1.move_card(bear, "battlefield", "graveyard")
+        self.assertEqual(bear.power, 2)
+        self.assertEqual(self.game.effects.effects, [])
+        self.assertEqual(bear_copy.power, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,10 +8,14 @@ from mtg_ai.env import (
     MTGEnv,
     make_default_env,
     ACTION_SIZE,
+    MAX_HAND,
+    MAX_BATTLEFIELD,
+    CARD_FEATURES,
     A_PLAY_BASE,
     A_CAST_BASE,
     A_ATTACK_NONE,
     A_ATTACK_ALL,
+    _encode_obs,
     _legal_mask,  # import mask helper to avoid stepping
 )
 
@@ -82,15 +86,16 @@ class EnvBasicsTest(unittest.TestCase):
         self.env = make_default_env(make_stub_decks)
 
     def test_reset_shapes_and_mask(self) -> None:
-        obs, info = self.env.reset()
-        self.assertIsInstance(obs, np.ndarray)
+        raw_obs, info = self.env.reset()
+        self.assertIsInstance(raw_obs, np.ndarray)
+        obs = cast(NDArray[np.float32], raw_obs)
         self.assertEqual(obs.shape, (48,))
         mask = cast(NDArray[np.bool_], info["legal_mask"])
         self.assertEqual(mask.shape, (ACTION_SIZE,))
         self.assertEqual(mask.dtype, np.bool_)
 
     def test_main1_land_mask_and_once_per_turn(self) -> None:
-        self.env.reset()
+        self.env.reset(seed=0)
         # reach MAIN1
         step_until_phase(self.env, "MAIN1")
         assert self.env.game is not None
@@ -183,6 +188,106 @@ class EnvBasicsTest(unittest.TestCase):
         self.assertFalse(mask[1:].any())
 
 
+class EnvResetPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.calls = 0
+
+        def builder() -> Tuple[StubDeck, StubDeck]:
+            self.calls += 1
+            return make_stub_decks()
+
+        self.env = make_default_env(builder)
+
+    def _all_cards(self) -> List[Card]:
+        assert self.env.p1 is not None
+        p = self.env.p1
+        return p.library + p.hand + p.battlefield + p.graveyard
+
+    def test_reset_reuses_card_instances(self) -> None:
+        self.env.reset(seed=1)
+        first_ids = {id(c) for c in self._all_cards()}
+        self.env.reset(seed=2)
+        self.assertEqual({id(c) for c in self._all_cards()}, first_ids)
+        self.assertEqual(self.calls, 1)
+
+    def test_reset_clears_runtime_fields(self) -> None:
+        self.env.reset(seed=1)
+        assert self.env.p1 is not None
+        for card in self.env.p1.library:
+            card.tapped = True
+            card.summoning_sick = False
+            card.zone = "graveyard"
+        self.env.reset(seed=1)
+        for card in self.env.p1.library:
+            self.assertFalse(card.tapped)
+            self.assertTrue(card.summoning_sick)
+            self.assertEqual(card.zone, "library")
+
+    def test_shuffle_seeds_follow_env_rng(self) -> None:
+        def order() -> List[str]:
+            assert self.env.p1 is not None
+            return [c.uuid for c in self.env.p1.hand + self.env.p1.library]
+
+        self.env.reset(seed=7)
+        a = order()
+        self.env.reset(seed=7)
+        self.assertEqual(order(), a)
+        self.env.reset(seed=8)
+        self.assertNotEqual(order(), a)
+
+    def test_reuse_disabled_rebuilds_decks(self) -> None:
+        env = make_default_env(make_stub_decks, reuse_decks=False)
+        env.reset(seed=1)
+        assert env.p1 is not None
+        before = {id(c) for c in env.p1.library + env.p1.hand}
+        env.reset(seed=1)
+        after = {id(c) for c in env.p1.library + env.p1.hand}
+        self.assertFalse(before & after)
+
+
+class EnvEntityObsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.env = make_default_env(make_stub_decks, obs_mode="entity")
+
+    def test_entity_obs_matches_space(self) -> None:
+        obs, _ = self.env.reset(seed=3)
+        assert isinstance(obs, dict)
+        self.assertTrue(self.env.observation_space.contains(obs))
+        self.assertEqual(obs["hand"].shape, (MAX_HAND, CARD_FEATURES))
+        self.assertEqual(obs["my_battlefield"].shape, (MAX_BATTLEFIELD, CARD_FEATURES))
+        self.assertEqual(int(obs["hand_mask"].sum()), 7)
+        self.assertFalse(obs["my_battlefield_mask"].any())
+
+    def test_entity_features_and_in_place_buffers(self) -> None:
+        obs, _ = self.env.reset(seed=3)
+        assert isinstance(obs, dict) and self.env.p1 is not None
+        hand_buf, summary_buf = obs["hand"], obs["summary"]
+        self.env.step(0)  # leave UNTAP so the bear stays tapped
+
+        bear = Card({**BEAR, "uuid": "B_field"})
+        bear.summoning_sick = False
+        bear.tapped = True
+        self.env.p1.battlefield.append(bear)
+
+        obs2, *_ = self.env.step(0)
+        assert isinstance(obs2, dict)
+        self.assertIs(obs2["hand"], hand_buf)  # no per-step allocation
+        self.assertIs(obs2["summary"], summary_buf)
+        assert self.env.game is not None
+        np.testing.assert_array_equal(summary_buf, _encode_obs(self.env.game, self.env.p1))
+        self.assertIs(_encode_obs(self.env.game, self.env.p1, out=summary_buf), summary_buf)
+        self.assertEqual(int(obs2["my_battlefield_mask"].sum()), 1)
+        row = obs2["my_battlefield"][0]
+        np.testing.assert_allclose(row[:2], [0.2, 0.2])  # P/T
+        self.assertEqual(row[3], 1.0)  # tapped
+        self.assertEqual(row[4], 0.0)  # not sick
+        self.assertEqual(row[6], 1.0)  # creature
+
+    def test_unknown_obs_mode_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            make_default_env(make_stub_decks, obs_mode="pixels")
+
+
 class EnvRewardSmokeTest(unittest.TestCase):
     def setUp(self) -> None:
         self.env = make_default_env(make_stub_decks)
@@ -0,0 +1,58 @@
+import unittest
+from typing import Any, Dict
+
+from mtg_ai.game_state import GameState, Player
+from mtg_ai.agents.simple import NaiveAgent
+from mtg_ai.evaluate import estimate_win_probability, wilson_interval
+from tests.test_env import make_stub_decks
+from tests.test_mcts import creature, library
+
+
+def opening(seed: int = 0) -> GameState:
+    deck_a, deck_b = make_stub_decks()
+    game = GameState(Player("A", deck_a.cards), Player("B", deck_b.cards))
+    game.start_game(shuffle_active_seed=seed, shuffle_opponent_seed=seed + 1)
+    return game
+
+
+class WilsonIntervalTest(unittest.TestCase):
+    def test_bounds(self) -> None:
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+        low, high = wilson_interval(50, 100)
+        self.assertLess(low, 0.5)
+        self.assertGreater(high, 0.5)
+        self.assertAlmostEqual(low + high, 1.0)
+        self.assertGreater(wilson_interval(20, 20)[0], 0.8)
+
+
+class EstimateWinProbabilityTest(unittest.TestCase):
+    def test_lethal_on_board_stops_early(self) -> None:
+        p1, p2 = Player("A", library(20)), Player("B", library(20))
+        game = GameState(p1, p2)
+        p1.battlefield.append(creature("Bear", 2, 2))
+        p2.life_total = 2
+        game.phase = "DECLARE_ATTACKERS"
+
+        est = estimate_win_probability(game, [NaiveAgent(), NaiveAgent()], min_rollouts=16, batch_size=8,
+                                       target_width=0.3, seed=0)
+        self.assertEqual(est.p, 1.0)
+        self.assertEqual(est.games, 16)
+        self.assertLess(est.width, 0.3)
+        self.assertEqual(p2.life_total, 2)
+        self.assertEqual(game.phase, "DECLARE_ATTACKERS")
+
+    def test_independent_seeds_and_worker_invariance(self) -> None:
+        game = opening()
+        agents = [NaiveAgent(), NaiveAgent(block=True)]
+        kwargs: Dict[str, Any] = dict(max_rollouts=24, min_rollouts=24, batch_size=6, seed=3, observer=0)
+        serial = estimate_win_probability(game, agents, **kwargs)
+        parallel = estimate_win_probability(game, agents, workers=2, **kwargs)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(serial.games, 24)
+        self.assertTrue(0.0 < serial.p < 1.0)
+        self.assertLessEqual(serial.low, serial.p)
+        self.assertLessEqual(serial.p, serial.high)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+
+from mtg_ai.goldfish import goldfish, simulate
+from mtg_ai.mulligan import DeckProfile, deck_order
+
+
+class GoldfishTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.profile = DeckProfile.from_counts(
+            {"Forest": 20, "Mountain": 10, "Grizzly Bears": 20, "Raging Goblin": 10}
+        )
+        self.index = {name: i for i, name in enumerate(self.profile.names)}
+
+    def order(self, *names: str, fill: str = "Forest") -> np.ndarray:
+        return np.array([self.index[n] for n in names] + [self.index[fill]] * (60 - len(names)))
+
+    def test_curve_of_bears(self) -> None:
+        # T2, T3 and 2x T4 bears, the fifth on T5: 2 + 4 + 8 + 10 damage on T3..T6
+        orders = self.order("Forest", "Forest", *["Grizzly Bears"] * 5)[None, :]
+        self.assertEqual(goldfish(self.profile, orders).kill_turn.tolist(), [6])
+
+    def test_haste_and_colors(self) -> None:
+        # Goblins need a Mountain: none until the first draw, then they attack the turn they're cast
+        orders = self.order(*["Forest"] * 2, *["Raging Goblin"] * 5, "Mountain", fill="Mountain")[None, :]
+        early = goldfish(self.profile, orders, max_turns=3)
+        self.assertEqual(early.kill_turn.tolist(), [0])
+        self.assertFalse(early.killed[0])
+        # Two goblins on T2, the other three on T3: 2 + 5 + 5 + 5 + 5 reaches 20 on T6
+        self.assertEqual(goldfish(self.profile, orders).kill_turn.tolist(), [6])
+
+    def test_games_are_independent_rows(self) -> None:
+        rng = np.random.default_rng(5)
+        orders = np.stack([rng.permutation(deck_order(self.profile)) for _ in range(8)])
+        together = goldfish(self.profile, orders).kill_turn
+        alone = [goldfish(self.profile, row[None, :]).kill_turn[0] for row in orders]
+        self.assertEqual(together.tolist(), alone)
+
+    def test_simulate_is_seeded_and_batch_independent(self) -> None:
+        a = simulate(self.profile, 3000, seed=2, batch=1000)
+        b = simulate(self.profile, 3000, seed=2)
+        self.assertEqual(a.kill_turn.tolist(), b.kill_turn.tolist())
+        self.assertEqual(a.summary()["kill_rate"], 1.0)
+        self.assertNotEqual(a.kill_turn.tolist(), simulate(self.profile, 3000, seed=3).kill_turn.tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import multiprocessing as mp
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from mtg_ai.agents.mlp import MLPPolicy, OBS_SIZE, PolicyAgent
+from mtg_ai.env import ACTION_SIZE
+from mtg_ai.game_state import GameState, Player
+from mtg_ai.inference_server import ClientHandle, InferenceServer, PolicyClient
+from tests.test_mcts import creature, library
+
+
+def batch(seed: int, n: int) -> Tuple[NDArray[np.float32], NDArray[np.bool_]]:
+    rng = np.random.default_rng(seed)
+    obs = rng.standard_normal((n, OBS_SIZE)).astype(np.float32)
+    masks = rng.random((n, ACTION_SIZE)) < 0.5
+    masks[:, 0] = True
+    return obs, masks
+
+
+def worker(handle: ClientHandle, seed: int, out: "mp.Queue[NDArray[np.int64]]") -> None:
+    client = PolicyClient(handle)
+    obs, masks = batch(seed, 10)
+    out.put(np.concatenate([client.act_batch(obs[i:i + 1], masks[i:i + 1]) for i in range(10)]))
+    client.close()
+
+
+class InferenceServerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "policy.npz"
+        self.policy = MLPPolicy.init(hidden=(32,), seed=0)
+        self.policy.save(self.path)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_workers_get_batched_policy_actions(self) -> None:
+        with InferenceServer(self.path, MLPPolicy.load, num_slots=8, max_batch=8, max_latency=0.005) as server:
+            queue: "mp.Queue[NDArray[np.int64]]" = mp.Queue()
+            procs = [mp.Process(target=worker, args=(server.client_handle(), seed, queue)) for seed in range(4)]
+            for p in procs:
+                p.start()
+            results = [queue.get(timeout=30) for _ in procs]
+            for p in procs:
+                p.join(timeout=30)
+            stats = server.stats()
+
+        expected = [self.policy.act_batch(*batch(seed, 10)) for seed in range(4)]
+        self.assertCountEqual([r.tolist() for r in results], [e.tolist() for e in expected])
+        self.assertEqual(stats["requests"], 40)
+        self.assertLess(stats["batches"], 40)
+
+    def test_chunking_agent_use_and_hot_reload(self) -> None:
+        with InferenceServer(self.path, MLPPolicy.load, num_slots=4, reload_interval=0.01) as server:
+            client = PolicyClient(server.client_handle(slots=3))
+            obs, masks = batch(7, 8)
+            np.testing.assert_array_equal(client.act_batch(obs, masks), self.policy.act_batch(obs, masks))
+
+            p1, p2 = Player("A", library(5)), Player("B", library(5))
+            game = GameState(p1, p2)
+            p1.battlefield.append(creature("Bear", 2, 2))
+            game.phase = "DECLARE_ATTACKERS"
+            attackers = PolicyAgent(client).choose_attackers(game)
+            self.assertTrue(set(attackers) <= set(p1.battlefield))
+
+            new = MLPPolicy.init(hidden=(32,), seed=1)
+            tmp = self.path.with_suffix(".tmp.npz")
+            new.save(tmp)
+            os.replace(tmp, self.path)
+            deadline = time.time() + 10
+            while server.stats()["reloads"] == 0 and time.time() < deadline:
+                time.sleep(0.01)
+            np.testing.assert_array_equal(client.act_batch(obs, masks), new.act_batch(obs, masks))
+            client.close()
+
+    def test_truncated_weights_keep_old_policy(self) -> None:
+        with InferenceServer(self.path, MLPPolicy.load, num_slots=2, reload_interval=0.01) as server:
+            client = PolicyClient(server.client_handle(), timeout=5.0)
+            obs, masks = batch(3, 2)
+            expected = self.policy.act_batch(obs, masks)
+            np.testing.assert_array_equal(client.act_batch(obs, masks), expected)  # initial load done
+
+            data = self.path.read_bytes()
+            for cut in (len(data) // 2, 0):  # BadZipFile, then EOFError
+                tmp = self.path.with_suffix(".tmp.npz")
+                tmp.write_bytes(data[:cut])
+                os.replace(tmp, self.path)
+                time.sleep(0.1)  # several reload checks
+                np.testing.assert_array_equal(client.act_batch(obs, masks), expected)
+            self.assertEqual(server.stats()["reloads"], 0)
+
+            new = MLPPolicy.init(hidden=(32,), seed=1)
+            tmp = self.path.with_suffix(".tmp.npz")
+            new.save(tmp)
+            os.replace(tmp, self.path)
+            deadline = time.time() + 10
+            while server.stats()["reloads"] == 0 and time.time() < deadline:
+                time.sleep(0.01)
+            np.testing.assert_array_equal(client.act_batch(obs, masks), new.act_batch(obs, masks))
+            client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import random
+import unittest
+from unittest import mock
+from collections import Counter
+
+from mtg_ai.card import Card
+from mtg_ai.game_state import GameState, Player
+from mtg_ai.agents.ismcts import ISMCTSAgent
+from mtg_ai.rollout import determinize
+from tests.test_mcts import creature, library
+
+
+def mixed_library(prefix: str) -> list:
+    cards = library(10)
+    cards += [creature(f"{prefix}{i}", 2, 2) for i in range(10)]
+    for c in cards:
+        c.summoning_sick = True
+    return cards
+
+
+class DeterminizeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.p1 = Player("A", mixed_library("a"))
+        self.p2 = Player("B", mixed_library("b"))
+        self.game = GameState(self.p1, self.p2)
+        self.game.start_game(shuffle_active_seed=1, shuffle_opponent_seed=2)
+
+    def test_preserves_public_information(self) -> None:
+        sim = determinize(self.game, random.Random(0), observer=0)
+        me, opp = sim.players
+        self.assertEqual([c.name for c in me.hand], [c.name for c in self.p1.hand])
+        self.assertEqual(len(opp.hand), len(self.p2.hand))
+        self.assertEqual(len(opp.library), len(self.p2.library))
+        self.assertEqual(
+            Counter(c.name for c in opp.hand + opp.library),
+            Counter(c.name for c in self.p2.hand + self.p2.library),
+        )
+        self.assertTrue(all(c.zone == "hand" for c in opp.hand))
+        # the real game is untouched
+        self.assertEqual(len(self.p2.hand), 7)
+
+    def test_samples_vary_and_ignore_true_hidden_layout(self) -> None:
+        hands = {tuple(c.name for c in determinize(self.game, random.Random(s), 0).players[1].hand) for s in range(5)}
+        self.assertGreater(len(hands), 1)
+
+        # moving cards between the opponent's hand and library changes nothing
+        other = self.game.clone()
+        opp = other.players[1]
+        opp.hand, opp.library = opp.library[:7], opp.hand + opp.library[7:]
+        a = determinize(self.game, random.Random(3), 0).players[1].hand
+        b = determinize(other, random.Random(3), 0).players[1].hand
+        self.assertEqual([c.name for c in a], [c.name for c in b])
+
+    def test_no_new_cards_built(self) -> None:
+        with mock.patch.object(Card, "__init__", side_effect=AssertionError("Card constructed")):
+            determinize(self.game, random.Random(0), observer=1)
+
+
+class ISMCTSAgentTest(unittest.TestCase):
+    def test_finds_lethal_and_is_blind_to_hidden_hand(self) -> None:
+        def build(swap: bool) -> GameState:
+            p1, p2 = Player("A", library(20)), Player("B", mixed_library("b"))
+            game = GameState(p1, p2)
+            p2.hand = [p2.library.pop() for _ in range(5)]
+            if swap:
+                p2.hand, p2.library = p2.library[:5], p2.hand + p2.library[5:]
+            p1.battlefield.extend([creature("Bear", 2, 2), creature("Wall", 0, 4)])
+            p2.life_total = 2
+            game.phase = "DECLARE_ATTACKERS"
+            return game
+
+        results = []
+        for swap in (False, True):
+            game = build(swap)
+            agent = ISMCTSAgent(iterations=150, seed=0)
+            attackers = agent.choose_attackers(game)
+            self.assertIn(game.players[0].battlefield[0], attackers)
+            results.append([c.name for c in attackers])
+        self.assertEqual(results[0], results[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+from typing import List
+
+from mtg_ai.card import Card
+from mtg_ai.card_db import get_card_template_by_name
+from mtg_ai.game_state import GameState, Player
+from mtg_ai import game_actions as GA
+from mtg_ai import keywords as KW
+
+
+def creature(name: str, p: int, t: int, text: str = "") -> Card:
+    c = Card({"name": name, "uuid": name, "types": ["Creature"], "power": str(p), "toughness": str(t), "text": text})
+    c.summoning_sick = False
+    return c
+
+
+class KeywordParsingTest(unittest.TestCase):
+    def test_mtgjson_keywords_and_text_lines(self) -> None:
+        self.assertEqual(Card(get_card_template_by_name("Raging Goblin")).keywords, KW.HASTE)
+        self.assertEqual(Card(get_card_template_by_name("Goblin Raider")).keywords, 0)  # "can't block" is not defender
+        c = creature("X", 1, 1, "Flying, vigilance\nFirst strike (This deals combat damage first.)")
+        self.assertEqual(c.keywords, KW.FLYING | KW.VIGILANCE | KW.FIRST_STRIKE)
+        self.assertEqual(KW.keyword_names(c.keywords), ["flying", "vigilance", "first strike"])
+        self.assertEqual(creature("Y", 1, 1, "Flying creatures can't block this.").keywords, 0)
+
+    def test_parsed_once_per_template(self) -> None:
+        template = get_card_template_by_name("Vulshok Berserker")
+        Card(template)
+        before = KW.parse_keywords.cache_info().misses
+        for _ in range(10):
+            Card(template).copy()
+        self.assertEqual(KW.parse_keywords.cache_info().misses, before)
+
+
+class KeywordCombatTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.p1, self.p2 = Player("A", []), Player("B", [])
+        self.game = GameState(self.p1, self.p2)
+
+    def fight(self, attacker: Card, blockers: List[Card]) -> None:
+        self.p1.battlefield.append(attacker)
+        self.p2.battlefield.extend(blockers)
+        GA.declare_attackers(self.game, [attacker])
+        GA.declare_blockers(self.game, {attacker: blockers} if blockers else {})
+        GA.resolve_combat_damage(self.game)
+
+    def test_haste_defender_vigilance(self) -> None:
+        hasty = creature("Hasty", 1, 1, "Haste")
+        wall = creature("Wall", 0, 4, "Defender")
+        sick = creature("Sick", 2, 2)
+        hasty.summoning_sick = sick.summoning_sick = True
+        self.p1.battlefield.extend([hasty, wall, sick])
+        self.assertEqual(GA.get_attackers(self.p1), [hasty])
+
+        watcher = creature("Watcher", 2, 2, "Vigilance")
+        self.p1.battlefield.append(watcher)
+        GA.declare_attackers(self.game, [watcher, hasty])
+        self.assertEqual(self.game.attackers, [watcher, hasty])
+        self.assertFalse(watcher.tapped)
+        self.assertTrue(hasty.tapped)
+
+    def test_flying_needs_flying_or_reach(self) -> None:
+        bird = creature("Bird", 1, 1, "Flying")
+        ground, spider = creature("Ground", 2, 2), creature("Spider", 1, 3, "Reach")
+        self.assertFalse(GA.can_block(self.game, ground, bird))
+        self.assertTrue(GA.can_block(self.game, spider, bird))
+        self.p1.battlefield.append(bird)
+        self.p2.battlefield.append(ground)
+        GA.declare_attackers(self.game, [bird])
+        with self.assertRaises(ValueError):
+            GA.declare_blockers(self.game, {bird: [ground]})
+
+    def test_first_strike_kills_before_regular_damage(self) -> None:
+        knight, bear = creature("Knight", 2, 2, "First strike"), creature("Bear", 2, 2)
+        self.fight(knight, [bear])
+        self.assertIn(knight, self.p1.battlefield)
+        self.assertIn(bear, self.p2.graveyard)
+
+    def test_deathtouch_and_trample(self) -> None:
+        snake, wurm = creature("Snake", 1, 1, "Deathtouch"), creature("Wurm", 6, 6)
+        self.fight(snake, [wurm])
+        self.assertIn(wurm, self.p2.graveyard)
+        self.assertIn(snake, self.p1.graveyard)
+
+        trampler, chump = creature("Trampler", 5, 5, "Trample"), creature("Chump", 1, 2)
+        self.p1.graveyard.clear()
+        self.fight(trampler, [chump])
+        self.assertEqual(self.p2.life_total, 17)
+        self.assertIn(chump, self.p2.graveyard)
+
+    def test_plain_combat_unchanged(self) -> None:
+        ogre, b1, b2 = creature("Ogre", 4, 4), creature("B1", 3, 3), creature("B2", 2, 2)
+        self.fight(ogre, [b1, b2])
+        self.assertIn(b1, self.p2.graveyard)
+        self.assertIn(b2, self.p2.battlefield)
+        self.assertIn(ogre, self.p1.graveyard)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from typing import List
+
+from mtg_ai.card import Card
+from mtg_ai.game_state import GameState, Player
+from mtg_ai.agents.mcts import MCTSAgent, legal_actions
+from mtg_ai.agents.simple import NaiveAgent
+from mtg_ai.rollout import play_out
+from mtg_ai import game_actions as GA
+
+FOREST = {"name": "Forest", "uuid": "F", "types": ["Land"], "subtypes": ["Forest"]}
+
+
+def creature(name: str, p: int, t: int, cost: str = "{1}{G}") -> Card:
+    c = Card({"name": name, "uuid": name, "types": ["Creature"], "manaCost": cost,
+              "power": str(p), "toughness": str(t)})
+    c.summoning_sick = False
+    return c
+
+
+def library(n: int) -> List[Card]:
+    return [Card({**FOREST, "uuid": f"F{i}"}) for i in range(n)]
+
+
+class GameCloneTest(unittest.TestCase):
+    def test_clone_is_independent_and_remaps_combat(self) -> None:
+        p1, p2 = Player("A", library(5)), Player("B", library(5))
+        game = GameState(p1, p2)
+        atk, blk = creature("Atk", 2, 2), creature("Blk", 2, 2)
+        p1.battlefield.append(atk)
+        p2.battlefield.append(blk)
+        game.phase = "DECLARE_ATTACKERS"
+        GA.declare_attackers(game, [atk])
+        GA.declare_blockers(game, {atk: [blk]})
+
+        sim = game.clone()
+        self.assertIsNot(sim.players[0].battlefield[0], atk)
+        self.assertIs(sim.attackers[0], sim.players[0].battlefield[0])
+        self.assertIs(sim.blocking_assignments[sim.attackers[0]][0], sim.players[1].battlefield[0])
+
+        GA.resolve_combat_damage(sim)
+        sim.players[0].draw_card(sim)
+        self.assertIn(atk, p1.battlefield)
+        self.assertEqual(len(p1.library), 5)
+        self.assertEqual(game.attackers, [atk])
+
+
+class MCTSAgentTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.p1, self.p2 = Player("A", library(20)), Player("B", library(20))
+        self.game = GameState(self.p1, self.p2)
+
+    def test_finds_lethal_attack(self) -> None:
+        self.p1.battlefield.extend([creature("Bear", 2, 2), creature("Wall", 0, 4)])
+        self.p2.life_total = 2
+        self.game.phase = "DECLARE_ATTACKERS"
+        agent = MCTSAgent(iterations=200, seed=0)
+        attackers = agent.choose_attackers(self.game)
+        self.assertIn(self.p1.battlefield[0], attackers)
+
+    def test_blocks_with_bigger_creature(self) -> None:
+        atk = creature("Bear", 2, 2)
+        self.p1.battlefield.append(atk)
+        self.p2.battlefield.append(creature("Wall", 1, 4))
+        self.game.phase = "DECLARE_ATTACKERS"
+        GA.declare_attackers(self.game, [atk])
+        self.game.phase = "DECLARE_BLOCKERS"
+        blocks = MCTSAgent(iterations=200, seed=0).choose_blockers(self.game)
+        self.assertEqual(blocks, {atk: [self.p2.battlefield[0]]})
+
+    def test_tree_reused_between_casts_and_attacks(self) -> None:
+        self.p1.battlefield.extend([Card({**FOREST, "uuid": "f1"}), Card({**FOREST, "uuid": "f2"})])
+        self.p1.battlefield.append(creature("Bear", 2, 2))
+        self.p1.hand.append(creature("Cub", 1, 1))
+        self.game.phase = "MAIN1"
+        agent = MCTSAgent(iterations=300, seed=0)
+        naive = NaiveAgent()
+        # drive the real game with the agent until its attack decision
+        from mtg_ai.game_controller import step_game
+        step_game(self.game, agent, naive)             # MAIN1: cast decision
+        while self.game.phase != "DECLARE_ATTACKERS":
+            step_game(self.game, agent, naive)
+        agent.choose_attackers(self.game)
+        self.assertTrue(agent.last_reused)
+
+    def test_single_candidate_skips_search(self) -> None:
+        self.game.phase = "MAIN1"
+        agent = MCTSAgent(iterations=100)
+        self.assertEqual(agent.choose_casts(self.game), [])
+        self.assertEqual(agent.last_iterations, 0)
+        self.assertEqual(legal_actions(self.game, "attack", 0, 12), [()])
+
+    def test_root_parallel_search(self) -> None:
+        self.p1.battlefield.extend([creature("Bear", 2, 2), creature("Ogre", 3, 3)])
+        self.p2.battlefield.append(creature("Wall", 0, 5))
+        self.game.phase = "DECLARE_ATTACKERS"
+        agent = MCTSAgent(iterations=120, workers=2, seed=1)
+        try:
+            attackers = agent.choose_attackers(self.game)
+        finally:
+            agent.close()
+        self.assertTrue(set(attackers) <= set(self.p1.battlefield))
+        self.assertGreaterEqual(agent.last_iterations, 120)
+
+    def test_plays_a_full_game(self) -> None:
+        bears = [creature(f"B{i}", 2, 2) for i in range(16)]
+        for b in bears:
+            b.summoning_sick = True
+        deck_a = library(24) + bears
+        deck_b = library(24) + [creature(f"R{i}", 2, 2) for i in range(16)]
+        game = GameState(Player("A", deck_a), Player("B", deck_b))
+        game.start_game(shuffle_active_seed=1, shuffle_opponent_seed=2)
+        agent = MCTSAgent(iterations=20, seed=0)
+        play_out(game, [agent, NaiveAgent()], max_steps=2000)
+        self.assertTrue(game.is_game_over())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from mtg_ai.game_state import GameState, Player
+from mtg_ai.game_controller import step_game
+from mtg_ai.agents.mlp import MLPPolicy, PolicyAgent, OBS_SIZE
+from mtg_ai.agents.mcts import MCTSAgent, SearchParams
+from mtg_ai.env import ACTION_SIZE, A_PASS
+from tests.test_env import make_stub_decks
+from tests.test_mcts import creature, library
+
+
+def new_game(seed: int) -> GameState:
+    deck_a, deck_b = make_stub_decks()
+    game = GameState(Player("A", deck_a.cards), Player("B", deck_b.cards))
+    game.start_game(shuffle_active_seed=seed, shuffle_opponent_seed=seed + 100)
+    return game
+
+
+class MLPPolicyTest(unittest.TestCase):
+    def test_masked_actions_and_save_load(self) -> None:
+        policy = MLPPolicy.init(hidden=(16,), seed=0)
+        obs = np.random.default_rng(0).standard_normal((5, OBS_SIZE)).astype(np.float32)
+        masks = np.zeros((5, ACTION_SIZE), dtype=np.bool_)
+        masks[:, A_PASS] = True
+        masks[np.arange(5), [3, 7, 11, 21, 25]] = True
+
+        for greedy in (True, False):
+            actions = policy.act_batch(obs, masks, greedy=greedy, rng=np.random.default_rng(1))
+            self.assertTrue(masks[np.arange(5), actions].all())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "policy.npz"
+            policy.save(path)
+            loaded = MLPPolicy.load(path)
+        np.testing.assert_array_equal(loaded.logits(obs), policy.logits(obs))
+
+    def test_sampling_round_off_picks_last_legal_action(self) -> None:
+        policy = MLPPolicy.init(hidden=(16,), seed=0)
+        obs = np.random.default_rng(0).standard_normal((4, OBS_SIZE)).astype(np.float32)
+        masks = np.zeros((4, ACTION_SIZE), dtype=np.bool_)
+        masks[:, A_PASS] = True
+        masks[np.arange(4), [5, 13, 24, ACTION_SIZE - 1]] = True
+
+        # u above the final cumsum (float round-off): still legal, the last legal action per row
+        rng = mock.Mock(spec=np.random.Generator)
+        rng.random.return_value = np.full((4, 1), 1.5)
+        actions = policy.act_batch(obs, masks, greedy=False, rng=rng)
+        self.assertEqual(actions.tolist(), [5, 13, 24, ACTION_SIZE - 1])
+
+
+class PolicyAgentTest(unittest.TestCase):
+    def test_prepare_batches_decisions_across_games(self) -> None:
+        agent = PolicyAgent(MLPPolicy.init(seed=0), greedy=False, seed=0)
+        games = [new_game(i) for i in range(6)]
+        for _ in range(120):
+            live = [g for g in games if not g.is_game_over()]
+            agent.prepare(live)
+            for game in live:
+                step_game(game, agent, agent)
+
+        self.assertEqual(agent.single_decisions, 0)
+        self.assertGreater(agent.batched_decisions, 6 * 10)
+        self.assertTrue(any(g.players[0].battlefield for g in games))
+
+    def test_unprepared_call_and_stale_queue_fall_back_to_single_row(self) -> None:
+        agent = PolicyAgent(MLPPolicy.init(seed=1))
+        p1, p2 = Player("A", library(5)), Player("B", library(5))
+        game = GameState(p1, p2)
+        p1.battlefield.append(creature("Bear", 2, 2))
+        game.phase = "DECLARE_ATTACKERS"
+        agent.prepare([game])
+        game.turn_number += 1  # queued decision no longer matches
+        attackers = agent.choose_attackers(game)
+        self.assertEqual(agent.single_decisions, 1)
+        self.assertTrue(set(attackers) <= set(p1.battlefield))
+
+    def test_usable_as_search_rollout_policy(self) -> None:
+        rollout = PolicyAgent(MLPPolicy.init(seed=2), block=True)
+        agent = MCTSAgent(iterations=40, seed=0, params=SearchParams(rollout_policy=rollout))
+        p1, p2 = Player("A", library(20)), Player("B", library(20))
+        game = GameState(p1, p2)
+        p1.battlefield.extend([creature("Bear", 2, 2), creature("Ogre", 3, 3)])
+        p2.battlefield.append(creature("Wall", 0, 4))
+        game.phase = "DECLARE_ATTACKERS"
+        agent.choose_attackers(game)
+        self.assertEqual(agent.last_iterations, 40)
+        self.assertGreater(rollout.single_decisions, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
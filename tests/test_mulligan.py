@@ -0,0 +1,111 @@
+import unittest
+from typing import List, Tuple
+
+import numpy as np
+
+from mtg_ai.card import Card
+from mtg_ai.card_db import get_card_template_by_name
+from mtg_ai.game_state import GameState, Player
+from mtg_ai.agents.simple import NaiveAgent
+from mtg_ai.deck_builder import Deck
+from mtg_ai.tournament import play_match
+from mtg_ai import mulligan as MU
+from tests.test_mcts import creature, library
+
+COUNTS = {"Forest": 17, "Mountain": 7, "Grizzly Bears": 20, "Craw Wurm": 8, "Giant Growth": 8}
+
+
+def cards(*names: str) -> List[Card]:
+    return [Card(get_card_template_by_name(n)) for n in names]
+
+
+class MulliganOnce(NaiveAgent):
+    def __init__(self) -> None:
+        self.bottomed: List[Card] = []
+
+    def keep_hand(self, game: GameState, seat: int) -> bool:
+        return game.players[seat].mulligans >= 1
+
+    def choose_bottom(self, game: GameState, seat: int, count: int) -> List[Card]:
+        self.bottomed = game.players[seat].hand[:count]
+        return self.bottomed
+
+
+class EvaluatorTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.profile = MU.DeckProfile.from_counts(COUNTS)
+
+    def hand(self, *names: str) -> np.ndarray:
+        return self.profile.hand_counts(cards(*names))[None, :]
+
+    def test_sampled_hands_are_hands_from_the_deck(self) -> None:
+        hands = MU.sample_hands(self.profile, 5000, rng=np.random.default_rng(0))
+        self.assertEqual(hands.shape, (5000, len(COUNTS)))
+        self.assertTrue((hands.sum(axis=1) == 7).all())
+        self.assertTrue((hands <= self.profile.counts).all())
+        # Hypergeometric mean: 7 * 24 / 60 lands
+        lands = hands[:, self.profile.is_land].sum(axis=1)
+        self.assertAlmostEqual(lands.mean(), 2.8, delta=0.1)
+
+    def test_lands_mana_value_and_colors(self) -> None:
+        good = MU.evaluate_hands(self.profile, self.hand(
+            "Forest", "Forest", "Mountain", "Grizzly Bears", "Craw Wurm", "Giant Growth", "Giant Growth"))
+        self.assertEqual((good.lands[0], good.castable[0], good.curve_plays[0]), (3, 3, 2))
+        self.assertTrue(good.keepable[0])
+
+        off_color = MU.evaluate_hands(self.profile, self.hand(
+            "Mountain", "Mountain", "Mountain", "Grizzly Bears", "Craw Wurm", "Giant Growth", "Giant Growth"))
+        self.assertEqual(off_color.castable[0], 0)
+        self.assertFalse(off_color.keepable[0])
+
+        flood = MU.evaluate_hands(self.profile, self.hand(*["Forest"] * 7))
+        self.assertFalse(flood.keepable[0])
+        self.assertLess(flood.score[0], good.score[0])
+
+    def test_analyze_deck(self) -> None:
+        stats = MU.analyze_deck(self.profile, samples=2000, seed=1)
+        self.assertAlmostEqual(sum(stats[f"p_{k}_lands"] for k in range(8)), 1.0)
+        self.assertGreater(stats["keep_rate"], 0.5)
+
+
+class LondonMulliganTest(unittest.TestCase):
+    def setUp(self) -> None:
+        deck = cards(*[name for name, n in COUNTS.items() for _ in range(n)])
+        self.p1, self.p2 = Player("A", deck), Player("B", cards(*["Forest"] * 60))
+        self.game = GameState(self.p1, self.p2)
+        self.game.start_game(shuffle_active_seed=3, shuffle_opponent_seed=4)
+
+    def test_agent_hook_and_bottom(self) -> None:
+        agent = MulliganOnce()
+        MU.london_mulligan(self.game, [agent, NaiveAgent()], seed=0)
+        self.assertEqual(self.p1.mulligans, 1)
+        self.assertEqual(len(self.p1.hand), 6)
+        self.assertEqual(len(self.p1.library), 54)
+        self.assertEqual(self.p1.library[-1:], agent.bottomed)
+
+    def test_default_policy_mulligans_unkeepable_hands(self) -> None:
+        MU.london_mulligan(self.game, [NaiveAgent(), NaiveAgent()], seed=0)
+        # All lands: mulligan to five, then keep anything
+        self.assertEqual(self.p2.mulligans, 2)
+        self.assertEqual(len(self.p2.hand), 5)
+        self.assertEqual(len(self.p1.hand) + len(self.p1.library), 60)
+
+    def test_bottom_must_come_from_hand(self) -> None:
+        with self.assertRaises(ValueError):
+            MU.put_on_bottom(self.game, 0, [self.p1.library[0]])
+        with self.assertRaises(ValueError):
+            MU.put_on_bottom(self.game, 0, [self.p1.hand[0]] * 2)
+
+    def test_cards_outside_the_db(self) -> None:
+        def decks() -> Tuple[Deck, Deck]:
+            return (Deck("A", library(24) + [creature("Bear", 2, 2) for _ in range(36)]),
+                    Deck("B", library(24) + [creature("Ogre", 3, 3, "{2}{R}") for _ in range(36)]))
+
+        profile = MU.DeckProfile.from_cards(decks()[1].cards)
+        self.assertEqual(profile.mana_value[profile.names.index("Ogre")], 3)
+        result = play_match([NaiveAgent(), NaiveAgent()], decks, games=2, seed=0)
+        self.assertEqual(result.games, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
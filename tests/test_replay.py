@@ -0,0 +1,87 @@
+import unittest
+import numpy as np
+
+from mtg_ai.env import make_default_env, ACTION_SIZE
+from mtg_ai.replay import SumTree, PrioritizedReplayBuffer
+from mtg_ai.selfplay_env import SelfPlayVectorEnv
+from tests.test_env import make_stub_decks
+
+
+class SumTreeTest(unittest.TestCase):
+    def test_total_and_find(self) -> None:
+        tree = SumTree(5)
+        tree.update(np.arange(5), np.array([1.0, 0.0, 2.0, 3.0, 4.0]))
+        self.assertAlmostEqual(tree.total, 10.0)
+        found = tree.find(np.array([0.5, 1.5, 2.9, 3.1, 5.9, 6.1, 9.99]))
+        np.testing.assert_array_equal(found, [0, 2, 2, 3, 3, 4, 4])
+
+    def test_update_overwrites(self) -> None:
+        tree = SumTree(3)
+        tree.update(np.array([0, 1, 2]), np.array([1.0, 1.0, 1.0]))
+        tree.update(np.array([1]), np.array([5.0]))
+        self.assertAlmostEqual(tree.total, 7.0)
+        np.testing.assert_allclose(tree.get(np.array([0, 1, 2])), [1.0, 5.0, 1.0])
+
+
+class PrioritizedReplayBufferTest(unittest.TestCase):
+    def setUp(self) -> None:
+        env = make_default_env(make_stub_decks)
+        self.buf = PrioritizedReplayBuffer(8, env.observation_space, env.action_space, seed=0)
+
+    def _add(self, n: int, start: int = 0) -> np.ndarray:
+        obs = np.tile(np.arange(start, start + n, dtype=np.float32)[:, None], (1, 48))
+        masks = np.zeros((n, ACTION_SIZE), dtype=np.bool_)
+        masks[:, 0] = True
+        return self.buf.add_batch(obs, np.arange(start, start + n), np.ones(n), obs, np.zeros(n, bool), masks)
+
+    def test_ring_wraparound(self) -> None:
+        self._add(6)
+        idx = self._add(5, start=6)
+        np.testing.assert_array_equal(idx, [6, 7, 0, 1, 2])
+        self.assertEqual(len(self.buf), 8)
+        self.assertEqual(sorted(self.buf.actions.tolist()), [3, 4, 5, 6, 7, 8, 9, 10])
+
+    def test_sampling_follows_priorities(self) -> None:
+        idx = self._add(8)
+        td = np.full(8, 1e-3)
+        td[3] = 10.0
+        self.buf.update_priorities(idx, td)
+        batch, sampled, weights = self.buf.sample(64)
+        self.assertGreater(np.mean(sampled == 3), 0.8)
+        self.assertEqual(batch["obs"].shape, (64, 48))
+        self.assertTrue(batch["next_legal_masks"][:, 0].all())
+        self.assertAlmostEqual(float(weights.max()), 1.0)
+        # the over-sampled transition gets the smallest correction weight
+        self.assertAlmostEqual(float(weights[sampled == 3].max()), float(weights.min()), places=5)
+
+    def test_empty_priority_update_is_a_no_op(self) -> None:
+        self._add(4)
+        total = self.buf.tree.total
+        self.buf.update_priorities(np.array([], dtype=np.int64), np.array([]))
+        self.assertEqual(self.buf.tree.total, total)
+
+    def test_batched_insert_from_vector_env(self) -> None:
+        venv = SelfPlayVectorEnv(make_stub_decks, num_envs=4, seed=0)
+        buf = PrioritizedReplayBuffer(64, venv.single_observation_space, venv.single_action_space, seed=0)
+        obs, info = venv.reset()
+        for _ in range(10):
+            prev = obs.copy()
+            obs, rew, term, trunc, info = venv.step(np.zeros(4, dtype=np.int64))
+            buf.add_batch(prev, np.zeros(4), rew, obs, term | trunc, info["legal_mask"])
+        self.assertEqual(len(buf), 40)
+        batch, _, _ = buf.sample(16)
+        self.assertEqual(batch["next_legal_masks"].shape, (16, ACTION_SIZE))
+
+    def test_dict_observation_space(self) -> None:
+        env = make_default_env(make_stub_decks, obs_mode="entity")
+        buf = PrioritizedReplayBuffer(4, env.observation_space, env.action_space)
+        obs, info = env.reset(seed=0)
+        assert isinstance(obs, dict)
+        idx = buf.add(obs, 0, 0.0, obs, False, info["legal_mask"])
+        batch, _, _ = buf.sample(2)
+        np.testing.assert_array_equal(buf.obs["hand"][idx], obs["hand"])
+        self.assertEqual(batch["obs"]["hand_mask"].shape, (2, 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import json
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+from unittest import mock
+
+from mtg_ai import rules_compiler as RC
+from mtg_ai.card_db import build_name_index
+from mtg_ai.triggers import ENTERS_BATTLEFIELD
+
+
+class RulesCompilerTest(unittest.TestCase):
+    def test_whole_pool_compiles(self) -> None:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(RC.unsupported_cards(), {})
+
+    def test_spell_targets_and_effects(self) -> None:
+        (ability,) = RC.get_abilities("Pillage").abilities
+        self.assertEqual(ability.kind, "spell")
+        self.assertEqual(ability.targets, [["artifact", "land"]])
+        self.assertEqual([e.op for e in ability.effects], ["destroy", "cant_regenerate"])
+
+        (growth,) = RC.get_abilities("Giant Growth").abilities
+        self.assertEqual(growth.effects[0].args, {"power": 3, "toughness": 3, "duration": "end_of_turn"})
+
+    def test_triggered_and_activated(self) -> None:
+        (stoker,) = RC.get_abilities("Coal Stoker").abilities
+        self.assertEqual((stoker.trigger, stoker.trigger_filter), (ENTERS_BATTLEFIELD, "self"))
+        self.assertEqual(stoker.condition, "cast_from_hand")
+        self.assertEqual(stoker.effects[0].args, {"mana": "{R}{R}{R}"})
+
+        (baloth,) = RC.get_abilities("Territorial Baloth").abilities
+        self.assertEqual(baloth.trigger_filter, "land_you_control")
+
+        cda, token = RC.get_abilities("Ironroot Warlord").abilities
+        self.assertEqual(cda.effects[0].op, "set_power")
+        self.assertEqual(token.cost, "{3}{G}{W}")
+        self.assertEqual(token.effects[0].args["subtype"], "Soldier")
+
+        (tap,) = RC.get_abilities("Forest").abilities
+        self.assertEqual((tap.cost, tap.effects[0].args["mana"]), ("{T}", "{G}"))
+
+    def test_keywords_and_vanilla(self) -> None:
+        (haste,) = RC.get_abilities("Raging Goblin").abilities
+        self.assertEqual((haste.kind, haste.keywords), ("keyword", ["haste"]))
+        self.assertEqual(RC.get_abilities("Grizzly Bears").abilities, [])
+
+    def test_unknown_text_is_reported_not_vanilla(self) -> None:
+        card = RC.compile_card({
+            "name": "Odd Sage", "types": ["Creature"],
+            "text": "Flying\nWhen Odd Sage enters, draw a card.",
+        })
+        self.assertFalse(card.supported)
+        self.assertEqual([a.kind for a in card.abilities], ["keyword"])
+        self.assertEqual(card.unsupported, ["When this creature enters, draw a card."])
+
+    def test_disk_cache_recompiles_only_changed_text(self) -> None:
+        templates = list(build_name_index().values())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "pool.abilities.json"
+            first = RC.compile_pool(templates, path)
+            self.assertEqual(json.loads(path.read_text())["compiler"], RC.COMPILER_VERSION)
+
+            with mock.patch.object(RC, "compile_card", wraps=RC.compile_card) as compiled:
+                second = RC.compile_pool(templates, path)
+                self.assertEqual(compiled.call_count, 0)
+                self.assertEqual(second, first)
+
+                changed = [dict(t, text="Vigilance") if t["name"] == "Gray Ogre" else t for t in templates]
+                third = RC.compile_pool(changed, path)
+                self.assertEqual(compiled.call_count, 1)
+                self.assertEqual(third["gray ogre"].abilities[0].keywords, ["vigilance"])
+
+    def test_unwritable_cache_still_compiles(self) -> None:
+        templates = list(build_name_index().values())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "missing" / "pool.abilities.json"
+            with self.assertWarns(UserWarning):
+                compiled = RC.compile_pool(templates, path)
+            self.assertEqual(len(compiled), len(templates))
+            self.assertFalse(path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from unittest import mock
+
+from mtg_ai.card import Card
+from mtg_ai.agents.simple import NaiveAgent
+from mtg_ai.game_state import GameState, Player
+from mtg_ai import effects as FX
+from mtg_ai import game_actions as GA
+from mtg_ai import sba as SBA
+from mtg_ai import stack as ST
+from tests.test_effects import ANTHEM
+from tests.test_mcts import creature
+
+
+class StateBasedActionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.p1, self.p2 = Player("A", []), Player("B", [])
+        self.game = GameState(self.p1, self.p2)
+        SBA.check_state_based_actions(self.game)
+
+    def tearDown(self) -> None:
+        FX.STATIC_ABILITIES.pop("Test Anthem", None)
+
+    def test_damage_accumulates_until_cleanup(self) -> None:
+        bear = creature("Bear", 2, 2)
+        self.p1.enter_battlefield(bear)
+        SBA.deal_damage(self.game, bear, 1)
+        self.assertEqual(SBA.check_state_based_actions(self.game), [])
+        GA.cleanup_step(self.game)
+        self.assertEqual(bear.damage, 0)
+
+        SBA.deal_damage(self.game, bear, 1)
+        SBA.deal_damage(self.game, bear, 1)
+        self.assertEqual(SBA.check_state_based_actions(self.game), [bear])
+        self.assertEqual(self.p1.graveyard, [bear])
+        self.assertEqual(bear.damage, 0)
+
+    def test_deathtouch_damage_is_lethal(self) -> None:
+        wurm = creature("Wurm", 6, 4)
+        self.p2.enter_battlefield(wurm)
+        SBA.deal_damage(self.game, wurm, 1, deathtouch=True)
+        self.assertEqual(SBA.check_state_based_actions(self.game), [wurm])
+
+    def test_zero_toughness(self) -> None:
+        bear = creature("Bear", 2, 2)
+        self.p1.enter_battlefield(bear)
+        SBA.check_state_based_actions(self.game)
+        self.game.effects.add(FX.ContinuousEffect(FX.MODIFY_PT, target=bear, power=-2, toughness=-2))
+        self.assertEqual(self.game.sba_dirty, {bear: None})
+        ST.run_priority(self.game, NaiveAgent(), NaiveAgent())
+        self.assertEqual(self.p1.graveyard, [bear])
+
+    def test_losing_an_anthem_rechecks_every_creature(self) -> None:
+        FX.STATIC_ABILITIES["Test Anthem"] = FX.anthem(1, 1)
+        anthem = Card(ANTHEM)
+        self.p1.enter_battlefield(anthem)
+        elf = creature("Elf", 1, 1)
+        self.p1.enter_battlefield(elf)
+        SBA.deal_damage(self.game, elf, 1)
+        self.assertEqual(SBA.check_state_based_actions(self.game), [])
+
+        self.p1.move_card(anthem, "battlefield", "graveyard")
+        self.assertTrue(self.game.sba_check_all)
+        self.assertEqual(SBA.check_state_based_actions(self.game), [elf])
+
+    def test_check_cost_follows_what_changed(self) -> None:
+        board = [creature(f"C{i}", 2, 2) for i in range(200)]
+        for card in board:
+            self.p1.enter_battlefield(card)
+        SBA.check_state_based_actions(self.game)
+
+        SBA.deal_damage(self.game, board[7], 2)
+        SBA.deal_damage(self.game, board[9], 1)
+        with mock.patch.object(SBA, "_dies", wraps=SBA._dies) as dies:
+            self.assertEqual(SBA.check_state_based_actions(self.game), [board[7]])
+            self.assertEqual(dies.call_count, 2)
+            SBA.check_state_based_actions(self.game)
+            self.assertEqual(dies.call_count, 2)
+
+    def test_empty_library_and_life(self) -> None:
+        copy = self.game.clone()
+        copy.players[1].draw_card(copy)
+        self.assertIs(copy.winner, copy.players[0])
+        self.assertFalse(self.p2.drew_from_empty)
+
+        self.p1.life_total = 0
+        SBA.check_state_based_actions(self.game)
+        self.assertIs(self.game.winner, self.p2)
+
+    def test_clone_keeps_dirty_set_and_hook(self) -> None:
+        bear = creature("Bear", 2, 2)
+        self.p1.enter_battlefield(bear)
+        SBA.deal_damage(self.game, bear, 2)
+        copy = self.game.clone()
+        bear_copy = copy.players[0].battlefield[0]
+        self.assertEqual(copy.sba_dirty, {bear_copy: None})
+        self.assertEqual(SBA.check_state_based_actions(copy), [bear_copy])
+        self.assertIn(bear, self.p1.battlefield)
+
+        self.game.sba_dirty.clear()
+        elf = creature("Elf", 1, 1)
+        copy.players[1].enter_battlefield(elf)
+        self.assertEqual(copy.sba_dirty, {elf: None})
+        self.assertEqual(self.game.sba_dirty, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
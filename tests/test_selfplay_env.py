@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+
+from mtg_ai.env import ACTION_SIZE, A_PLAY_BASE, MAX_HAND
+from mtg_ai.selfplay_env import SelfPlayVectorEnv
+from tests.test_env import make_stub_decks
+
+
+def random_legal_actions(masks: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return np.array([int(rng.choice(np.flatnonzero(m))) for m in masks])
+
+
+class SelfPlayVectorEnvTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.env = SelfPlayVectorEnv(make_stub_decks, num_envs=3, max_steps=300, seed=0)
+
+    def test_reset_shapes(self) -> None:
+        obs, info = self.env.reset()
+        self.assertEqual(obs.shape, (3, 48))
+        self.assertEqual(info["legal_mask"].shape, (3, ACTION_SIZE))
+        np.testing.assert_array_equal(info["seat"], [0, 0, 0])
+
+    def test_both_seats_are_controlled(self) -> None:
+        obs, info = self.env.reset()
+        played_by = set()
+        for _ in range(60):
+            actions = np.zeros(3, dtype=np.int64)
+            for i, mask in enumerate(info["legal_mask"]):
+                lands = np.flatnonzero(mask[A_PLAY_BASE:A_PLAY_BASE + MAX_HAND])
+                if lands.size:
+                    actions[i] = A_PLAY_BASE + lands[0]
+                    played_by.add(int(info["seat"][i]))
+            obs, _, _, _, info = self.env.step(actions)
+        self.assertEqual(played_by, {0, 1})
+        game = self.env.games[0]
+        assert game is not None
+        self.assertTrue(all(any(c.is_land() for c in p.battlefield) for p in game.players))
+
+    def test_rewards_and_autoreset(self) -> None:
+        rng = np.random.default_rng(1)
+        obs, info = self.env.reset()
+        finished = 0
+        for _ in range(3000):
+            obs, rewards, term, trunc, info = self.env.step(random_legal_actions(info["legal_mask"], rng))
+            for i in np.flatnonzero(term):
+                self.assertIn(rewards[i], (-1.0, 1.0))
+                self.assertIn(i, info["final_obs"])
+                self.assertIn(info["winner"][i], (0, 1))
+                # auto-reset: fresh game, seat 0 to act at its first phase
+                self.assertEqual(self.env.step_counts[i], 0)
+                finished += 1
+            self.assertTrue(np.all(rewards[~term] == 0.0))
+            if finished >= 2:
+                break
+        self.assertGreaterEqual(finished, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import unittest
+from typing import Dict, List, Optional, Tuple
+
+from mtg_ai.card import Card
+from mtg_ai.card_db import get_card_template_by_name
+from mtg_ai.game_state import GameState, Player
+from mtg_ai.game_controller import step_game
+from mtg_ai.agents.simple import NaiveAgent
+from mtg_ai import stack as ST
+from mtg_ai import game_actions as GA
+from tests.test_mcts import FOREST, creature
+
+MOUNTAIN = {"name": "Mountain", "uuid": "M", "types": ["Land"], "subtypes": ["Mountain"]}
+
+
+def db_card(name: str) -> Card:
+    return Card(get_card_template_by_name(name))
+
+
+class InstantPlayer(NaiveAgent):
+    """NaiveAgent that casts Giant Growth on its own creature in combat whenever it can."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def choose_instant(self, game: GameState, seat: int) -> Optional[Tuple[Card, List[Card]]]:
+        self.calls += 1
+        if game.phase != "DECLARE_BLOCKERS" or game.stack:
+            return None
+        for card in ST.castable_instants(game, seat):
+            effect = ST.SPELL_EFFECTS[card.name]
+            return card, [effect.default_target(game, seat, effect.legal_targets(game, seat))]
+        return None
+
+
+class BlockFirstAttacker(NaiveAgent):
+    def choose_blockers(self, game: GameState) -> Dict[Card, List[Card]]:
+        return {game.attackers[0]: list(game.get_opponent().battlefield)}
+
+
+def growth_combat() -> Tuple[GameState, Card, Card]:
+    """
+    Seat 0's 2/2 attacks into seat 1's 3/3 with Giant Growth and a Forest
+    ready, at DECLARE_BLOCKERS: the attacker survives only if it is cast.
+    Returns (game, attacker, blocker).
+    """
+    p1, p2 = Player("A", []), Player("B", [])
+    game = GameState(p1, p2)
+    atk, blk = creature("Atk", 2, 2), creature("Blk", 3, 3)
+    p1.battlefield.extend([atk, Card(FOREST)])
+    p1.hand.append(db_card("Giant Growth"))
+    p2.battlefield.append(blk)
+    game.attackers = [atk]
+    game.phase = "DECLARE_BLOCKERS"
+    return game, atk, blk
+
+
+class StackTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.p1, self.p2 = Player("A", []), Player("B", [])
+        self.game = GameState(self.p1, self.p2)
+
+    def test_fast_path_never_asks_without_instants(self) -> None:
+        self.p1.battlefield.append(creature("Bear", 2, 2))
+        self.p1.hand.append(db_card("Giant Growth"))  # no land to pay for it
+        a, d = InstantPlayer(), InstantPlayer()
+        for _ in range(11):
+            step_game(self.game, a, d)
+        self.assertEqual((a.calls, d.calls), (0, 0))
+
+    def test_giant_growth_wins_combat_and_wears_off(self) -> None:
+        atk, blk = creature("Atk", 2, 2), creature("Blk", 3, 3)
+        growth = db_card("Giant Growth")
+        self.p1.battlefield.extend([atk, Card(FOREST)])
+        self.p1.hand.append(growth)
+        self.p2.battlefield.append(blk)
+        self.game.attackers = [atk]
+        self.game.phase = "DECLARE_BLOCKERS"
+
+        class BlockAtk(NaiveAgent):
+            def choose_blockers(self, game: GameState) -> Dict[Card, List[Card]]:
+                return {atk: [blk]}
+
+        step_game(self.game, InstantPlayer(), BlockAtk())
+        self.assertEqual((atk.power, atk.toughness), (5, 5))
+        self.assertIn(growth, self.p1.graveyard)
+        self.assertEqual(self.game.stack, [])
+
+        step_game(self.game, NaiveAgent(), NaiveAgent())  # COMBAT_DAMAGE
+        self.assertIn(atk, self.p1.battlefield)
+        self.assertIn(blk, self.p2.graveyard)
+
+        self.game.phase = "ENDING"
+        step_game(self.game, NaiveAgent(), NaiveAgent())
+        self.assertEqual((atk.power, atk.toughness), (2, 2))
+        self.assertEqual(self.game.effects.effects, [])
+
+    def test_pillage_cast_from_main_phase(self) -> None:
+        pillage = db_card("Pillage")
+        self.p1.hand.append(pillage)
+        self.p1.battlefield.extend(Card(MOUNTAIN) for _ in range(3))
+        target = Card(FOREST)
+        self.p2.battlefield.append(target)
+
+        class CastPillage(NaiveAgent):
+            def choose_casts(self, game: GameState) -> List[Card]:
+                return [pillage]
+
+        self.game.phase = "MAIN1"
+        step_game(self.game, CastPillage(), NaiveAgent())
+        self.assertIn(target, self.p2.graveyard)
+        self.assertIn(pillage, self.p1.graveyard)
+        self.assertTrue(all(land.tapped for land in self.p1.battlefield))
+
+    def test_stack_resolves_last_in_first_out_and_fizzles(self) -> None:
+        mine, theirs = creature("Mine", 2, 2), creature("Theirs", 2, 2)
+        self.p1.battlefield.extend([mine, Card(FOREST)])
+        self.p2.battlefield.extend([theirs, Card(FOREST)])
+        g1, g2 = db_card("Giant Growth"), db_card("Giant Growth")
+        self.p1.hand.append(g1)
+        self.p2.hand.append(g2)
+
+        self.assertTrue(ST.cast_spell(self.game, 0, g1, [mine]))
+        self.assertTrue(ST.cast_spell(self.game, 1, g2, [theirs]))
+        self.assertFalse(ST.cast_spell(self.game, 1, g2, [theirs]))  # no longer in hand
+        self.assertEqual([item.card for item in self.game.stack], [g1, g2])
+
+        # Respond by killing the first spell's target: it fizzles
+        self.p1.move_card(mine, "battlefield", "graveyard")
+        ST.resolve_top(self.game)
+        self.assertEqual(theirs.power, 5)
+        ST.resolve_top(self.game)
+        self.assertEqual(mine.power, 2)
+        self.assertIn(g1, self.p1.graveyard)
+
+    def test_clone_remaps_stack_and_eot_effects(self) -> None:
+        bear = creature("Bear", 2, 2)
+        self.p1.battlefield.extend([bear, Card(FOREST)])
+        growth = db_card("Giant Growth")
+        self.p1.hand.append(growth)
+        ST.cast_spell(self.game, 0, growth, [bear])
+        ST.pump(self.game, bear, 1, 1)
+
+        copy = self.game.clone()
+        bear_copy = copy.players[0].battlefield[0]
+        self.assertIs(copy.stack[0].targets[0], bear_copy)
+        self.assertIsNot(copy.stack[0].card, growth)
+        self.assertEqual([e.target for e in copy.effects.effects], [bear_copy])
+
+        ST.resolve_top(copy)
+        GA.cleanup_step(copy)
+        self.assertEqual(bear_copy.power, 2)
+        self.assertEqual(bear.power, 3)
+        self.assertEqual(len(self.game.stack), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import gymnasium as gym
+
+from mtg_ai.env import make_default_env, ACTION_SIZE
+from mtg_ai.trajectory import TrajectoryWriter, TrajectoryReader, RecordingWrapper
+from tests.test_env import make_stub_decks
+
+OBS_SPACE = gym.spaces.Box(low=-1.0, high=1.0, shape=(4,), dtype=np.float32)
+
+
+class TrajectoryShardTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name) / "ds"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _write(self, n: int, max_shard_bytes: int) -> TrajectoryWriter:
+        with TrajectoryWriter(self.root, OBS_SPACE, action_size=3, max_shard_bytes=max_shard_bytes) as w:
+            for i in range(n):
+                mask = np.array([True, i % 2 == 0, False])
+                w.add(np.full(4, i, dtype=np.float32), i, float(i) / 10, i % 5 == 4, mask)
+        return w
+
+    def test_round_trip_with_rotation(self) -> None:
+        w = self._write(25, max_shard_bytes=10 * 33)  # a row is 33 bytes -> 10 rows per shard
+        self.assertEqual(w.rows_per_shard, 10)
+        reader = TrajectoryReader(self.root)
+        self.assertEqual(len(reader), 25)
+        self.assertEqual(len(reader.shards), 3)
+
+        batches = list(reader.iter_minibatches(4))
+        actions = np.concatenate([b["action"] for b in batches])
+        np.testing.assert_array_equal(actions, np.arange(25))
+        self.assertTrue(all(len(b["action"]) <= 4 for b in batches))
+        first = batches[0]
+        np.testing.assert_array_equal(first["obs"][2], np.full(4, 2, dtype=np.float32))
+        self.assertTrue(first["legal_mask"][2, 1])
+        # zero-copy: batches are views into the memory-mapped shard
+        self.assertIsInstance(first["obs"].base, np.memmap)
+
+    def test_shuffled_batches_cover_everything_once(self) -> None:
+        self._write(25, max_shard_bytes=10 * 33)
+        reader = TrajectoryReader(self.root)
+        seen = np.concatenate([
+            b["action"] for b in reader.iter_minibatches(3, shuffle=True, rng=np.random.default_rng(0))
+        ])
+        self.assertEqual(sorted(seen.tolist()), list(range(25)))
+
+    def test_add_batch_splits_across_shards(self) -> None:
+        with TrajectoryWriter(self.root, OBS_SPACE, action_size=3, max_shard_bytes=10 * 33) as w:
+            n = 23
+            w.add_batch(
+                np.zeros((n, 4), dtype=np.float32),
+                np.arange(n),
+                np.zeros(n, dtype=np.float32),
+                np.zeros(n, dtype=np.bool_),
+                np.ones((n, 3), dtype=np.bool_),
+            )
+        reader = TrajectoryReader(self.root)
+        self.assertEqual(len(reader), 23)
+        self.assertEqual([len(s["action"]) for s in reader.shards], [10, 10, 3])
+        self.assertFalse(np.concatenate([s["truncated"] for s in reader.shards]).any())
+
+    def test_close_trims_last_shard_and_blocks_writes(self) -> None:
+        w = self._write(25, max_shard_bytes=10 * 33)
+        for name, row_bytes in (("obs", 16), ("action", 8), ("legal_mask", 3)):
+            path = self.root / "shard_00002" / f"{name}.npy"
+            header = path.stat().st_size - 5 * row_bytes
+            self.assertEqual(np.load(path).shape[0], 5)
+            self.assertEqual(header % 64, 0)  # the .npy header keeps its aligned length
+        full = self.root / "shard_00000" / "action.npy"
+        self.assertEqual(np.load(full, mmap_mode="r").shape, (10,))
+
+        with self.assertRaisesRegex(ValueError, "closed"):
+            w.add(np.zeros(4, dtype=np.float32), 0, 0.0, False, np.ones(3, dtype=np.bool_))
+        with self.assertRaisesRegex(ValueError, "closed"):
+            w.add_batch(np.zeros((1, 4)), np.zeros(1), np.zeros(1), np.zeros(1), np.ones((1, 3), dtype=np.bool_))
+        self.assertEqual(len(TrajectoryReader(self.root)), 25)
+
+    def test_refuses_to_overwrite(self) -> None:
+        self._write(1, max_shard_bytes=1024)
+        with self.assertRaises(FileExistsError):
+            TrajectoryWriter(self.root, OBS_SPACE, action_size=3)
+
+
+class RecordingWrapperTest(unittest.TestCase):
+    def test_records_entity_episode(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "ds"
+            env = make_default_env(make_stub_decks, obs_mode="entity", max_steps=30)
+            writer = TrajectoryWriter(root, env.observation_space, ACTION_SIZE)
+            rec = RecordingWrapper(env, writer)
+            first_obs, _ = rec.reset(seed=0)
+            first_hand = np.array(first_obs["hand"], copy=True)
+            steps = 0
+            done = False
+            while not done:
+                _, _, term, trunc, _ = rec.step(0)
+                steps += 1
+                done = term or trunc
+            writer.close()
+
+            reader = TrajectoryReader(root)
+            self.assertEqual(len(reader), steps)
+            batch = next(reader.iter_minibatches(steps))
+            np.testing.assert_array_equal(batch["obs.hand"][0], first_hand)
+            self.assertTrue(batch["done"][-1])
+            # max_steps=30 cuts this episode off; done alone would not say so
+            self.assertTrue(trunc and not term)
+            self.assertTrue(batch["truncated"][-1])
+            self.assertFalse(batch["truncated"][:-1].any())
+            self.assertEqual(batch["legal_mask"].shape, (steps, ACTION_SIZE))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import subprocess
+import sys
+import unittest
+from typing import Any, List
+
+from mtg_ai.card import Card
+from mtg_ai.card_db import get_card_template_by_name
+from mtg_ai.game_state import GameState, Player, StackItem
+from mtg_ai.game_controller import step_game
+from mtg_ai.agents.simple import NaiveAgent
+from mtg_ai import stack as ST
+from mtg_ai import game_actions as GA
+from mtg_ai import triggers as TR
+from tests.test_mcts import FOREST, creature
+
+
+def db_card(name: str) -> Card:
+    c = Card(get_card_template_by_name(name))
+    c.summoning_sick = False
+    return c
+
+
+class TriggerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.p1, self.p2 = Player("A", []), Player("B", [])
+        self.game = GameState(self.p1, self.p2)
+        self.log: List[str] = []
+
+    def tearDown(self) -> None:
+        for name in ("Beacon A", "Beacon B", "Martyr"):
+            TR.TRIGGERED_ABILITIES.pop(name, None)
+
+    def register(self, name: str, event: str) -> None:
+        def resolve(game: Any, item: StackItem) -> None:
+            self.log.append(item.card.name)
+
+        TR.TRIGGERED_ABILITIES[name] = (TR.TriggeredAbility(event, lambda src, seat, ev, ev_seat: True, resolve),)
+
+    def test_registry_does_not_depend_on_importing_stack(self) -> None:
+        code = (
+            "import sys; from mtg_ai.game_state import GameState, Player; from mtg_ai.card import Card; "
+            "from mtg_ai.card_db import get_card_template_by_name as t; "
+            "g = GameState(Player('A', []), Player('B', [])); "
+            "g.players[0].enter_battlefield(Card(t('Territorial Baloth'))); "
+            "assert 'mtg_ai.stack' not in sys.modules; print(sorted(g.players[0].triggers.listeners))"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), str([TR.ENTERS_BATTLEFIELD]))
+
+    def test_landfall_subscribes_on_enter_and_wears_off(self) -> None:
+        baloth = db_card("Territorial Baloth")
+        self.p1.enter_battlefield(baloth)
+        self.assertEqual(self.p1.triggers.get(TR.ENTERS_BATTLEFIELD), [baloth])
+
+        forest = Card(FOREST)
+        self.p1.hand.append(forest)
+        self.p1.play_land(forest)
+        self.game.phase = "MAIN1"
+        step_game(self.game, NaiveAgent(), NaiveAgent())
+        self.assertEqual((baloth.power, baloth.toughness), (6, 6))
+        self.assertEqual(self.game.stack, [])
+
+        self.p1.move_card(baloth, "battlefield", "graveyard")
+        self.assertEqual(self.p1.triggers.get(TR.ENTERS_BATTLEFIELD), [])
+        self.assertEqual((baloth.power, baloth.toughness), (4, 4))
+
+    def test_opponent_land_does_not_trigger_landfall(self) -> None:
+        baloth = db_card("Territorial Baloth")
+        self.p1.enter_battlefield(baloth)
+        forest = Card(FOREST)
+        self.p2.hand.append(forest)
+        self.p2.play_land(forest)
+        self.assertEqual(ST.collect_triggers(self.game), 0)
+        self.assertEqual(self.p1.events, [])
+
+    def test_coal_stoker_adds_mana_only_when_cast(self) -> None:
+        stoker = Card(get_card_template_by_name("Coal Stoker"))
+        self.p1.hand.append(stoker)
+        self.p1.mana_pool["R"] = 4
+
+        class CastStoker(NaiveAgent):
+            def choose_casts(self, game: GameState) -> List[Card]:
+                return [stoker]
+
+        self.game.phase = "MAIN1"
+        ST.main_phase(self.game, CastStoker(), NaiveAgent())
+        self.assertIn(stoker, self.p1.battlefield)
+        self.assertEqual(self.p1.mana_pool["R"], 3)
+
+        other = Card(get_card_template_by_name("Coal Stoker"))
+        self.p2.graveyard.append(other)
+        self.p2.move_card(other, "graveyard", "battlefield")
+        self.assertEqual(ST.collect_triggers(self.game), 0)
+
+    def test_apnap_order(self) -> None:
+        self.register("Beacon A", TR.PHASE_BEGIN)
+        self.register("Beacon B", TR.PHASE_BEGIN)
+        self.p1.enter_battlefield(creature("Beacon A", 1, 1))
+        self.p2.enter_battlefield(creature("Beacon B", 1, 1))
+        self.game.phase = "UPKEEP"
+        step_game(self.game, NaiveAgent(), NaiveAgent())
+        # Active player's trigger goes on the stack first and resolves last
+        self.assertEqual(self.log, ["Beacon B", "Beacon A"])
+
+    def test_dies_trigger_looks_back(self) -> None:
+        self.register("Martyr", TR.DIES)
+        martyr = creature("Martyr", 1, 1)
+        self.p2.enter_battlefield(martyr)
+        attacker = creature("Ogre", 3, 3)
+        self.p1.enter_battlefield(attacker)
+        attacker.summoning_sick = False
+        GA.declare_attackers(self.game, [attacker])
+        GA.declare_blockers(self.game, {attacker: [martyr]})
+        GA.resolve_combat_damage(self.game)
+        self.assertEqual(ST.collect_triggers(self.game), 1)
+        self.assertEqual(self.game.stack[0].controller, 1)
+        ST.resolve_top(self.game)
+        self.assertEqual(self.log, ["Martyr"])
+
+    def test_clone_remaps_listeners_and_events(self) -> None:
+        baloth = db_card("Territorial Baloth")
+        self.p1.enter_battlefield(baloth)
+        forest = Card(FOREST)
+        self.p1.hand.append(forest)
+        self.p1.play_land(forest)
+
+        copy = self.game.clone()
+        baloth_copy, forest_copy = copy.players[0].battlefield
+        self.assertEqual(copy.players[0].triggers.get(TR.ENTERS_BATTLEFIELD), [baloth_copy])
+        self.assertIs(copy.players[0].events[-1].card, forest_copy)
+        self.assertEqual(ST.collect_triggers(copy), 1)
+        self.assertIs(copy.stack[0].card, baloth_copy)
+        self.assertEqual(len(self.p1.events), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
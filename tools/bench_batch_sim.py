@@ -0,0 +1,67 @@
+"""
+Compare the NumPy batch simulator (mtg_ai/batch_sim.py) with the full
+engine on a vanilla-creature matchup: NaiveAgent mirrors in both, so
+the engine plays a few hundred games (rollout.play_out) and the batch
+simulator many thousands, and both report games per hour. Pass
+--check N to also verify that N seeded games agree game for game.
+
+    python tools/bench_batch_sim.py decks/vanilla_green.txt decks/vanilla_gr.txt --games 100000 --check 200
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]          # repo root
+sys.path.insert(0, str(ROOT))
+
+from mtg_ai.agents.simple import NaiveAgent  # noqa: E402
+from mtg_ai.batch_sim import cross_check, simulate  # noqa: E402
+from mtg_ai.deck_builder import load_deck_from_file  # noqa: E402
+from mtg_ai.game_state import GameState, Player  # noqa: E402
+from mtg_ai.rollout import play_out  # noqa: E402
+
+
+def bench_engine(paths: List[Path], games: int, max_turns: int) -> float:
+    start = time.perf_counter()
+    for i in range(games):
+        players = [Player(f"P{seat}", load_deck_from_file(path).cards) for seat, path in enumerate(paths)]
+        game = GameState(players[0], players[1])
+        game.start_game(shuffle_active_seed=2 * i, shuffle_opponent_seed=2 * i + 1)
+        play_out(game, [NaiveAgent(), NaiveAgent()], max_turn=max_turns)
+    return time.perf_counter() - start
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("decks", type=Path, nargs=2, help="decklist files (load_deck_from_file format)")
+    parser.add_argument("--games", type=int, default=100_000, help="batch-simulated games")
+    parser.add_argument("--engine-games", type=int, default=300)
+    parser.add_argument("--turns", type=int, default=50, help="stop games after this many turns")
+    parser.add_argument("--check", type=int, default=0, help="cross-check this many seeded games")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    decks = [[card.name for card in load_deck_from_file(path).cards] for path in args.decks]
+
+    engine = bench_engine(args.decks, args.engine_games, args.turns)
+    start = time.perf_counter()
+    result = simulate(decks, args.games, max_turns=args.turns, seed=args.seed)
+    batch = time.perf_counter() - start
+
+    print(f"{'engine':<8} {args.engine_games:>9} games {engine:>8.2f}s {3600 * args.engine_games / engine:>14,.0f} games/h")
+    print(f"{'batch':<8} {args.games:>9} games {batch:>8.2f}s {3600 * args.games / batch:>14,.0f} games/h")
+    print(f"speedup  {(args.games / batch) / (args.engine_games / engine):.0f}x")
+    for key, value in result.summary().items():
+        print(f"  {key:<12} {value:.4f}")
+    if args.check:
+        seeds = [(2 * i, 2 * i + 1) for i in range(args.check)]
+        mismatches = cross_check(decks, seeds, max_turns=args.turns)
+        print(f"cross-check: {args.check - len(mismatches)}/{args.check} games agree")
+
+
+if __name__ == "__main__":
+    main()
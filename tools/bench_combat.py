@@ -0,0 +1,82 @@
+"""
+Stress-benchmark the combat engine with large boards.
+
+Each side has N creatures; everything attacks, the defender blocks about
+two thirds of the attackers (some double blocks, a few first strikers),
+and declare_attackers + declare_blockers + resolve_combat_damage are
+timed together. Time per combatant should stay flat as N grows:
+
+    python tools/bench_combat.py --creatures 100 200 400 800
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]          # repo root
+sys.path.insert(0, str(ROOT))
+
+from mtg_ai.card import Card  # noqa: E402
+from mtg_ai.game_state import GameState, Player  # noqa: E402
+from mtg_ai import combat as CB  # noqa: E402
+
+
+def creature(name: str, power: int, toughness: int, first_strike: bool) -> Card:
+    return Card({
+        "name": name, "uuid": name, "types": ["Creature"], "power": str(power), "toughness": str(toughness),
+        "keywords": ["First strike"] if first_strike else [],
+    })
+
+
+def make_combat(n: int, rng: random.Random) -> Tuple[GameState, List[Card], Dict[Card, List[Card]]]:
+    p1, p2 = Player("A", []), Player("B", [])
+    for player in (p1, p2):
+        for i in range(n):
+            card = creature(f"{player.name}{i}", rng.randint(1, 5), rng.randint(1, 5), rng.random() < 0.05)
+            card.summoning_sick = False
+            player.enter_battlefield(card)
+    game = GameState(p1, p2)
+    attackers = list(p1.battlefield)
+    blockers = iter(p2.battlefield)
+    blocks: Dict[Card, List[Card]] = {}
+    for i, attacker in enumerate(attackers):
+        if i % 3 == 0:
+            continue
+        group = [b for b in (next(blockers, None), next(blockers, None) if i % 3 == 2 else None) if b is not None]
+        if group:
+            blocks[attacker] = group
+    return game, attackers, blocks
+
+
+def bench(n: int, repeats: int, seed: int) -> float:
+    rng = random.Random(seed)
+    total = 0.0
+    for _ in range(repeats):
+        game, attackers, blocks = make_combat(n, rng)
+        start = time.perf_counter()
+        CB.declare_attackers(game, attackers)
+        CB.declare_blockers(game, blocks)
+        CB.resolve_combat_damage(game)
+        total += time.perf_counter() - start
+    return total / repeats
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--creatures", type=int, nargs="+", default=[100, 200, 400, 800], help="per side")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'per side':>8} {'ms/combat':>10} {'us/combatant':>13}")
+    for n in args.creatures:
+        elapsed = bench(n, args.repeats, args.seed)
+        print(f"{n:>8} {1e3 * elapsed:>10.2f} {1e6 * elapsed / (2 * n):>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
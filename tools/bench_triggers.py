@@ -0,0 +1,84 @@
+"""
+Benchmark trigger dispatch on boards with many permanents.
+
+Compares the event index (TriggerIndex, what the engine uses) with a
+naive scan of every permanent for matching abilities, for one land
+entering the battlefield per event:
+
+    python tools/bench_triggers.py --permanents 10 100 1000 --listeners 2
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]          # repo root
+sys.path.insert(0, str(ROOT))
+
+from mtg_ai.card import Card  # noqa: E402
+from mtg_ai.card_db import get_card_template_by_name  # noqa: E402
+from mtg_ai.game_state import GameState, Player  # noqa: E402
+from mtg_ai import stack as ST  # noqa: E402
+from mtg_ai.triggers import ENTERS_BATTLEFIELD, TRIGGERED_ABILITIES, Event  # noqa: E402
+
+
+def make_game(permanents: int, listeners: int) -> GameState:
+    bear = get_card_template_by_name("Grizzly Bears")
+    baloth = get_card_template_by_name("Territorial Baloth")
+    p1, p2 = Player("A", []), Player("B", [])
+    for i in range(permanents):
+        player = p1 if i % 2 == 0 else p2
+        player.enter_battlefield(Card(baloth if i < listeners else bear))
+    p1.events.clear()
+    p2.events.clear()
+    return GameState(p1, p2)
+
+
+def naive_collect(game: GameState) -> int:
+    """Reference dispatcher: every event visits every permanent."""
+    found = 0
+    for event_seat, player in enumerate(game.players):
+        events, player.events = player.events, []
+        for event in events:
+            for seat, owner in enumerate(game.players):
+                for source in owner.battlefield:
+                    for ability in TRIGGERED_ABILITIES.get(source.name, ()):
+                        if ability.event == event.kind and ability.condition(source, seat, event, event_seat):
+                            found += 1
+    return found
+
+
+def bench(game: GameState, collect: str, events: int) -> float:
+    land = Card(get_card_template_by_name("Forest"))
+    player = game.players[0]
+    start = time.perf_counter()
+    for _ in range(events):
+        player.events.append(Event(ENTERS_BATTLEFIELD, land))
+        if collect == "index":
+            ST.collect_triggers(game)
+            game.stack.clear()
+        else:
+            naive_collect(game)
+    return (time.perf_counter() - start) / events
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--permanents", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--listeners", type=int, default=2, help="Territorial Baloths among the permanents")
+    parser.add_argument("--events", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    print(f"{'permanents':>10} {'index us/event':>15} {'scan us/event':>14} {'speedup':>8}")
+    for n in args.permanents:
+        game = make_game(n, args.listeners)
+        indexed = bench(game, "index", args.events)
+        scanned = bench(game, "scan", args.events)
+        print(f"{n:>10} {1e6 * indexed:>15.2f} {1e6 * scanned:>14.2f} {scanned / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Goldfish decklists: turns to kill an opponent who does nothing, from many
+vectorized games per deck (see mtg_ai/goldfish.py for what is modeled).
+Use it to screen deck variants before full-engine simulation:
+
+    python tools/goldfish.py decks/mono_green.txt decks/mono_red.txt --games 100000
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]          # repo root
+sys.path.insert(0, str(ROOT))
+
+from mtg_ai.deck_builder import load_deck_from_file  # noqa: E402
+from mtg_ai.goldfish import simulate  # noqa: E402
+from mtg_ai.mulligan import DeckProfile  # noqa: E402
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("decks", type=Path, nargs="+", help="decklist files (load_deck_from_file format)")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--turns", type=int, default=20, help="give up after this many turns")
+    parser.add_argument("--draw", action="store_true", help="on the draw instead of on the play")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    marks = [t for t in (4, 5, 6, 7, 8, 10) if t <= args.turns]
+    header = f"{'deck':<20} {'mean':>6} {'median':>6} " + " ".join(f"{'<=T' + str(t):>6}" for t in marks)
+    print(header + f" {'seconds':>8}")
+    for path in args.decks:
+        profile = DeckProfile.from_cards(load_deck_from_file(path).cards)
+        start = time.perf_counter()
+        result = simulate(profile, args.games, max_turns=args.turns, on_the_play=not args.draw, seed=args.seed)
+        elapsed = time.perf_counter() - start
+        s = result.summary()
+        cols = " ".join(f"{s[f'p_by_turn_{t}']:>6.1%}" for t in marks)
+        print(f"{path.stem:<20} {s['mean_turn']:>6.2f} {s['median_turn']:>6.1f} {cols} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()